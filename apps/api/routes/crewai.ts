@@ -125,4 +125,46 @@ router.post('/:crewId/execute', async (req, res) => {
   }
 });
 
+// Stream a local crew run as server-sent events
+router.post('/run/:crewName/stream', async (req, res) => {
+  const { crewName } = req.params;
+  const controller = new AbortController();
+  // The response closes after it ends, too; only a client that left early stops the run
+  res.on('close', () => {
+    if (!res.writableEnded) controller.abort();
+  });
+  try {
+    const baseUrl = process.env.CREW_STREAM_URL ?? 'http://127.0.0.1:8765';
+    const upstream = await fetch(`${baseUrl}/crews/${encodeURIComponent(crewName)}/stream`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify(req.body ?? {}),
+      signal: controller.signal,
+    });
+    if (!upstream.ok || !upstream.body) {
+      res.status(upstream.status === 404 ? 404 : 502).json({ error: 'Failed to start crew stream' });
+      return;
+    }
+
+    res.status(200);
+    res.setHeader('Content-Type', 'text/event-stream');
+    res.setHeader('Cache-Control', 'no-cache');
+    res.setHeader('Connection', 'keep-alive');
+    res.flushHeaders();
+    const reader = upstream.body.getReader();
+    for (;;) {
+      const { done, value } = await reader.read();
+      if (done) break;
+      res.write(value);
+    }
+    res.end();
+  } catch (error) {
+    if (controller.signal.aborted || res.headersSent) {
+      if (!res.writableEnded) res.end();
+    } else {
+      res.status(502).json({ error: 'Failed to stream crew' });
+    }
+  }
+});
+
 export default router;
\ No newline at end of file
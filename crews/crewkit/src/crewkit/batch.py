@@ -0,0 +1,177 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import traceback
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from crewkit.logs import log_event
+from crewkit.scheduler import DagCrew
+from crewkit.workspace import Workspace
+
+# Prepares an item's kickoff inputs given the item and its output directory
+Prepare = Callable[[Dict[str, Any], Path], Dict[str, Any]]
+# Post-processes a finished run given its result, inputs and output directory
+Finish = Callable[[Any, Dict[str, Any], Path], None]
+
+
+def item_id(item: Dict[str, Any]) -> str:
+    """Stable identifier for an input set: its ``id`` field or a hash of its content."""
+    if item.get("id") is not None:
+        return str(item["id"])
+    encoded = json.dumps(item, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+def read_items(path: str) -> List[Dict[str, Any]]:
+    """Read input sets from a JSON list or a JSON-lines file."""
+    text = Path(path).read_text(encoding="utf-8")
+    if Path(path).suffix == ".json":
+        items = json.loads(text)
+    else:
+        items = [json.loads(line) for line in text.splitlines() if line.strip()]
+    if not all(isinstance(item, dict) for item in items):
+        raise ValueError(f"Every input set in {path} must be a JSON object")
+    return items
+
+
+class Manifest:
+    """Append-only JSON-lines record of batch items, used to resume a batch.
+
+    The last entry for an item wins, so an item that failed and later
+    succeeded counts as completed.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def entries(self) -> Dict[str, Dict[str, Any]]:
+        latest: Dict[str, Dict[str, Any]] = {}
+        if self.path.exists():
+            for line in self.path.read_text(encoding="utf-8").splitlines():
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # A line cut short by a crash; the item simply runs again
+                    continue
+                latest[entry["id"]] = entry
+        return latest
+
+    def completed(self) -> Dict[str, Dict[str, Any]]:
+        return {key: entry for key, entry in self.entries().items() if entry["status"] == "completed"}
+
+    def record(self, entry: Dict[str, Any]) -> None:
+        line = json.dumps(entry, default=str) + "\n"
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as handle:
+                handle.write(line)
+                handle.flush()
+                os.fsync(handle.fileno())
+
+
+class BatchRunner:
+    """Runs many input sets through copies of one crew, concurrently.
+
+    Each item gets its own copy of ``crew`` running in the workspace
+    ``output_root/<item id>``, so relative output files never collide. Failed items are retried with
+    exponential backoff, and every outcome is appended to
+    ``output_root/manifest.jsonl`` so rerunning a batch skips completed items.
+    """
+
+    def __init__(
+        self,
+        crew: DagCrew,
+        output_root: str,
+        concurrency: Optional[int] = None,
+        retries: Optional[int] = None,
+        backoff: float = 5.0,
+        prepare: Optional[Prepare] = None,
+        finish: Optional[Finish] = None,
+    ):
+        self.crew = crew
+        self.output_root = Path(output_root)
+        if concurrency is None:
+            concurrency = int(os.getenv("CREW_BATCH_CONCURRENCY", "4"))
+        if retries is None:
+            retries = int(os.getenv("CREW_BATCH_RETRIES", "2"))
+        self.concurrency = max(1, concurrency)
+        self.retries = max(0, retries)
+        self.backoff = backoff
+        self.prepare = prepare
+        self.finish = finish
+        self.manifest = Manifest(self.output_root / "manifest.jsonl")
+
+    def run(self, items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Run a batch to completion and summarize it."""
+        return asyncio.run(self.run_async(items))
+
+    async def run_async(self, items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        completed = self.manifest.completed()
+        pending = {}
+        for item in items:
+            key = item_id(item)
+            if key not in completed:
+                pending.setdefault(key, item)
+
+        started = time.perf_counter()
+        log_event(logging.INFO, "batch_started", items=len(items), skipped=len(items) - len(pending))
+        semaphore = asyncio.Semaphore(self.concurrency)
+        results = await asyncio.gather(
+            *(self._run_item(key, item, semaphore) for key, item in pending.items())
+        )
+        summary = {
+            "items": len(items),
+            "skipped": len(items) - len(pending),
+            "completed": sum(1 for entry in results if entry["status"] == "completed"),
+            "failed": [entry["id"] for entry in results if entry["status"] == "failed"],
+            "seconds": time.perf_counter() - started,
+        }
+        log_event(logging.INFO, "batch_finished", **summary)
+        return summary
+
+    async def _run_item(self, key: str, item: Dict[str, Any], semaphore: asyncio.Semaphore) -> Dict[str, Any]:
+        directory = self.output_root / key
+        async with semaphore:
+            for attempt in range(1, self.retries + 2):
+                started = time.perf_counter()
+                try:
+                    await asyncio.to_thread(self._kickoff, item, directory)
+                except Exception as error:
+                    entry = {
+                        "id": key,
+                        "status": "failed",
+                        "attempts": attempt,
+                        "output_dir": str(directory),
+                        "seconds": time.perf_counter() - started,
+                        "error": "".join(traceback.format_exception_only(type(error), error)).strip(),
+                    }
+                    log_event(logging.WARNING, "batch_item_failed", **entry)
+                    if attempt <= self.retries:
+                        await asyncio.sleep(self.backoff * 2 ** (attempt - 1))
+                        continue
+                else:
+                    entry = {
+                        "id": key,
+                        "status": "completed",
+                        "attempts": attempt,
+                        "output_dir": str(directory),
+                        "seconds": time.perf_counter() - started,
+                    }
+                    log_event(logging.INFO, "batch_item_completed", **entry)
+                self.manifest.record(entry)
+                return entry
+
+    def _kickoff(self, item: Dict[str, Any], directory: Path) -> None:
+        crew = self.crew.copy()
+        crew.workspace = Workspace(directory)
+        inputs = self.prepare(item, directory) if self.prepare else dict(item)
+        inputs.pop("id", None)
+        result = crew.kickoff(inputs=inputs)
+        if self.finish:
+            self.finish(result, inputs, directory)
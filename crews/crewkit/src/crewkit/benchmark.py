@@ -0,0 +1,293 @@
+"""Offline benchmark of crew orchestration against a deterministic stand-in LLM.
+
+Each crew runs end-to-end in a fresh process inside a temporary working
+directory, so peak RSS and output files are isolated per crew. Run with::
+
+    python -m crewkit.benchmark --latency 0.05 --save baseline.json
+    python -m crewkit.benchmark --latency 0.05 --compare baseline.json
+"""
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from crewkit.registry import CREWS, crew_class
+
+# Sample inputs mirroring each crew's run(), with fixed dates so runs are comparable
+SAMPLE_INPUTS: Dict[str, Dict[str, Any]] = {
+    "mywordpresscrew": {"topic": "AI LLMs", "current_year": "2025"},
+    "mywritingcrew": {
+        "tokens": json.dumps(
+            {
+                "genre": "science_fiction",
+                "theme": "redemption",
+                "characters": [
+                    {"name": "Alex", "role": "protagonist", "traits": ["determined", "brilliant", "haunted"]}
+                ],
+                "setting": {"time": "future", "place": "space_colony", "atmosphere": "dystopian"},
+                "plot_elements": ["artificial_intelligence", "ethical_dilemma", "personal_growth"],
+            },
+            indent=2,
+        ),
+        "timestamp": "2025-01-01T00:00:00",
+        "output_dir": "working",
+    },
+    "personasynth": {
+        "target_communities": ["programming", "technology", "gaming", "anime", "science"],
+        "emotion_thresholds": {"min_intensity": 3, "min_authenticity": 5, "min_resonance": 4},
+        "trend_parameters": {
+            "timeframe": "last_week",
+            "min_engagement": 100,
+            "platform_focus": ["reddit", "twitter", "discord"],
+        },
+        "current_year": "2025",
+    },
+    "teddy_wordpress_writer": {
+        "topic": "WordPress Content Strategy",
+        "current_year": "2025",
+        "content_type": "semi-biographical",
+        "target_audience": "general readers interested in personal growth and technology",
+        "seo_keywords": "wordpress optimization, social media growth, content strategy",
+        "content_tone": "engaging and relatable",
+        "wordpress_focus": "SEO and social media optimization",
+        "target_platforms": "WordPress, Twitter, LinkedIn, Facebook",
+    },
+}
+
+# Metrics compared against a baseline, where larger values are worse
+COMPARED_METRICS = ("import_seconds", "construct_seconds", "wall_seconds", "overhead_seconds", "peak_rss_bytes")
+
+
+def _prepare_offline_environment() -> None:
+    """Keep crewAI and litellm from reaching the network during a benchmark."""
+    os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+    os.environ.setdefault("LITELLM_LOCAL_MODEL_COST_MAP", "True")
+    os.environ.setdefault("CREWAI_DISABLE_TELEMETRY", "true")
+    os.environ.setdefault("OTEL_SDK_DISABLED", "true")
+
+
+def _fake_llm_class():
+    from crewai import LLM
+    from litellm.types.utils import Usage
+
+    from crewkit.context import estimate_tokens
+
+    class FakeLLM(LLM):
+        """Deterministic stand-in LLM with a fixed latency and response size.
+
+        Every call sleeps for ``latency`` seconds and answers in the ReAct
+        final-answer format with text derived from a hash of the prompt, so
+        identical prompts always produce identical outputs. Token usage,
+        estimated from the prompt and the answer, is reported to the call's
+        callbacks as a provider's would be.
+        """
+
+        def __init__(self, latency: float = 0.0, response_bytes: int = 2000, model: str = "gpt-4o-mini"):
+            # A known model name keeps litellm capability lookups working offline
+            super().__init__(model=model)
+            self.latency = latency
+            self.response_bytes = response_bytes
+            self.spans: List[Tuple[float, float]] = []
+            self._spans_lock = threading.Lock()
+
+        def call(self, messages, tools=None, callbacks=None, available_functions=None, **kwargs) -> str:
+            started = time.perf_counter()
+            prompt = messages if isinstance(messages, str) else json.dumps(messages, sort_keys=True, default=str)
+            digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+            words = " ".join(digest[index:index + 8] for index in range(0, len(digest), 8))
+            body = (words + " ") * (self.response_bytes // (len(words) + 1) + 1)
+            time.sleep(self.latency)
+            with self._spans_lock:
+                self.spans.append((started, time.perf_counter()))
+            answer = f"Thought: I now know the final answer\nFinal Answer: {body[:self.response_bytes]}"
+            prompt_tokens, completion_tokens = estimate_tokens(prompt), estimate_tokens(answer)
+            usage = Usage(
+                prompt_tokens=prompt_tokens,
+                completion_tokens=completion_tokens,
+                total_tokens=prompt_tokens + completion_tokens,
+            )
+            for callback in callbacks or []:
+                if hasattr(callback, "log_success_event"):
+                    callback.log_success_event(
+                        kwargs={"model": self.model},
+                        response_obj={"usage": usage},
+                        start_time=started,
+                        end_time=time.perf_counter(),
+                    )
+            return answer
+
+        def time_within(self, start: float, end: float) -> float:
+            """Seconds this LLM spent answering calls inside a time window."""
+            with self._spans_lock:
+                # Calls of fanned-out tasks overlap; count the time they cover once
+                return _union_seconds([
+                    (max(start, call_start), min(end, call_end))
+                    for call_start, call_end in self.spans
+                    if call_start < end and call_end > start
+                ])
+
+    return FakeLLM
+
+
+def _union_seconds(spans: List[Tuple[float, float]]) -> float:
+    """Total time covered by possibly overlapping intervals."""
+    total, covered_until = 0.0, float("-inf")
+    for start, end in sorted(spans):
+        if end > covered_until:
+            total += end - max(start, covered_until)
+            covered_until = end
+    return total
+
+
+def _peak_rss_bytes() -> int:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _run_crew(name: str, latency: float, response_bytes: int, max_concurrency: Optional[int]) -> Dict[str, Any]:
+    """Benchmark one crew; runs inside a dedicated process."""
+    _prepare_offline_environment()
+    inputs = SAMPLE_INPUTS[name]
+    os.chdir(tempfile.mkdtemp(prefix=f"bench-{name}-"))
+
+    started = time.perf_counter()
+    project = crew_class(name)
+    import_seconds = time.perf_counter() - started
+    fake_llm = _fake_llm_class()
+    started = time.perf_counter()
+    crew = project().crew()
+    construct_seconds = time.perf_counter() - started
+    crew.cache = None
+    crew.response_cache = None
+    if max_concurrency is not None:
+        crew.max_concurrency = max_concurrency
+
+    llms = []
+    for agent in crew.agents:
+        agent.llm = fake_llm(latency=latency, response_bytes=response_bytes)
+        llms.append(agent.llm)
+
+    started = time.perf_counter()
+    crew.kickoff(inputs=inputs)
+    wall = time.perf_counter() - started
+
+    tasks = {}
+    for task in crew.tasks:
+        task_start, task_end = crew.task_spans[task.name]
+        llm_seconds = task.agent.llm.time_within(task_start, task_end)
+        output_path = Path(task.output_file) if task.output_file else None
+        tasks[task.name] = {
+            "wall_seconds": task_end - task_start,
+            "llm_seconds": llm_seconds,
+            "overhead_seconds": task_end - task_start - llm_seconds,
+            "output_bytes": output_path.stat().st_size if output_path and output_path.exists() else 0,
+        }
+
+    # Tasks may overlap, so overhead is the wall time not covered by any LLM call
+    spans = [span for llm in llms for span in llm.spans]
+    return {
+        "import_seconds": import_seconds,
+        "construct_seconds": construct_seconds,
+        "wall_seconds": wall,
+        "llm_seconds": sum(end - start for start, end in spans),
+        "overhead_seconds": wall - _union_seconds(spans),
+        "llm_calls": len(spans),
+        "peak_rss_bytes": _peak_rss_bytes(),
+        "output_bytes": sum(task["output_bytes"] for task in tasks.values()),
+        "tasks": tasks,
+    }
+
+
+def run_benchmark(
+    crews: List[str],
+    latency: float = 0.0,
+    response_bytes: int = 2000,
+    max_concurrency: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Benchmark each named crew in a fresh process and collect the results."""
+    context = multiprocessing.get_context("spawn")
+    results = {}
+    with context.Pool(processes=1, maxtasksperchild=1) as pool:
+        for name in crews:
+            results[name] = pool.apply(_run_crew, (name, latency, response_bytes, max_concurrency))
+    return {
+        "settings": {
+            "latency": latency,
+            "response_bytes": response_bytes,
+            "max_concurrency": max_concurrency,
+            "python": sys.version.split()[0],
+        },
+        "crews": results,
+    }
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], tolerance: float = 0.1) -> List[str]:
+    """Describe metrics that grew by more than ``tolerance`` relative to the baseline."""
+    regressions = []
+    for name, result in current["crews"].items():
+        previous = baseline["crews"].get(name)
+        if previous is None:
+            continue
+        for metric in COMPARED_METRICS:
+            if metric not in previous:
+                continue
+            before, after = previous[metric], result[metric]
+            if before > 0 and (after - before) / before > tolerance:
+                regressions.append(f"{name}.{metric}: {before:.4g} -> {after:.4g} (+{(after - before) / before:.0%})")
+    return regressions
+
+
+def _print_report(results: Dict[str, Any]) -> None:
+    for name, result in results["crews"].items():
+        print(
+            f"\n{name}: import {result['import_seconds']:.3f}s, construct {result['construct_seconds']:.3f}s, "
+            f"wall {result['wall_seconds']:.3f}s, overhead {result['overhead_seconds']:.3f}s, "
+            f"{result['llm_calls']} LLM calls, peak RSS {result['peak_rss_bytes'] / 2**20:.1f} MiB, "
+            f"{result['output_bytes']} bytes written"
+        )
+        for task_name, task in result["tasks"].items():
+            print(
+                f"  {task_name:32} wall {task['wall_seconds']:.3f}s  "
+                f"overhead {task['overhead_seconds']:.3f}s  {task['output_bytes']} bytes"
+            )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--crews", default=",".join(CREWS), help="comma-separated crews to run")
+    parser.add_argument("--latency", type=float, default=0.0, help="simulated seconds per LLM call")
+    parser.add_argument("--response-bytes", type=int, default=2000, help="size of each simulated answer")
+    parser.add_argument("--max-concurrency", type=int, help="override CREW_MAX_CONCURRENCY")
+    parser.add_argument("--save", help="write results as a JSON baseline")
+    parser.add_argument("--compare", help="baseline JSON to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="allowed relative growth per metric")
+    args = parser.parse_args(argv)
+
+    results = run_benchmark(
+        [name for name in args.crews.split(",") if name],
+        latency=args.latency,
+        response_bytes=args.response_bytes,
+        max_concurrency=args.max_concurrency,
+    )
+    _print_report(results)
+
+    if args.save:
+        Path(args.save).write_text(json.dumps(results, indent=2))
+    if args.compare:
+        regressions = compare(json.loads(Path(args.compare).read_text()), results, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,195 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from crewai import Task
+from crewai.tasks.output_format import OutputFormat
+from crewai.tasks.task_output import TaskOutput
+
+
+def task_fingerprint(task: Task, context: str) -> str:
+    """Hash everything that determines a task's output.
+
+    Covers the interpolated task description and expected output, the
+    agent's interpolated configuration and tools, the model with its
+    sampling settings, and the context handed down from upstream tasks.
+    """
+    agent = task.agent
+    llm = getattr(agent, "llm", None)
+    payload = {
+        "task": {
+            "name": task.name,
+            "description": task.description,
+            "expected_output": task.expected_output,
+        },
+        "agent": {
+            "role": agent.role,
+            "goal": agent.goal,
+            "backstory": agent.backstory,
+            "tools": sorted(tool.name for tool in agent.tools or []),
+        },
+        "model": {
+            "name": getattr(llm, "model", str(llm)),
+            "temperature": getattr(llm, "temperature", None),
+            "top_p": getattr(llm, "top_p", None),
+            "seed": getattr(llm, "seed", None),
+        },
+        "context": context,
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def write_atomic(path: Path, content: str) -> None:
+    """Write a text file so readers never observe a partial write."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            handle.write(content)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def restore_output(task: Task, raw: str) -> TaskOutput:
+    """Attach a previously produced raw output to a task without executing it."""
+    output = TaskOutput(
+        name=task.name,
+        description=task.description,
+        expected_output=task.expected_output,
+        raw=raw,
+        agent=task.agent.role,
+        output_format=OutputFormat.RAW,
+    )
+    task.output = output
+    return output
+
+
+def fingerprint_path(output_file: str) -> Path:
+    """Location of the fingerprint recorded next to a task's output file."""
+    path = Path(output_file)
+    return path.with_name(f"{path.name}.fingerprint")
+
+
+def record_artifact(task: Task, key: str) -> None:
+    """Record the fingerprint that produced a task's output file."""
+    if task.output_file:
+        write_atomic(fingerprint_path(task.output_file), key)
+
+
+def load_artifact(task: Task, key: str) -> Optional[TaskOutput]:
+    """Rehydrate a task from its output file if it was produced from ``key``."""
+    if not task.output_file:
+        return None
+    try:
+        if fingerprint_path(task.output_file).read_text(encoding="utf-8").strip() != key:
+            return None
+        raw = Path(task.output_file).read_text(encoding="utf-8")
+    except OSError:
+        return None
+    return restore_output(task, raw)
+
+
+class TaskCache:
+    """Content-addressed on-disk cache of task outputs.
+
+    Entries are keyed by ``task_fingerprint`` and stored as small JSON files.
+    Reads refresh an entry's modification time, so eviction drops entries
+    that are past ``max_age`` seconds first and then the least recently used
+    ones until the cache fits in ``max_bytes``.
+    """
+
+    def __init__(
+        self,
+        directory: str = ".crew_cache/tasks",
+        max_bytes: int = 256 * 1024 * 1024,
+        max_age: Optional[float] = 30 * 24 * 3600,
+        bypass: Iterable[str] = (),
+    ):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.bypass = set(bypass)
+
+    @classmethod
+    def from_env(cls) -> Optional["TaskCache"]:
+        """Build the cache from ``CREW_CACHE_*`` settings, or None when disabled."""
+        if os.getenv("CREW_CACHE", "on").lower() in ("0", "off", "false", "no"):
+            return None
+        max_age = os.getenv("CREW_CACHE_MAX_AGE", str(30 * 24 * 3600))
+        return cls(
+            directory=os.getenv("CREW_CACHE_DIR", ".crew_cache/tasks"),
+            max_bytes=int(os.getenv("CREW_CACHE_MAX_BYTES", str(256 * 1024 * 1024))),
+            max_age=float(max_age) if max_age else None,
+            bypass=[name for name in os.getenv("CREW_CACHE_BYPASS", "").split(",") if name],
+        )
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def enabled_for(self, task: Task) -> bool:
+        """Whether the task may be served from or stored in the cache."""
+        return task.name not in self.bypass
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return the cached entry for a key, or None on a miss."""
+        path = self._path(key)
+        try:
+            if self.max_age is not None and time.time() - path.stat().st_mtime > self.max_age:
+                path.unlink()
+                return None
+            with open(path, encoding="utf-8") as handle:
+                entry = json.load(handle)
+            os.utime(path)
+            return entry
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key: str, output: TaskOutput) -> None:
+        """Store a task output under a key and evict entries over the limits."""
+        entry = {
+            "name": output.name,
+            "agent": output.agent,
+            "raw": output.raw,
+            "created": time.time(),
+        }
+        write_atomic(self._path(key), json.dumps(entry))
+        self.evict()
+
+    def evict(self) -> None:
+        """Drop expired entries, then the least recently used ones over ``max_bytes``."""
+        now = time.time()
+        entries = []
+        for path in self.directory.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            if self.max_age is not None and now - stat.st_mtime > self.max_age:
+                path.unlink(missing_ok=True)
+            else:
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+    def load(self, task: Task, key: str) -> Optional[TaskOutput]:
+        """Rebuild a task's output from the cache and materialize its output file."""
+        entry = self.get(key)
+        if entry is None:
+            return None
+
+        output = restore_output(task, entry["raw"])
+        if task.output_file:
+            write_atomic(Path(task.output_file), output.raw)
+        return output
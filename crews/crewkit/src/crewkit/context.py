@@ -0,0 +1,147 @@
+import hashlib
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from crewai import Task
+from crewai.tasks.task_output import TaskOutput
+
+from crewkit.cache import write_atomic
+
+# Separator crewAI places between upstream outputs in a task's context
+CONTEXT_DIVIDER = "\n\n----------\n\n"
+
+_HEADING = re.compile(r"^#{1,6}\s", re.MULTILINE)
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s")
+_WORD = re.compile(r"[a-z][a-z'-]{3,}")
+_STOPWORDS = {
+    "about", "after", "also", "and", "any", "are", "based", "been", "before", "being", "each",
+    "ensure", "format", "from", "have", "into", "markdown", "more", "must", "only", "other",
+    "over", "should", "such", "than", "that", "their", "them", "then", "there", "these",
+    "they", "this", "those", "through", "using", "well", "were", "what", "when", "where",
+    "which", "while", "with", "within", "without", "would", "your",
+}
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count, at roughly four characters per token."""
+    return (len(text) + 3) // 4
+
+
+def split_sections(text: str) -> List[str]:
+    """Split markdown into sections that each start at a heading."""
+    starts = [match.start() for match in _HEADING.finditer(text)]
+    if not starts or starts[0] != 0:
+        starts.insert(0, 0)
+    bounds = starts[1:] + [len(text)]
+    return [text[start:end].strip() for start, end in zip(starts, bounds) if text[start:end].strip()]
+
+
+def summarize_section(section: str) -> str:
+    """Extractive summary: the heading plus the first sentence of each paragraph."""
+    lines = section.split("\n", 1)
+    heading, body = (lines[0], lines[1] if len(lines) > 1 else "") if _HEADING.match(section) else ("", section)
+    firsts = []
+    for paragraph in re.split(r"\n\s*\n", body):
+        paragraph = " ".join(paragraph.split())
+        if paragraph:
+            firsts.append(_SENTENCE_END.split(paragraph, 1)[0])
+    return "\n".join(part for part in [heading, " ".join(firsts)] if part)
+
+
+class ContextCondenser:
+    """Fits the upstream outputs of a task into a token budget.
+
+    Payloads that fit their share of the budget are passed through
+    unchanged. Larger ones keep their sections most relevant to the
+    consuming task verbatim and fall back to extractive summaries for the
+    rest, with a pointer to the full artifact on disk. Condensed payloads
+    are cached by content so repeated runs reuse them.
+    """
+
+    def __init__(self, directory: str = ".crew_cache/context"):
+        self.directory = Path(directory)
+        self._memory: Dict[str, str] = {}
+
+    def fit(self, task: Task, upstream: List[Tuple[Task, TaskOutput]], budget: int) -> str:
+        """Build a task's context from its upstream outputs within ``budget`` tokens."""
+        payloads = [output.raw for _, output in upstream]
+        if sum(estimate_tokens(payload) for payload in payloads) <= budget:
+            return CONTEXT_DIVIDER.join(payloads)
+
+        terms = self._terms(f"{task.description} {task.expected_output}")
+        shares = self._allocate([estimate_tokens(payload) for payload in payloads], budget)
+        fitted = []
+        for (source, _), payload, share in zip(upstream, payloads, shares):
+            if estimate_tokens(payload) <= share:
+                fitted.append(payload)
+                continue
+            note = f"\n\n[Condensed to fit the context budget; full text in {source.output_file or source.name}]"
+            fitted.append(self._condense(payload, share - estimate_tokens(note), terms) + note)
+        return CONTEXT_DIVIDER.join(fitted)
+
+    @staticmethod
+    def _allocate(sizes: List[int], budget: int) -> List[int]:
+        """Split a budget so small payloads keep their size and large ones share the rest."""
+        shares = [0] * len(sizes)
+        remaining = budget
+        pending = sorted(range(len(sizes)), key=sizes.__getitem__)
+        while pending:
+            index = pending.pop(0)
+            shares[index] = min(sizes[index], remaining // (len(pending) + 1))
+            remaining -= shares[index]
+        return shares
+
+    @staticmethod
+    def _terms(text: str) -> Set[str]:
+        return {word for word in _WORD.findall(text.lower()) if word not in _STOPWORDS}
+
+    def _condense(self, text: str, budget: int, terms: Set[str]) -> str:
+        key = hashlib.sha256(f"{budget}\0{sorted(terms)}\0{text}".encode("utf-8")).hexdigest()
+        cached = self._cached(key)
+        if cached is not None:
+            return cached
+
+        sections = split_sections(text)
+        ranked = sorted(
+            range(len(sections)),
+            key=lambda index: self._relevance(sections[index], terms),
+            reverse=True,
+        )
+        chosen: Dict[int, str] = {}
+        remaining = budget
+        for index in ranked:
+            cost = estimate_tokens(sections[index])
+            if cost <= remaining:
+                chosen[index] = sections[index]
+                remaining -= cost
+        for index in ranked:
+            if index in chosen:
+                continue
+            summary = summarize_section(sections[index])
+            cost = estimate_tokens(summary)
+            if summary and cost <= remaining:
+                chosen[index] = summary
+                remaining -= cost
+
+        condensed = "\n\n".join(chosen[index] for index in sorted(chosen))
+        self._memory[key] = condensed
+        write_atomic(self.directory / f"{key}.md", condensed)
+        return condensed
+
+    def _cached(self, key: str) -> Optional[str]:
+        if key in self._memory:
+            return self._memory[key]
+        try:
+            condensed = (self.directory / f"{key}.md").read_text(encoding="utf-8")
+        except OSError:
+            return None
+        self._memory[key] = condensed
+        return condensed
+
+    @staticmethod
+    def _relevance(section: str, terms: Set[str]) -> float:
+        words = _WORD.findall(section.lower())
+        if not words:
+            return 0.0
+        return sum(word in terms for word in words) / len(words) ** 0.5
@@ -0,0 +1,180 @@
+import os
+import threading
+from collections import defaultdict
+from typing import Any, Dict, Iterator, Optional
+
+import httpx
+
+_shared: Optional["HttpPool"] = None
+_shared_lock = threading.Lock()
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class _ReleasingStream(httpx.SyncByteStream):
+    """Response body that frees its host slot once the body is closed."""
+
+    def __init__(self, stream: httpx.SyncByteStream, release: Any):
+        self._stream = stream
+        self._release = release
+
+    def __iter__(self) -> Iterator[bytes]:
+        yield from self._stream
+
+    def close(self) -> None:
+        try:
+            self._stream.close()
+        finally:
+            self._release()
+
+
+class HostLimitedTransport(httpx.BaseTransport):
+    """Transport that allows at most ``per_host`` requests in flight to each host.
+
+    A request holds its host's slot until its response body is closed, so
+    streamed completions count for as long as they are being read.
+    """
+
+    def __init__(self, transport: httpx.BaseTransport, per_host: int):
+        self.transport = transport
+        self.per_host = per_host
+        self.requests: Dict[str, int] = defaultdict(int)
+        self.peak_in_flight: Dict[str, int] = defaultdict(int)
+        self._in_flight: Dict[str, int] = defaultdict(int)
+        self._slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        host = f"{request.url.scheme}://{request.url.netloc.decode('ascii')}"
+        with self._lock:
+            slot = self._slots.setdefault(host, threading.BoundedSemaphore(self.per_host))
+        slot.acquire()
+        with self._lock:
+            self.requests[host] += 1
+            self._in_flight[host] += 1
+            self.peak_in_flight[host] = max(self.peak_in_flight[host], self._in_flight[host])
+
+        released = False
+
+        def release() -> None:
+            nonlocal released
+            with self._lock:
+                if released:
+                    return
+                released = True
+                self._in_flight[host] -= 1
+            slot.release()
+
+        try:
+            response = self.transport.handle_request(request)
+        except BaseException:
+            release()
+            raise
+        if response.is_closed:
+            # Responses built in memory, as by httpx.MockTransport, arrive already read
+            release()
+        else:
+            response.stream = _ReleasingStream(response.stream, release)
+        return response
+
+    def close(self) -> None:
+        self.transport.close()
+
+
+class HttpPool:
+    """Process-wide HTTP connection pool shared by every LLM call.
+
+    litellm sends completions through the installed clients, so all agents
+    of all crews in a process reuse kept-alive (or HTTP/2) connections
+    instead of each opening their own. Synchronous requests are also
+    limited to ``per_host`` in flight per host. ``transport`` and
+    ``async_transport`` replace the network transports, for example with
+    ``httpx.MockTransport`` in tests, and ``base_url`` is passed to both
+    clients.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive: int = 20,
+        keepalive_expiry: float = 60.0,
+        per_host: int = 16,
+        http2: bool = True,
+        timeout: float = 600.0,
+        transport: Optional[httpx.BaseTransport] = None,
+        async_transport: Optional[httpx.AsyncBaseTransport] = None,
+        base_url: str = "",
+    ):
+        self.http2 = http2 and _http2_available()
+        limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=keepalive_expiry,
+        )
+        if transport is None:
+            transport = httpx.HTTPTransport(limits=limits, http2=self.http2)
+        if async_transport is None:
+            async_transport = httpx.AsyncHTTPTransport(limits=limits, http2=self.http2)
+        self.transport = HostLimitedTransport(transport, per_host)
+        self.client = httpx.Client(transport=self.transport, base_url=base_url, timeout=timeout)
+        self.async_client = httpx.AsyncClient(transport=async_transport, base_url=base_url, timeout=timeout)
+        self._installed = False
+        self._previous_sessions: Optional[tuple] = None
+
+    @classmethod
+    def from_env(cls) -> Optional["HttpPool"]:
+        """Return the process-wide pool configured by ``CREW_HTTP_*``, or None when disabled."""
+        global _shared
+        if os.getenv("CREW_HTTP_POOL", "on").lower() in ("0", "off", "false", "no"):
+            return None
+        with _shared_lock:
+            if _shared is None:
+                _shared = cls(
+                    max_connections=int(os.getenv("CREW_HTTP_MAX_CONNECTIONS", "100")),
+                    max_keepalive=int(os.getenv("CREW_HTTP_MAX_KEEPALIVE", "20")),
+                    keepalive_expiry=float(os.getenv("CREW_HTTP_KEEPALIVE_EXPIRY", "60")),
+                    per_host=int(os.getenv("CREW_HTTP_PER_HOST", "16")),
+                    http2=os.getenv("CREW_HTTP2", "on").lower() not in ("0", "off", "false", "no"),
+                )
+            return _shared
+
+    def install(self) -> None:
+        """Route litellm's HTTP traffic through this pool's clients."""
+        if self._installed:
+            return
+        import litellm
+
+        self._previous_sessions = (litellm.client_session, litellm.aclient_session)
+        litellm.client_session = self.client
+        litellm.aclient_session = self.async_client
+        self._installed = True
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Requests sent and the most requests in flight at once, per host."""
+        with self.transport._lock:
+            return {
+                host: {"requests": count, "peak_in_flight": self.transport.peak_in_flight[host]}
+                for host, count in self.transport.requests.items()
+            }
+
+    def close(self) -> None:
+        """Close the synchronous client and give litellm back the clients it had before ``install``."""
+        global _shared
+        if self._installed:
+            import litellm
+
+            if litellm.client_session is self.client:
+                litellm.client_session = self._previous_sessions[0]
+            if litellm.aclient_session is self.async_client:
+                litellm.aclient_session = self._previous_sessions[1]
+            self._installed = False
+        with _shared_lock:
+            if _shared is self:
+                _shared = None
+        self.client.close()
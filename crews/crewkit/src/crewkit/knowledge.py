@@ -0,0 +1,314 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+from crewai.knowledge.knowledge import Knowledge
+from crewai.knowledge.source.base_knowledge_source import BaseKnowledgeSource
+from crewai.knowledge.source.text_file_knowledge_source import TextFileKnowledgeSource
+from crewai.knowledge.storage.knowledge_storage import KnowledgeStorage
+
+from crewkit.logs import log_event
+
+# Knowledge files picked up from a knowledge directory
+KNOWLEDGE_SUFFIXES = (".txt", ".md")
+
+# Texts sent to the embedding model per request
+_EMBED_BATCH = 256
+
+_stores: Dict[str, "EmbeddingStore"] = {}
+_knowledge: Dict[Tuple[str, ...], Knowledge] = {}
+_shared_lock = threading.Lock()
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _normalized(vectors: Any) -> np.ndarray:
+    """``vectors`` as float32 rows of unit length, so a dot product is their cosine similarity."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+
+class EmbeddingUnavailable(RuntimeError):
+    """The embedding model could not be set up or called."""
+
+
+def embedder_from_env() -> Optional[Dict[str, Any]]:
+    """Embedder config from ``CREW_EMBEDDER`` (``provider/model``), or None for crewAI's default."""
+    value = os.getenv("CREW_EMBEDDER", "")
+    if not value:
+        return None
+    provider, _, model = value.partition("/")
+    return {"provider": provider, "config": {"model": model} if model else {}}
+
+
+def embedder_key(embedder: Optional[Dict[str, Any]]) -> str:
+    """Identity of an embedding model; vectors from different models are never mixed."""
+    if not embedder:
+        return "openai/text-embedding-3-small"
+    config = {
+        name: value
+        for name, value in (embedder.get("config") or {}).items()
+        if not any(secret in name.lower() for secret in ("key", "token", "secret"))
+    }
+    return f"{embedder.get('provider')}/{json.dumps(config, sort_keys=True, default=lambda value: type(value).__qualname__)}"
+
+
+class EmbeddingStore:
+    """Content-addressed embedding vectors for one embedding model.
+
+    Vectors are appended to a flat float32 file that is read through a
+    memory map, so every crew in a process, and every process on the
+    machine, shares one copy through the page cache. A small SQLite index
+    maps the SHA-256 of each text to its row, so identical chunks, such as
+    the same knowledge file shipped with several crews, are embedded and
+    stored once. Vectors are normalized, so a dot product is their cosine
+    similarity.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory).expanduser()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._vectors_path = self.directory / "vectors.f32"
+        self._lock = threading.Lock()
+        self._map: Optional[np.memmap] = None
+        self._db = sqlite3.connect(
+            str(self.directory / "index.sqlite3"), check_same_thread=False, isolation_level=None, timeout=30
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL);
+            CREATE TABLE IF NOT EXISTS vectors (digest TEXT PRIMARY KEY, row INTEGER NOT NULL) WITHOUT ROWID;
+            """
+        )
+
+    @classmethod
+    def for_embedder(cls, embedder: Optional[Dict[str, Any]]) -> "EmbeddingStore":
+        """The process-wide store for ``embedder`` under ``CREW_EMBEDDING_DIR``."""
+        root = Path(os.getenv("CREW_EMBEDDING_DIR", "~/.cache/crewkit/embeddings")).expanduser()
+        directory = str(root / _digest(embedder_key(embedder))[:16])
+        with _shared_lock:
+            if directory not in _stores:
+                _stores[directory] = cls(directory)
+            return _stores[directory]
+
+    @property
+    def dim(self) -> Optional[int]:
+        row = self._db.execute("SELECT value FROM meta WHERE name = 'dim'").fetchone()
+        return int(row[0]) if row else None
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM vectors").fetchone()[0]
+
+    def rows(self, texts: List[str], embed: Callable[[List[str]], Any]) -> List[int]:
+        """Row of each text's vector, embedding only the texts not stored yet."""
+        digests = [_digest(text) for text in texts]
+        with self._lock:
+            found = self._lookup(set(digests))
+            missing = {digest: text for digest, text in zip(digests, texts) if digest not in found}
+            if missing:
+                found.update(self._append(missing, embed))
+        return [found[digest] for digest in digests]
+
+    def vectors(self, rows: List[int]) -> np.ndarray:
+        """The vectors stored at ``rows``, read from the memory map."""
+        with self._lock:
+            if self._map is None or (rows and max(rows) >= len(self._map)):
+                dim = self.dim
+                self._map = np.memmap(
+                    self._vectors_path,
+                    dtype=np.float32,
+                    mode="r",
+                    shape=(self._vectors_path.stat().st_size // (dim * 4), dim),
+                )
+            return self._map[rows]
+
+    def _lookup(self, digests: set) -> Dict[str, int]:
+        found: Dict[str, int] = {}
+        digests = list(digests)
+        for start in range(0, len(digests), 500):
+            batch = digests[start:start + 500]
+            found.update(self._db.execute(
+                f"SELECT digest, row FROM vectors WHERE digest IN ({', '.join('?' * len(batch))})", batch
+            ).fetchall())
+        return found
+
+    def _append(self, missing: Dict[str, str], embed: Callable[[List[str]], Any]) -> Dict[str, int]:
+        texts = list(missing.values())
+        vectors = _normalized(np.concatenate([
+            np.asarray(embed(texts[start:start + _EMBED_BATCH]), dtype=np.float32)
+            for start in range(0, len(texts), _EMBED_BATCH)
+        ]))
+
+        # Embedding happens outside the transaction; another process may have stored some meanwhile
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            dim = self.dim
+            if dim is None:
+                dim = vectors.shape[1]
+                self._db.execute("INSERT INTO meta (name, value) VALUES ('dim', ?)", (str(dim),))
+            elif dim != vectors.shape[1]:
+                raise ValueError(f"Embedding size {vectors.shape[1]} does not match the store's {dim}")
+            existing = self._lookup(set(missing))
+            new = [index for index, digest in enumerate(missing) if digest not in existing]
+            row_bytes = dim * 4
+            with open(self._vectors_path, "a+b") as file:
+                # Pad out a partial row left behind by an interrupted write
+                file.seek(0, os.SEEK_END)
+                start = -(-file.tell() // row_bytes)
+                file.truncate(start * row_bytes)
+                file.write(vectors[new].tobytes())
+                file.flush()
+                os.fsync(file.fileno())
+            digests = list(missing)
+            rows = {digests[index]: start + offset for offset, index in enumerate(new)}
+            self._db.executemany("INSERT INTO vectors (digest, row) VALUES (?, ?)", list(rows.items()))
+            self._db.execute("COMMIT")
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+        return {**existing, **rows}
+
+
+class SharedKnowledgeStorage(KnowledgeStorage):
+    """Knowledge storage backed by the shared ``EmbeddingStore`` instead of a vector database.
+
+    Saving only records the chunks. They are embedded, or found in the
+    store, on the first search, so constructing a crew never calls the
+    embedding model; if it is unreachable, searches log a warning and find
+    nothing. Queries are embedded on every search and never stored. Scores
+    are cosine similarities, higher is better.
+    """
+
+    def __init__(self, embedder: Optional[Dict[str, Any]] = None, collection_name: Optional[str] = None):
+        self.collection_name = collection_name
+        self.embedder_config = embedder
+        self.embedder = None
+        self._documents: Dict[str, Tuple[str, Optional[Dict[str, Any]]]] = {}
+        self._rows: Optional[List[int]] = None
+        self._store: Optional[EmbeddingStore] = None
+        self._lock = threading.Lock()
+
+    def initialize_knowledge_storage(self) -> None:
+        pass
+
+    def save(
+        self,
+        documents: List[str],
+        metadata: Optional[Union[Dict[str, Any], List[Dict[str, Any]]]] = None,
+    ) -> None:
+        with self._lock:
+            for index, document in enumerate(documents):
+                meta = metadata[index] if isinstance(metadata, list) else metadata
+                self._documents[_digest(document)] = (document, meta)
+            self._rows = None
+
+    def search(
+        self,
+        query: List[str],
+        limit: int = 3,
+        filter: Optional[dict] = None,
+        score_threshold: float = 0.35,
+    ) -> List[Dict[str, Any]]:
+        try:
+            store, documents = self._load()
+            candidates = [
+                (digest, text, meta, row)
+                for digest, text, meta, row in documents
+                if not filter or all((meta or {}).get(name) == value for name, value in filter.items())
+            ]
+            if not candidates or not query:
+                return []
+            queries = _normalized(self._embed(list(query)))
+        except EmbeddingUnavailable as error:
+            # Like a knowledge source crewAI fails to set up, run without it
+            log_event(logging.WARNING, "knowledge_unavailable", error=repr(error))
+            return []
+        scores = (store.vectors([row for *_, row in candidates]) @ queries.T).max(axis=1)
+        results = []
+        for index in np.argsort(-scores)[:limit]:
+            if scores[index] >= score_threshold:
+                digest, text, meta, _ = candidates[index]
+                results.append({"id": digest, "metadata": meta, "context": text, "score": float(scores[index])})
+        return results
+
+    def reset(self) -> None:
+        with self._lock:
+            self._documents.clear()
+            self._rows = None
+
+    def _load(self) -> Tuple[EmbeddingStore, List[Tuple[str, str, Optional[Dict[str, Any]], int]]]:
+        with self._lock:
+            if self._store is None:
+                self._store = EmbeddingStore.for_embedder(self.embedder_config)
+            documents = list(self._documents.items())
+            if self._rows is None:
+                self._rows = self._store.rows([text for _, (text, _) in documents], self._embed)
+            return self._store, [
+                (digest, text, meta, row) for (digest, (text, meta)), row in zip(documents, self._rows)
+            ]
+
+    def _embed(self, texts: List[str]) -> Any:
+        try:
+            if self.embedder is None:
+                self._set_embedder_config(self.embedder_config)
+            return self.embedder(texts)
+        except Exception as error:
+            raise EmbeddingUnavailable(f"Embedding model unavailable: {error!r}") from error
+
+
+def knowledge_sources(directory: str) -> List[BaseKnowledgeSource]:
+    """A text source for the knowledge files in ``directory``, or none if it has none."""
+    paths = sorted(
+        path for path in Path(directory).rglob("*")
+        if path.is_file() and path.suffix.lower() in KNOWLEDGE_SUFFIXES
+    )
+    return [TextFileKnowledgeSource(file_paths=paths)] if paths else []
+
+
+def _source_key(source: BaseKnowledgeSource) -> Optional[str]:
+    content = getattr(source, "content", None)
+    if isinstance(content, dict):
+        # Identical files share a key wherever they live
+        text = "\0".join(sorted(content.values()))
+    elif isinstance(content, str):
+        text = content
+    else:
+        return None
+    return _digest(f"{type(source).__name__}:{source.chunk_size}:{source.chunk_overlap}:{text}")
+
+
+def shared_knowledge(sources: List[BaseKnowledgeSource], embedder: Optional[Dict[str, Any]] = None) -> Knowledge:
+    """Knowledge over ``sources`` backed by the shared embedding store.
+
+    Crews whose sources have the same content, like the ``user_preference.txt``
+    every crew here ships, get the same ``Knowledge`` object.
+    """
+    keys = [_source_key(source) for source in sources]
+    if None in keys:
+        return Knowledge(collection_name="crew", sources=sources, storage=SharedKnowledgeStorage(embedder, "crew"))
+    key = (embedder_key(embedder), *sorted(keys))
+    with _shared_lock:
+        if key not in _knowledge:
+            _knowledge[key] = Knowledge(
+                collection_name="crew", sources=sources, storage=SharedKnowledgeStorage(embedder, "crew")
+            )
+        return _knowledge[key]
+
+
+def knowledge_from_env(embedder: Optional[Dict[str, Any]] = None) -> Optional[Knowledge]:
+    """Shared knowledge over the files in ``CREW_KNOWLEDGE_DIR``, or None when unset or empty."""
+    directory = os.getenv("CREW_KNOWLEDGE_DIR", "")
+    if not directory or not Path(directory).is_dir():
+        return None
+    sources = knowledge_sources(directory)
+    return shared_knowledge(sources, embedder or embedder_from_env()) if sources else None
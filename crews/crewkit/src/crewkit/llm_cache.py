@@ -0,0 +1,194 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+# Crew inputs whose values change between otherwise identical runs
+DEFAULT_VOLATILE_INPUTS = ("timestamp", "current_year")
+
+# LLM attributes that change what the model returns for the same prompt
+SAMPLING_PARAMS = (
+    "temperature",
+    "top_p",
+    "n",
+    "stop",
+    "max_tokens",
+    "max_completion_tokens",
+    "presence_penalty",
+    "frequency_penalty",
+    "seed",
+    "response_format",
+    "reasoning_effort",
+)
+
+_ISO_TIMESTAMP = re.compile(r"\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:Z|[+-]\d{2}:?\d{2})?")
+_WHITESPACE = re.compile(r"\s+")
+
+_shared: Optional["ResponseCache"] = None
+_shared_lock = threading.Lock()
+
+
+def base_call(llm: Any) -> Any:
+    """The LLM's own ``call``, from before any crewkit wrapper was installed on it."""
+    if not hasattr(llm, "_base_call"):
+        llm._base_call = llm.call
+    return llm._base_call
+
+
+class ResponseCache:
+    """SQLite-backed cache of LLM responses shared by every crew in a process.
+
+    Keys combine the model, its sampling parameters and the prompt after
+    normalization: whitespace is collapsed, ISO timestamps are masked, and
+    the values of volatile crew inputs such as ``current_year`` are replaced
+    by their input name. Entries expire after ``ttl`` seconds and the least
+    recently used ones are evicted beyond ``max_entries``.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl: Optional[float] = 7 * 24 * 3600,
+        max_entries: int = 50_000,
+        volatile_inputs: Iterable[str] = DEFAULT_VOLATILE_INPUTS,
+    ):
+        self.path = Path(path).expanduser()
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.volatile_inputs = tuple(volatile_inputs)
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " model TEXT,"
+            " response TEXT NOT NULL,"
+            " created REAL NOT NULL,"
+            " accessed REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+
+    @classmethod
+    def from_env(cls) -> Optional["ResponseCache"]:
+        """Return the process-wide cache configured by ``CREW_LLM_CACHE_*``, or None when disabled."""
+        global _shared
+        if os.getenv("CREW_LLM_CACHE", "on").lower() in ("0", "off", "false", "no"):
+            return None
+        with _shared_lock:
+            if _shared is None:
+                ttl = os.getenv("CREW_LLM_CACHE_TTL", str(7 * 24 * 3600))
+                _shared = cls(
+                    path=os.getenv("CREW_LLM_CACHE_PATH", "~/.cache/crewkit/llm_responses.sqlite3"),
+                    ttl=float(ttl) if ttl else None,
+                    max_entries=int(os.getenv("CREW_LLM_CACHE_MAX_ENTRIES", "50000")),
+                )
+            return _shared
+
+    def normalize(self, text: str, volatile: Dict[str, str]) -> str:
+        """Mask run-specific values in a prompt so equivalent prompts share a key."""
+        text = _ISO_TIMESTAMP.sub("{timestamp}", text)
+        for name, value in volatile.items():
+            if value:
+                text = text.replace(value, f"{{{name}}}")
+        return _WHITESPACE.sub(" ", text).strip()
+
+    def key(self, llm: Any, messages: Any, volatile: Dict[str, str]) -> str:
+        """Cache key for a prompt sent to an LLM."""
+        if isinstance(messages, str):
+            messages = [{"role": "user", "content": messages}]
+        payload = {
+            "model": getattr(llm, "model", str(llm)),
+            "params": {name: getattr(llm, name, None) for name in SAMPLING_PARAMS},
+            "messages": [
+                {
+                    "role": message.get("role"),
+                    "content": self.normalize(str(message.get("content") or ""), volatile),
+                }
+                for message in messages
+            ],
+        }
+        encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return a cached response, counting the lookup as a hit or miss."""
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT response, created FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and self.ttl is not None and now - row[1] > self.ttl:
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self._db.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            return row[0]
+
+    def put(self, key: str, response: str, model: Optional[str] = None) -> None:
+        """Store a response and evict expired and least recently used entries."""
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, model, response, created, accessed)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, model, response, now, now),
+            )
+            if self.ttl is not None:
+                self._db.execute("DELETE FROM responses WHERE created < ?", (now - self.ttl,))
+            self._db.execute(
+                "DELETE FROM responses WHERE key IN ("
+                " SELECT key FROM responses ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def stats(self) -> Dict[str, int]:
+        """Hit and miss counters for this process, plus the number of stored entries."""
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        return {"hits": self.hits, "misses": self.misses, "entries": entries}
+
+    def install(self, llm: Any, volatile: Dict[str, str]) -> None:
+        """Route an LLM's plain completions through the cache."""
+        llm.call = self.wrap(llm, base_call(llm), volatile)
+
+    def wrap(self, llm: Any, original: Any, volatile: Dict[str, str]) -> Any:
+        """Wrap an LLM ``call`` so plain completions go through the cache.
+
+        Calls that offer tools to the model are passed straight through,
+        since their result depends on executing those tools.
+        """
+
+        def call(messages, tools=None, callbacks=None, available_functions=None, **kwargs):
+            if tools or available_functions:
+                return original(
+                    messages,
+                    tools=tools,
+                    callbacks=callbacks,
+                    available_functions=available_functions,
+                    **kwargs,
+                )
+
+            key = self.key(llm, messages, volatile)
+            cached = self.get(key)
+            if cached is not None:
+                return cached
+
+            response = original(messages, callbacks=callbacks, **kwargs)
+            if isinstance(response, str) and response:
+                self.put(key, response, getattr(llm, "model", None))
+            return response
+
+        return call
@@ -0,0 +1,164 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import sys
+import threading
+import time
+from logging.handlers import MemoryHandler, QueueHandler, QueueListener
+from typing import Any, Optional
+
+# Runtime modes: verbose console output while developing, structured logs in production
+MODES = ("debug", "production")
+
+LOGGER_NAME = "crewkit"
+
+_listener: Optional[QueueListener] = None
+_handler: Optional[QueueHandler] = None
+_configure_lock = threading.Lock()
+
+
+def run_mode() -> str:
+    """Read the runtime mode from ``CREW_MODE``, defaulting to ``debug``."""
+    mode = os.getenv("CREW_MODE", "debug").lower()
+    if mode not in MODES:
+        raise ValueError(f"CREW_MODE must be one of {', '.join(MODES)}, got {mode!r}")
+    return mode
+
+
+def verbose_enabled(mode: Optional[str] = None) -> bool:
+    """Whether agents and crews should print their console output."""
+    return (mode or run_mode()) == "debug"
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps a random fraction of records below WARNING; warnings and errors always pass."""
+
+    def __init__(self, rate: float = 1.0):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno >= logging.WARNING or self.rate >= 1.0 or random.random() < self.rate
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, with the fields passed to ``log_event``."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": record.created,
+            "level": record.levelname,
+            "logger": record.name,
+            "event": record.getMessage(),
+            **getattr(record, "fields", {}),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class BufferedHandler(MemoryHandler):
+    """Flushes when the buffer fills, on errors, or once ``interval`` seconds have passed.
+
+    The interval is checked as records arrive and, through ``flush_if_due``,
+    by ``FlushingQueueListener`` while none do.
+    """
+
+    def __init__(self, capacity: int, target: logging.Handler, interval: float = 1.0):
+        super().__init__(capacity, flushLevel=logging.ERROR, target=target)
+        self.interval = interval
+        self._flushed = time.monotonic()
+
+    def shouldFlush(self, record: logging.LogRecord) -> bool:
+        return super().shouldFlush(record) or time.monotonic() - self._flushed >= self.interval
+
+    def flush(self) -> None:
+        super().flush()
+        self._flushed = time.monotonic()
+
+    def flush_if_due(self) -> None:
+        if self.buffer and time.monotonic() - self._flushed >= self.interval:
+            self.flush()
+
+
+class FlushingQueueListener(QueueListener):
+    """A queue listener that flushes its buffered handlers on time while the queue is idle."""
+
+    def __init__(self, records: queue.Queue, *handlers: logging.Handler, interval: float = 1.0):
+        super().__init__(records, *handlers)
+        self.interval = interval
+
+    def dequeue(self, block: bool) -> Any:
+        while True:
+            try:
+                return self.queue.get(block, timeout=self.interval if block else None)
+            except queue.Empty:
+                if not block:
+                    raise
+                for handler in self.handlers:
+                    if isinstance(handler, BufferedHandler):
+                        handler.flush_if_due()
+
+
+def configure_logging() -> logging.Logger:
+    """Route the crewkit logger through a background thread to buffered JSON output.
+
+    Records are handed to a queue, so logging never blocks a task on I/O.
+    ``CREW_LOG_LEVEL``, ``CREW_LOG_SAMPLE``, ``CREW_LOG_FILE`` and
+    ``CREW_LOG_BUFFER`` control the level, the fraction of sub-warning
+    records kept, the destination (stderr by default) and the buffer size.
+    """
+    global _listener, _handler
+    logger = logging.getLogger(LOGGER_NAME)
+    with _configure_lock:
+        if _listener is not None:
+            return logger
+
+        path = os.getenv("CREW_LOG_FILE")
+        output = logging.FileHandler(path, encoding="utf-8") if path else logging.StreamHandler(sys.stderr)
+        buffered = BufferedHandler(int(os.getenv("CREW_LOG_BUFFER", "256")), output)
+
+        # Records are serialized on the calling thread, so the queue only carries finished lines
+        records: queue.Queue = queue.Queue(-1)
+        _handler = QueueHandler(records)
+        _handler.setFormatter(JsonFormatter())
+        _handler.addFilter(SamplingFilter(float(os.getenv("CREW_LOG_SAMPLE", "1.0"))))
+        logger.addHandler(_handler)
+        logger.setLevel(os.getenv("CREW_LOG_LEVEL", "INFO").upper())
+        logger.propagate = False
+
+        _listener = FlushingQueueListener(records, buffered, interval=buffered.interval)
+        _listener.start()
+        atexit.register(shutdown_logging)
+    return logger
+
+
+def shutdown_logging() -> None:
+    """Drain the queue and flush buffered records."""
+    global _listener, _handler
+    with _configure_lock:
+        if _listener is None:
+            return
+        logging.getLogger(LOGGER_NAME).removeHandler(_handler)
+        _listener.stop()
+        for handler in _listener.handlers:
+            target = handler.target
+            handler.close()
+            target.close()
+        _listener = None
+        _handler = None
+
+
+def log_enabled(level: int) -> bool:
+    """Whether events at ``level`` would be logged, to skip building expensive fields."""
+    return logging.getLogger(LOGGER_NAME).isEnabledFor(level)
+
+
+def log_event(level: int, event: str, **fields: Any) -> None:
+    """Log a structured event on the crewkit logger."""
+    logger = logging.getLogger(LOGGER_NAME)
+    if logger.isEnabledFor(level):
+        logger.log(level, event, extra={"fields": fields})
@@ -0,0 +1,186 @@
+import copy
+import hashlib
+import json
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import yaml
+from crewai.project import CrewBase as _CrewBase
+
+from crewkit.cache import write_atomic
+
+# Config keys resolved to the result of a decorated method, and the decorator's marker
+_AGENT_CALLS = {"llm": "is_llm", "function_calling_llm": "is_llm", "step_callback": "is_callback",
+                "cache_handler": "is_cache_handler"}
+_TASK_REFERENCES = {"output_json": "is_output_json", "output_pydantic": "is_output_pydantic"}
+
+
+def _config_cache_dir() -> Path:
+    return Path(os.getenv("CREW_CONFIG_CACHE_DIR", ".crew_cache/config"))
+
+
+@lru_cache(maxsize=64)
+def _parse(digest: str, text: str) -> Any:
+    cached = _config_cache_dir() / f"{digest}.json"
+    try:
+        return json.loads(cached.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        pass
+    data = yaml.load(text, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+    try:
+        encoded = json.dumps(data)
+    except TypeError:
+        encoded = None
+    if encoded is None or json.loads(encoded) != data:
+        # Values JSON cannot represent exactly, such as dates; parse again next time
+        return data
+    try:
+        write_atomic(cached, encoded)
+    except OSError:
+        pass
+    return data
+
+
+def load_yaml(path: Path) -> Any:
+    """Parse a YAML config file, reusing the parsed form while its content is unchanged.
+
+    Parsed configs are kept in memory for the process and as JSON under
+    ``CREW_CONFIG_CACHE_DIR``, keyed by a hash of the file's content.
+    """
+    text = Path(path).read_text(encoding="utf-8")
+    digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    # Callers map config entries in place, so never hand out the cached object
+    return copy.deepcopy(_parse(digest, text))
+
+
+def selected_tasks() -> Optional[List[str]]:
+    """Task names listed in ``CREW_TASKS``, or None to run every task."""
+    names = [name.strip() for name in os.getenv("CREW_TASKS", "").split(",") if name.strip()]
+    return names or None
+
+
+class LazyConfig(dict):
+    """Agent or task configs whose entries are resolved the first time they are read.
+
+    Resolving an entry builds the objects it refers to (a task's agent and
+    context tasks, an agent's tools and LLM), so entries that are never read
+    never construct anything.
+    """
+
+    def __init__(self, data: Dict[str, Any], resolve: Callable[[str, Dict[str, Any]], None]):
+        super().__init__(data or {})
+        self._resolve = resolve
+        self._resolved = set()
+
+    def __getitem__(self, name: str) -> Any:
+        entry = super().__getitem__(name)
+        if name not in self._resolved and isinstance(entry, dict):
+            self._resolved.add(name)
+            self._resolve(name, entry)
+        return entry
+
+    def get(self, name: str, default: Any = None) -> Any:
+        return self[name] if name in self else default
+
+
+def CrewBase(cls: type) -> type:
+    """crewAI's ``CrewBase`` with lazy construction and cached configs.
+
+    Agents and tasks are built only when a task that will run needs them:
+    the selected tasks (``tasks=[...]`` or ``CREW_TASKS``, default all), the
+    tasks in their ``context``, and the agents assigned to those tasks.
+    Agents that no such task uses are never constructed.
+    """
+    base = _CrewBase(cls)
+
+    class LazyCrew(base):
+        def __init__(self, *args: Any, tasks: Optional[Iterable[str]] = None, **kwargs: Any):
+            self._selected = list(tasks) if tasks is not None else selected_tasks()
+            self._tasks_to_build: Optional[Dict[str, Callable]] = None
+            super().__init__(*args, **kwargs)
+
+        load_yaml = staticmethod(load_yaml)
+
+        def map_all_agent_variables(self) -> None:
+            self.agents_config = LazyConfig(self.agents_config, self._map_agent)
+
+        def map_all_task_variables(self) -> None:
+            self.tasks_config = LazyConfig(self.tasks_config, self._map_task)
+
+        @property
+        def _original_tasks(self) -> Dict[str, Callable]:
+            """The task methods the ``@crew`` method builds: the selection and its context."""
+            if self._tasks_to_build is None:
+                self._tasks_to_build = self._select(self.__dict__["_all_tasks"])
+            return self._tasks_to_build
+
+        @_original_tasks.setter
+        def _original_tasks(self, methods: Dict[str, Callable]) -> None:
+            self.__dict__["_all_tasks"] = methods
+            self._tasks_to_build = None
+
+        @property
+        def _original_agents(self) -> Dict[str, Callable]:
+            # The crew picks up each built task's agent; no other agent is needed
+            return {}
+
+        @_original_agents.setter
+        def _original_agents(self, methods: Dict[str, Callable]) -> None:
+            pass
+
+        def _select(self, methods: Dict[str, Callable]) -> Dict[str, Callable]:
+            if self._selected is None:
+                return methods
+            unknown = [name for name in self._selected if name not in methods]
+            if unknown:
+                raise ValueError(f"Unknown tasks {', '.join(unknown)}; choose from {', '.join(methods)}")
+            needed = set()
+            pending = [methods[name](self) for name in self._selected]
+            while pending:
+                task = pending.pop()
+                if task.name in needed:
+                    continue
+                needed.add(task.name)
+                pending.extend(task.context if isinstance(task.context, list) else [])
+            # Keep declaration order so context tasks still precede the tasks using them
+            return {name: method for name, method in methods.items() if name in needed}
+
+        def _decorated(self, marker: str) -> Dict[str, Callable]:
+            return {
+                name: getattr(self, name)
+                for name, value in vars(cls).items()
+                if callable(value) and getattr(value, marker, False)
+            }
+
+        def _map_agent(self, name: str, entry: Dict[str, Any]) -> None:
+            for key, marker in _AGENT_CALLS.items():
+                methods = self._decorated(marker)
+                if isinstance(entry.get(key), str) and entry[key] in methods:
+                    entry[key] = methods[entry[key]]()
+            if entry.get("tools"):
+                tools = self._decorated("is_tool")
+                entry["tools"] = [tools[tool]() for tool in entry["tools"]]
+
+        def _map_task(self, name: str, entry: Dict[str, Any]) -> None:
+            if entry.get("context"):
+                tasks = self._decorated("is_task")
+                entry["context"] = [tasks[task]() for task in entry["context"]]
+            if entry.get("tools"):
+                tools = self._decorated("is_tool")
+                entry["tools"] = [tools[tool]() for tool in entry["tools"]]
+            if entry.get("agent"):
+                entry["agent"] = self._decorated("is_agent")[entry["agent"]]()
+            for key, marker in _TASK_REFERENCES.items():
+                if entry.get(key):
+                    entry[key] = self._decorated(marker)[entry[key]]
+            if entry.get("callbacks"):
+                callbacks = self._decorated("is_callback")
+                entry["callbacks"] = [callbacks[callback]() for callback in entry["callbacks"]]
+
+    LazyCrew.__name__ = cls.__name__
+    LazyCrew.__qualname__ = cls.__qualname__
+    LazyCrew.__module__ = cls.__module__
+    LazyCrew.__doc__ = cls.__doc__
+    return LazyCrew
@@ -0,0 +1,31 @@
+"""The crews in this repository, by the name workers, the streaming server and snapshots use."""
+import importlib
+from typing import Dict, Iterable, Tuple
+
+# Crew name -> module and class of the project whose ``crew()`` builds it
+CREWS: Dict[str, Tuple[str, str]] = {
+    "mywordpresscrew": ("mywordpresscrew.crew", "Mywordpresscrew"),
+    "mywritingcrew": ("mywritingcrew.crew", "Mywritingcrew"),
+    "personasynth": ("personasynth.crew", "PersonaSynth"),
+    "teddy_wordpress_writer": ("teddy_wordpress_writer.crew", "TeddyWordpressWriter"),
+}
+
+# Crew name -> ``module:function`` returning the DagCrew settings the crew builds at run time,
+# such as retrieval sources, which a snapshot cannot hold
+RUNTIME_SETTINGS: Dict[str, str] = {
+    "mywritingcrew": "mywritingcrew.crew:runtime_settings",
+}
+
+
+def check_crews(names: Iterable[str]) -> None:
+    """Raise ValueError naming any of ``names`` that is not a known crew."""
+    unknown = [name for name in names if name not in CREWS]
+    if unknown:
+        raise ValueError(f"Unknown crews {', '.join(unknown)}; choose from {', '.join(CREWS)}")
+
+
+def crew_class(name: str) -> type:
+    """Import and return the project class of a known crew."""
+    check_crews([name])
+    module_name, class_name = CREWS[name]
+    return getattr(importlib.import_module(module_name), class_name)
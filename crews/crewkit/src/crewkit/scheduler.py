@@ -0,0 +1,645 @@
+import logging
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from crewai import Crew, Task
+from crewai.crews.crew_output import CrewOutput
+from crewai.tasks.task_output import TaskOutput
+from crewai.types.usage_metrics import UsageMetrics
+from crewai.utilities.formatter import aggregate_raw_outputs_from_task_outputs
+from pydantic import ConfigDict, Field, PrivateAttr, model_validator
+
+from crewkit.cache import TaskCache, load_artifact, record_artifact, restore_output, task_fingerprint, write_atomic
+from crewkit.context import CONTEXT_DIVIDER, ContextCondenser
+from crewkit.http_pool import HttpPool
+from crewkit.knowledge import embedder_from_env, knowledge_from_env, shared_knowledge
+from crewkit.llm_cache import ResponseCache, base_call
+from crewkit.logs import MODES, configure_logging, log_enabled, log_event, run_mode
+from crewkit.streaming import stream_call
+from crewkit.tracing import Span, Tracer
+from crewkit.workspace import Workspace, collect_from_env
+
+
+def default_max_concurrency() -> int:
+    """Read the task concurrency limit from the environment."""
+    return max(1, int(os.getenv("CREW_MAX_CONCURRENCY", "4")))
+
+
+class TaskGraph:
+    """Dependency graph of a crew's tasks, derived from their context edges.
+
+    A task with an explicit ``context`` list depends on exactly those tasks.
+    A task without one keeps crewAI's sequential semantics and depends on
+    every task declared before it.
+    """
+
+    def __init__(self, tasks: List[Task]):
+        self.tasks = list(tasks)
+        positions = {id(task): index for index, task in enumerate(self.tasks)}
+
+        self.dependencies: Dict[int, List[int]] = {}
+        for index, task in enumerate(self.tasks):
+            if isinstance(task.context, list):
+                self.dependencies[index] = [
+                    positions[id(upstream)]
+                    for upstream in task.context
+                    if id(upstream) in positions
+                ]
+            else:
+                self.dependencies[index] = list(range(index))
+
+        self.dependents: Dict[int, List[int]] = {index: [] for index in self.dependencies}
+        for index, upstream in self.dependencies.items():
+            for parent in upstream:
+                self.dependents[parent].append(index)
+
+        self.order = self._topological_order()
+
+    def __len__(self) -> int:
+        return len(self.tasks)
+
+    def _topological_order(self) -> List[int]:
+        remaining = {index: len(upstream) for index, upstream in self.dependencies.items()}
+        ready = [index for index, count in remaining.items() if count == 0]
+        order = []
+        while ready:
+            index = min(ready)
+            ready.remove(index)
+            order.append(index)
+            for child in self.dependents[index]:
+                remaining[child] -= 1
+                if remaining[child] == 0:
+                    ready.append(child)
+
+        if len(order) != len(self.tasks):
+            cyclic = [self.tasks[index].name for index in remaining if index not in order]
+            raise ValueError(f"Task context dependencies form a cycle: {cyclic}")
+        return order
+
+    def named_dependencies(self) -> Dict[str, List[str]]:
+        """Upstream task names per task name, in topological order."""
+        return {
+            self.tasks[index].name: [self.tasks[parent].name for parent in self.dependencies[index]]
+            for index in self.order
+        }
+
+    def ready(self, completed: Iterable[int], started: Iterable[int]) -> List[int]:
+        """Return tasks whose dependencies are all complete, in declaration order."""
+        completed = set(completed)
+        started = set(started) | completed
+        return [
+            index for index in self.order
+            if index not in started
+            and all(parent in completed for parent in self.dependencies[index])
+        ]
+
+
+@dataclass
+class PartialOutput:
+    """The part of a task's output a ``local_outputs`` callable could not produce itself.
+
+    The task's agent is asked only for the rest: ``request`` is appended to
+    the task description, ``expected_output``, when set, replaces the task's,
+    and ``merge`` combines the agent's answer with what was produced locally
+    into the task's output.
+    """
+
+    request: str
+    merge: Callable[[str], str]
+    expected_output: Optional[str] = None
+
+
+class RunCancelled(RuntimeError):
+    """Raised by ``kickoff`` when ``DagCrew.cancel`` stopped the run."""
+
+
+# Fields rebuilt rather than shared when a crew is copied
+_PER_COPY_FIELDS = {
+    "id", "agents", "tasks", "context_budgets", "context_sources", "fan_out", "local_outputs", "tracer", "workspace",
+    "listeners", "short_term_memory", "long_term_memory", "entity_memory", "user_memory",
+}
+
+
+def _add_usage(agent: Any, usage: UsageMetrics) -> None:
+    """Count ``usage`` as the agent's own, as if its LLM calls had been made by ``agent``."""
+    process = agent._token_process
+    process.sum_prompt_tokens(usage.prompt_tokens)
+    process.sum_completion_tokens(usage.completion_tokens)
+    process.sum_cached_prompt_tokens(usage.cached_prompt_tokens)
+    process.sum_successful_requests(usage.successful_requests)
+
+
+def _log_agent_step(step: Any) -> None:
+    """Step callback that logs an agent's intermediate thoughts and actions."""
+    log_event(
+        logging.DEBUG,
+        "agent_step",
+        step=type(step).__name__,
+        thought=getattr(step, "thought", None),
+        tool=getattr(step, "tool", None),
+        text=str(getattr(step, "text", None) or getattr(step, "output", ""))[:500],
+    )
+
+
+class DagCrew(Crew):
+    """Crew that runs each task as soon as the tasks it depends on have finished.
+
+    Dependencies come from each task's ``context``. Independent tasks run in
+    parallel up to ``max_concurrency``, each part of a ``fan_out`` task
+    taking a slot of its own. Two tasks owned by the same agent never run at
+    the same time, since an agent's executor is not safe to share between
+    threads. With a limit of one the crew behaves exactly like
+    ``Process.sequential``.
+
+    Every task's output, whether executed, reused from the cache or an
+    earlier run, or computed by ``local_outputs``, is set on the task and
+    passed to the task and crew callbacks. The other settings, such as
+    caching, tracing, workspaces and listeners, are described in the
+    crewkit README.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    max_concurrency: int = Field(
+        default_factory=default_max_concurrency,
+        description="Maximum number of tasks, counting each fan-out part, executed at the same time.",
+    )
+    cache: Optional[TaskCache] = Field(
+        default_factory=TaskCache.from_env,
+        description="On-disk cache of task outputs, or None to always execute.",
+    )
+    response_cache: Optional[ResponseCache] = Field(
+        default_factory=ResponseCache.from_env,
+        description="Cache of individual LLM completions, or None to always call the model.",
+    )
+    http_pool: Optional[HttpPool] = Field(
+        default_factory=HttpPool.from_env,
+        description="Process-wide HTTP connection pool for LLM calls, or None to leave litellm's clients as they are.",
+    )
+    resume: bool = Field(
+        default=False,
+        description="Reuse output files whose recorded fingerprint is unchanged.",
+    )
+
+    context_budgets: Dict[str, int] = Field(
+        default_factory=dict,
+        description="Maximum context tokens per task name; unlisted tasks get full context.",
+    )
+    context_sources: Dict[str, Callable[[Task, str], str]] = Field(
+        default_factory=dict,
+        description="Per task name, a callable given the task and its context returning extra context to append.",
+    )
+
+    fan_out: Dict[str, str] = Field(
+        default_factory=dict,
+        description="Per task name, the input holding a comma-separated list to run the task once per item for.",
+    )
+    local_outputs: Dict[str, Callable[[Task, Dict[str, Any]], Union[str, PartialOutput, None]]] = Field(
+        default_factory=dict,
+        description=(
+            "Per task name, a callable given the task and the kickoff inputs returning its output, "
+            "a PartialOutput to ask the agent for only the rest, or None to run it."
+        ),
+    )
+
+    tracer: Tracer = Field(
+        default_factory=Tracer.from_env,
+        description="Collects crew, task, LLM and tool spans for every run.",
+    )
+
+    mode: str = Field(
+        default_factory=run_mode,
+        description="'debug' for verbose console output, 'production' for structured logs.",
+    )
+
+    workspace_root: Optional[str] = Field(
+        default_factory=lambda: os.getenv("CREW_WORKSPACE_ROOT", "runs") or None,
+        description="Directory holding one workspace per run, or None to write outputs relative to the CWD.",
+    )
+    workspace: Optional[Workspace] = Field(
+        default=None,
+        description="Workspace to run in; a new one is created under workspace_root for each run when unset.",
+    )
+
+    listeners: List[Callable[[str, Dict[str, Any]], None]] = Field(
+        default_factory=list,
+        description="Callbacks receiving (event, payload) as tasks start and finish.",
+    )
+
+    stream_tokens: bool = Field(
+        default=False,
+        description="Stream completions from the model and emit each chunk as a 'token' event.",
+    )
+
+    _task_spans: Dict[str, Tuple[float, float]] = PrivateAttr(default_factory=dict)
+    _current: threading.local = PrivateAttr(default_factory=threading.local)
+    _run_workspace: Optional[Workspace] = PrivateAttr(default=None)
+    _testing: bool = PrivateAttr(default=False)
+    _slots: Optional[threading.Semaphore] = PrivateAttr(default=None)
+    _cancelled: threading.Event = PrivateAttr(default_factory=threading.Event)
+    _condenser: ContextCondenser = PrivateAttr(
+        default_factory=lambda: ContextCondenser(os.getenv("CREW_CONTEXT_CACHE_DIR", ".crew_cache/context"))
+    )
+
+    @model_validator(mode="after")
+    def apply_mode(self) -> "DagCrew":
+        """Swap console output for structured logging in production mode."""
+        if self.mode not in MODES:
+            raise ValueError(f"mode must be one of {', '.join(MODES)}, got {self.mode!r}")
+        if self.mode == "production":
+            configure_logging()
+            self.verbose = False
+            for agent in self.agents:
+                agent.verbose = False
+            if self.step_callback is None:
+                self.step_callback = _log_agent_step
+        return self
+
+    @model_validator(mode="after")
+    def create_crew_knowledge(self) -> "DagCrew":
+        """Back crew knowledge with the shared embedding store instead of a vector database per crew.
+
+        Sources default to the files in ``CREW_KNOWLEDGE_DIR``. Nothing is
+        embedded until the first task queries the knowledge.
+        """
+        if self.knowledge is None:
+            embedder = self.embedder or embedder_from_env()
+            if self.knowledge_sources:
+                self.knowledge = shared_knowledge(self.knowledge_sources, embedder)
+            else:
+                self.knowledge = knowledge_from_env(embedder)
+        return self
+
+    def copy(self) -> "DagCrew":
+        """Copy the crew with fresh agents and tasks, so copies can run concurrently.
+
+        Scheduling settings and caches carry over; each copy gets its own
+        tracer and crew memory.
+        """
+        agents = [agent.copy() for agent in self.agents]
+        task_mapping: Dict[str, Task] = {}
+        tasks = []
+        for task in self.tasks:
+            copied = task.copy(agents, task_mapping)
+            task_mapping[task.key] = copied
+            tasks.append(copied)
+
+        fields = {
+            name: getattr(self, name)
+            for name in type(self).model_fields
+            # Like Crew.copy, leave unset fields to their defaults; some reject None
+            if name not in _PER_COPY_FIELDS and getattr(self, name) is not None
+        }
+        copied = type(self)(
+            **fields,
+            agents=agents,
+            tasks=tasks,
+            context_budgets=dict(self.context_budgets),
+            context_sources=dict(self.context_sources),
+            fan_out=dict(self.fan_out),
+            local_outputs=dict(self.local_outputs),
+            tracer=Tracer(self.tracer.directory),
+        )
+        copied._testing = self._testing
+        return copied
+
+    def test(
+        self,
+        n_iterations: int,
+        openai_model_name: Optional[str] = None,
+        inputs: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Evaluate the crew like ``Crew.test``, executing every task instead of reusing outputs."""
+        self._testing = True
+        try:
+            super().test(n_iterations, openai_model_name, inputs)
+        finally:
+            self._testing = False
+
+    def cancel(self) -> None:
+        """Stop the current run at the next task boundary.
+
+        Tasks already running finish, no further task starts, and
+        ``kickoff`` raises ``RunCancelled``. Safe to call from any thread.
+        """
+        self._cancelled.set()
+
+    @property
+    def run_directory(self) -> Optional[Path]:
+        """Workspace directory of the current or last run."""
+        return self._run_workspace.directory if self._run_workspace else None
+
+    @property
+    def task_spans(self) -> Dict[str, Tuple[float, float]]:
+        """``time.perf_counter`` start and end of every task in the last run."""
+        return dict(self._task_spans)
+
+    def trace_summary(self) -> Dict[str, Any]:
+        """Per-task latency, tokens and cost of the last run, with its critical path."""
+        return self.tracer.summary(TaskGraph(self.tasks).named_dependencies())
+
+    def _run_sequential_process(self) -> CrewOutput:
+        workspace = self._open_workspace()
+        try:
+            return self._run_graph()
+        finally:
+            if workspace is not None:
+                workspace.close()
+
+    def _open_workspace(self) -> Optional[Workspace]:
+        """Resolve this run's output files into its workspace."""
+        workspace = self.workspace
+        if workspace is None and self.workspace_root:
+            collect_from_env(self.workspace_root)
+            workspace = Workspace.create(self.workspace_root)
+        self._run_workspace = workspace
+        if workspace is not None:
+            workspace.open()
+            workspace.apply(self)
+        return workspace
+
+    def _run_graph(self) -> CrewOutput:
+        self._instrument()
+        self._task_spans.clear()
+        graph = TaskGraph(self.tasks)
+        outputs: Dict[int, TaskOutput] = {}
+        running: Dict[Future, int] = {}
+        busy_agents: Set[int] = set()
+        # One slot per task or fan-out part doing work; a task lends its slot to its parts
+        self._slots = threading.Semaphore(max(1, self.max_concurrency))
+        self._cancelled.clear()
+
+        log_event(logging.INFO, "crew_started", crew=self.name, tasks=len(graph), directory=self.run_directory)
+        with self.tracer.span(self.name or "crew", "crew") as crew_span, \
+                ThreadPoolExecutor(max_workers=max(1, len(graph))) as pool:
+            while len(outputs) < len(graph):
+                for index in graph.ready(outputs, running.values()):
+                    if self._cancelled.is_set():
+                        break
+                    task = self.tasks[index]
+                    if id(task.agent) in busy_agents:
+                        continue
+                    if not self._slots.acquire(blocking=False):
+                        break
+                    busy_agents.add(id(task.agent))
+                    context = self._task_context(graph, index, outputs)
+                    running[pool.submit(self._run_task, task, context, crew_span)] = index
+
+                if self._cancelled.is_set() and not running:
+                    log_event(logging.INFO, "crew_cancelled", crew=self.name, completed=len(outputs))
+                    raise RunCancelled(f"Run cancelled after {len(outputs)} of {len(graph)} tasks")
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = running.pop(future)
+                    busy_agents.discard(id(self.tasks[index].agent))
+                    self._slots.release()
+                    try:
+                        outputs[index] = future.result()
+                    except Exception:
+                        for pending in running:
+                            pending.cancel()
+                        raise
+
+        self.tracer.export(self.name or "crew", graph.named_dependencies())
+        if log_enabled(logging.INFO):
+            summary = self.tracer.summary(graph.named_dependencies())
+            log_event(
+                logging.INFO,
+                "crew_finished",
+                crew=self.name,
+                seconds=summary["wall_seconds"],
+                critical_path=summary["critical_path"],
+                prompt_tokens=sum(task["prompt_tokens"] for task in summary["tasks"].values()),
+                completion_tokens=sum(task["completion_tokens"] for task in summary["tasks"].values()),
+            )
+        return self._create_crew_output([outputs[index] for index in range(len(self.tasks))])
+
+    def _instrument(self) -> None:
+        """Start a fresh trace and wrap every agent's LLMs and tools for this run.
+
+        Each LLM's ``call`` is rebuilt from the original on every run, as
+        token streaming, then the response cache, then tracing, so the
+        wrappers of earlier runs never stack. Tools are swapped for traced
+        copies, leaving the originals, which agent copies share, untouched.
+        Training and test runs use the response cache like any other run;
+        set ``response_cache`` to None for iterations that need fresh
+        completions.
+        """
+        self.tracer.reset()
+        if self.http_pool is not None:
+            self.http_pool.install()
+        for agent in self.agents:
+            self._instrument_llms(agent)
+            agent.tools = self.tracer.traced_tools(agent.tools)
+        for task in self.tasks:
+            task.tools = self.tracer.traced_tools(task.tools)
+
+    def _instrument_llms(self, agent: Any) -> None:
+        """Rebuild the ``call`` of the agent's LLMs for this run, reporting to ``agent``."""
+        response_cache = self.response_cache
+        volatile = {}
+        if response_cache is not None:
+            inputs = getattr(self, "_inputs", None) or {}
+            volatile = {
+                name: str(value)
+                for name, value in inputs.items()
+                if name in response_cache.volatile_inputs
+            }
+        for llm in (agent.llm, getattr(agent, "function_calling_llm", None)):
+            if llm is None or not hasattr(llm, "call"):
+                continue
+            call = base_call(llm)
+            if self.stream_tokens:
+                call = stream_call(llm, call, self._token_emitter(agent))
+            if response_cache is not None:
+                call = response_cache.wrap(llm, call, volatile)
+            llm.call = self.tracer.wrap_llm(agent, llm, call)
+
+    def _token_emitter(self, agent: Any) -> Callable[[str], None]:
+        def emit(text: str) -> None:
+            self._emit("token", task=getattr(self._current, "task", None), agent=agent.role, text=text)
+
+        return emit
+
+    def _task_context(self, graph: TaskGraph, index: int, outputs: Dict[int, TaskOutput]) -> str:
+        """Aggregate the raw outputs of a task's dependencies, plus any extra source, into its context."""
+        task = self.tasks[index]
+        parents = graph.dependencies[index]
+        budget = self.context_budgets.get(task.name)
+        if budget is not None:
+            context = self._condenser.fit(
+                task,
+                [(self.tasks[parent], outputs[parent]) for parent in parents],
+                budget,
+            )
+        else:
+            context = aggregate_raw_outputs_from_task_outputs([outputs[parent] for parent in parents])
+        source = self.context_sources.get(task.name)
+        extra = source(task, context) if source else None
+        if extra:
+            context = f"{context}{CONTEXT_DIVIDER}{extra}" if context else extra
+        return context
+
+    def _run_task(self, task: Task, context: str, parent: Optional[Span] = None) -> TaskOutput:
+        """Execute a single task with its aggregated context, reusing prior output if possible."""
+        started = time.perf_counter()
+        log_event(logging.DEBUG, "task_started", task=task.name, agent=task.agent.role)
+        self._emit("task_started", task=task.name, agent=task.agent.role)
+        self._current.task = task.name
+        with self.tracer.span(task.name, "task", parent=parent, agent=task.agent.role) as span:
+            key = task_fingerprint(task, context)
+            output = self._reuse_output(task, key)
+            span.attributes["source"] = "executed" if output is None else "reused"
+            if output is None:
+                output = self._execute(task, context, span)
+                if self._cache_enabled(task):
+                    self.cache.put(key, output)
+            else:
+                self._deliver(task, output)
+            record_artifact(task, key)
+        self._task_spans[task.name] = (started, time.perf_counter())
+        log_event(
+            logging.INFO,
+            "task_finished",
+            task=task.name,
+            agent=task.agent.role,
+            seconds=span.duration,
+            source=span.attributes["source"],
+            output_file=task.output_file,
+            output_chars=len(output.raw or ""),
+        )
+        self._emit(
+            "task_finished",
+            task=task.name,
+            agent=task.agent.role,
+            source=span.attributes["source"],
+            output_file=task.output_file,
+            output=output,
+        )
+        return output
+
+    def _execute(self, task: Task, context: str, span: Span) -> TaskOutput:
+        """Run a task locally, partly locally, fanned out over its ``fan_out`` input, or on its agent."""
+        local = self.local_outputs.get(task.name)
+        raw = local(task, getattr(self, "_inputs", None) or {}) if local else None
+        if isinstance(raw, PartialOutput):
+            request = Task(
+                name=task.name,
+                description=f"{task.description}\n\n{raw.request}",
+                expected_output=raw.expected_output or task.expected_output,
+                agent=task.agent,
+            )
+            answer = task.agent.execute_task(request, context=context, tools=task.tools or task.agent.tools)
+            raw = raw.merge(str(answer))
+            span.attributes["source"] = "partial"
+        elif raw is not None:
+            span.attributes["source"] = "local"
+        if raw is not None:
+            output = self._finish_output(task, raw)
+            self._deliver(task, output)
+            return output
+
+        items = self._fan_out_items(task)
+        if len(items) < 2:
+            return task.execute_sync(agent=task.agent, context=context, tools=task.tools or task.agent.tools)
+
+        # The parts run in the task's slot and any other free ones, never above max_concurrency
+        self._slots.release()
+        try:
+            with ThreadPoolExecutor(max_workers=len(items)) as pool:
+                parts = list(pool.map(lambda item: self._run_part(task, context, item, items, span), items))
+        finally:
+            self._slots.acquire()
+        # The crew's usage metrics count its own agents, so the task's agent takes on its copies' usage
+        for _, usage in parts:
+            _add_usage(task.agent, usage)
+        output = self._finish_output(
+            task, "\n\n".join(f"## {item}\n\n{str(part).strip()}" for item, (part, _) in zip(items, parts))
+        )
+        self._deliver(task, output)
+        return output
+
+    def _finish_output(self, task: Task, raw: str) -> TaskOutput:
+        """The task's output for text produced without ``execute_sync``, written to its output file."""
+        output = restore_output(task, raw)
+        if task.output_file:
+            write_atomic(Path(task.output_file), raw)
+        return output
+
+    def _fan_out_items(self, task: Task) -> List[str]:
+        name = self.fan_out.get(task.name)
+        value = (getattr(self, "_inputs", None) or {}).get(name) if name else None
+        if not value:
+            return []
+        items = value if isinstance(value, list) else str(value).split(",")
+        return list(dict.fromkeys(str(item).strip() for item in items if str(item).strip()))
+
+    def _run_part(
+        self, task: Task, context: str, item: str, items: List[str], parent: Span
+    ) -> Tuple[str, UsageMetrics]:
+        """Run the share of ``task`` covering one item, on its own copy of the task's agent.
+
+        The part goes straight to the agent rather than through ``execute_sync``,
+        so task and crew callbacks see only the merged output. Returns the
+        part's text and the tokens the copy used.
+        """
+        self._current.task = task.name
+        agent = task.agent.copy()
+        agent.crew = task.agent.crew
+        # The copy counts its own tokens, so its LLM calls are traced against it
+        self._instrument_llms(agent)
+        others = ", ".join(other for other in items if other != item)
+        part = Task(
+            name=task.name,
+            description=f"{task.description}\n\nCover {item} only; {others} are handled separately.",
+            expected_output=f"{task.expected_output}\n\nCovering {item} only.",
+            agent=agent,
+        )
+        with self._slots, self.tracer.span(f"{task.name}[{item}]", "part", parent=parent, item=item):
+            text = agent.execute_task(part, context=context, tools=task.tools or agent.tools)
+        return text, agent._token_process.get_summary()
+
+    def _deliver(self, task: Task, output: TaskOutput) -> None:
+        """Hand an output that did not come from ``execute_sync`` to the task and its callbacks, as execution does."""
+        task.output = output
+        if task.callback:
+            task.callback(output)
+        if self.task_callback and self.task_callback != task.callback:
+            self.task_callback(output)
+
+    def _emit(self, event: str, **payload: Any) -> None:
+        """Deliver an event to every listener, isolating their failures from the run."""
+        # A copy, since listeners may be removed from another thread mid-run
+        for listener in list(self.listeners):
+            try:
+                listener(event, payload)
+            except Exception as error:
+                log_event(logging.WARNING, "listener_failed", listener_event=event, error=repr(error))
+
+    def _executes_all(self) -> bool:
+        """Whether this is a training or test run, which must not reuse earlier outputs."""
+        return getattr(self, "_train", False) or self._testing
+
+    def _cache_enabled(self, task: Task) -> bool:
+        return (
+            self.cache is not None
+            and self.cache.enabled_for(task)
+            and not self._executes_all()
+        )
+
+    def _reuse_output(self, task: Task, key: str) -> Optional[TaskOutput]:
+        """Return an earlier output produced from the same fingerprint, if any."""
+        if self._executes_all():
+            return None
+        if self.resume:
+            output = load_artifact(task, key)
+            if output is not None:
+                return output
+        if self._cache_enabled(task):
+            return self.cache.load(task, key)
+        return None
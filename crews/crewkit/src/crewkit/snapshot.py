@@ -0,0 +1,324 @@
+"""Compiled crew snapshots: a constructed crew's agents, tasks and settings as compact JSON.
+
+A snapshot is rebuilt into a runnable crew without importing the crew's
+project, parsing its ``config/*.yaml`` or resolving its decorators, so a
+precompiled definition can be shipped to workers and cached there::
+
+    crew_snapshot export mywordpresscrew --out snapshots
+    crew_snapshot load snapshots/mywordpresscrew.json
+"""
+import argparse
+import importlib
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from crewai import Agent, Crew, Process, Task
+from crewai.tools import BaseTool
+
+from crewkit.cache import write_atomic
+from crewkit.logs import verbose_enabled
+from crewkit.registry import CREWS, RUNTIME_SETTINGS, crew_class
+
+# Bumped whenever a change to the format would make older loaders misread a snapshot
+SCHEMA_VERSION = 2
+
+# Agent settings kept when they differ from crewAI's defaults
+_AGENT_FIELDS = (
+    "allow_delegation",
+    "max_iter",
+    "max_rpm",
+    "max_execution_time",
+    "max_retry_limit",
+    "max_tokens",
+    "allow_code_execution",
+    "code_execution_mode",
+    "respect_context_window",
+    "use_system_prompt",
+    "cache",
+    "multimodal",
+    "system_template",
+    "prompt_template",
+    "response_template",
+    "embedder",
+)
+# Completion parameters of an LLM; credentials are never written, they come from the environment
+_LLM_PARAMS = (
+    "model",
+    "timeout",
+    "temperature",
+    "top_p",
+    "n",
+    "stop",
+    "max_completion_tokens",
+    "max_tokens",
+    "presence_penalty",
+    "frequency_penalty",
+    "logit_bias",
+    "seed",
+    "logprobs",
+    "top_logprobs",
+    "base_url",
+    "api_base",
+    "api_version",
+    "reasoning_effort",
+)
+_TASK_FIELDS = ("async_execution", "human_input", "max_retries")
+_CREW_FIELDS = ("name", "memory", "planning", "max_rpm", "embedder", "context_budgets", "fan_out")
+# Crew settings holding callables, which only a runtime factory can supply to a rebuilt crew
+_RUNTIME_FIELDS = ("context_sources", "local_outputs", "listeners")
+
+
+def _class_path(cls: type) -> str:
+    if "<locals>" in cls.__qualname__:
+        raise ValueError(f"{cls.__qualname__} is defined inside a function and cannot be snapshotted")
+    return f"{cls.__module__}:{cls.__qualname__}"
+
+
+def _resolve(path: str) -> Any:
+    module_name, _, qualname = path.partition(":")
+    target = importlib.import_module(module_name)
+    for part in qualname.split("."):
+        target = getattr(target, part)
+    return target
+
+
+def _json_value(value: Any, what: str) -> Any:
+    try:
+        return json.loads(json.dumps(value))
+    except (TypeError, ValueError):
+        raise ValueError(f"{what} is not JSON-serializable and cannot be snapshotted") from None
+
+
+def _settings(model: Any, names: tuple, what: str) -> Dict[str, Any]:
+    """Fields of a pydantic model that were set to something other than their default."""
+    fields = type(model).model_fields
+    settings = {}
+    for name in names:
+        if name not in fields:
+            continue
+        value = getattr(model, name)
+        if value != fields[name].get_default(call_default_factory=True):
+            settings[name] = _json_value(value, f"{what}.{name}")
+    return settings
+
+
+def _llm_snapshot(llm: Any, what: str) -> Optional[Dict[str, Any]]:
+    if llm is None:
+        return None
+    params = {
+        name: _json_value(getattr(llm, name), f"{what}.{name}")
+        for name in _LLM_PARAMS
+        if getattr(llm, name, None) is not None
+    }
+    params.update(_json_value(getattr(llm, "additional_params", None) or {}, f"{what}.additional_params"))
+    return {"class": _class_path(type(llm)), "params": params}
+
+
+def _tool_snapshot(tool: BaseTool) -> Dict[str, Any]:
+    # Only the tool's own fields; name, description and schema are rebuilt by its class
+    own = [name for name in type(tool).model_fields if name not in BaseTool.model_fields]
+    return {
+        "class": _class_path(type(tool)),
+        "config": {name: _json_value(getattr(tool, name), f"tool {tool.name}.{name}") for name in own},
+    }
+
+
+def snapshot(crew: Crew, runtime: Optional[str] = None) -> Dict[str, Any]:
+    """Describe a constructed, not yet run, crew as plain JSON-compatible data.
+
+    Agents and tasks keep their uninterpolated templates, so the snapshot
+    runs with any inputs. Callables cannot be captured: tasks using
+    callbacks or guardrails are rejected, and so is a crew with
+    ``context_sources``, ``local_outputs`` or ``listeners`` unless
+    ``runtime`` names an importable ``module:function`` returning them,
+    which ``build`` calls to supply them again.
+    """
+    if crew.process != Process.sequential:
+        raise ValueError(f"Only sequential crews can be snapshotted, not {crew.process.value}")
+    held = [name for name in _RUNTIME_FIELDS if getattr(crew, name, None)]
+    if held and runtime is None:
+        raise ValueError(
+            f"The crew's {', '.join(held)} cannot be snapshotted; pass a runtime factory that supplies them"
+        )
+
+    agents = []
+    for agent in crew.agents:
+        what = f"agent {agent.role.strip()!r}"
+        if agent.step_callback is not None:
+            raise ValueError(f"{what} has a step_callback, which cannot be snapshotted")
+        agents.append({
+            "role": agent._original_role or agent.role,
+            "goal": agent._original_goal or agent.goal,
+            "backstory": agent._original_backstory or agent.backstory,
+            "llm": _llm_snapshot(agent.llm, f"{what}.llm"),
+            "function_calling_llm": _llm_snapshot(agent.function_calling_llm, f"{what}.function_calling_llm"),
+            "tools": [_tool_snapshot(tool) for tool in agent.tools or []],
+            "settings": _settings(agent, _AGENT_FIELDS, what),
+        })
+
+    positions = {id(agent): index for index, agent in enumerate(crew.agents)}
+    tasks = []
+    for task in crew.tasks:
+        what = f"task {task.name!r}"
+        if task.callback is not None or task.guardrail is not None:
+            raise ValueError(f"{what} has a callback or guardrail, which cannot be snapshotted")
+        if task.agent is not None and id(task.agent) not in positions:
+            raise ValueError(f"{what} is assigned to an agent outside the crew")
+        tasks.append({
+            "name": task.name,
+            "description": task._original_description or task.description,
+            "expected_output": task._original_expected_output or task.expected_output,
+            "agent": positions[id(task.agent)] if task.agent is not None else None,
+            "context": [upstream.name for upstream in task.context] if isinstance(task.context, list) else None,
+            "output_file": task._original_output_file or task.output_file,
+            "output_json": _class_path(task.output_json) if task.output_json else None,
+            "output_pydantic": _class_path(task.output_pydantic) if task.output_pydantic else None,
+            "tools": [_tool_snapshot(tool) for tool in task.tools or []],
+            "settings": _settings(task, _TASK_FIELDS, what),
+        })
+
+    return {
+        "schema": SCHEMA_VERSION,
+        "crew": {
+            "class": _class_path(type(crew)),
+            "settings": _settings(crew, _CREW_FIELDS, "crew"),
+            "runtime": runtime,
+        },
+        "agents": agents,
+        "tasks": tasks,
+    }
+
+
+def dumps(crew: Crew, runtime: Optional[str] = None) -> str:
+    """The crew's snapshot as compact JSON."""
+    return json.dumps(snapshot(crew, runtime), separators=(",", ":"), ensure_ascii=False)
+
+
+def save(crew: Crew, path: Union[str, Path], runtime: Optional[str] = None) -> Path:
+    """Write the crew's snapshot to ``path``."""
+    path = Path(path)
+    write_atomic(path, dumps(crew, runtime))
+    return path
+
+
+def _build_llm(spec: Optional[Dict[str, Any]]) -> Any:
+    if spec is None:
+        return None
+    return _resolve(spec["class"])(**spec["params"])
+
+
+def _build_tool(spec: Dict[str, Any]) -> BaseTool:
+    return _resolve(spec["class"])(**spec["config"])
+
+
+def build(data: Dict[str, Any], runtime: Optional[str] = None, **overrides: Any) -> Crew:
+    """Rebuild a runnable crew from snapshot data.
+
+    The settings returned by the runtime factory, ``runtime`` or else the
+    one recorded in the snapshot, and then ``overrides`` are passed to the
+    crew's constructor.
+    """
+    version = data.get("schema")
+    if version != SCHEMA_VERSION:
+        raise ValueError(f"Unsupported crew snapshot schema {version!r}; this loader reads version {SCHEMA_VERSION}")
+
+    verbose = verbose_enabled()
+    agents: List[Agent] = []
+    for spec in data["agents"]:
+        options = dict(spec["settings"])
+        if spec["llm"] is not None:
+            options["llm"] = _build_llm(spec["llm"])
+        if spec["function_calling_llm"] is not None:
+            options["function_calling_llm"] = _build_llm(spec["function_calling_llm"])
+        agents.append(Agent(
+            role=spec["role"],
+            goal=spec["goal"],
+            backstory=spec["backstory"],
+            tools=[_build_tool(tool) for tool in spec["tools"]],
+            verbose=verbose,
+            **options,
+        ))
+
+    tasks: Dict[str, Task] = {}
+    for spec in data["tasks"]:
+        options = dict(spec["settings"])
+        if spec["context"] is not None:
+            options["context"] = [tasks[name] for name in spec["context"]]
+        for reference in ("output_json", "output_pydantic"):
+            if spec[reference]:
+                options[reference] = _resolve(spec[reference])
+        tasks[spec["name"]] = Task(
+            name=spec["name"],
+            description=spec["description"],
+            expected_output=spec["expected_output"],
+            agent=agents[spec["agent"]] if spec["agent"] is not None else None,
+            output_file=spec["output_file"],
+            tools=[_build_tool(tool) for tool in spec["tools"]],
+            **options,
+        )
+
+    crew_class = _resolve(data["crew"]["class"])
+    settings = {
+        name: value
+        for name, value in data["crew"]["settings"].items()
+        if name in crew_class.model_fields
+    }
+    runtime = runtime or data["crew"]["runtime"]
+    if runtime:
+        settings.update(_resolve(runtime)())
+    return crew_class(
+        agents=agents,
+        tasks=list(tasks.values()),
+        process=Process.sequential,
+        verbose=verbose,
+        **{**settings, **overrides},
+    )
+
+
+def loads(text: str, runtime: Optional[str] = None, **overrides: Any) -> Crew:
+    """Rebuild a runnable crew from a JSON snapshot."""
+    return build(json.loads(text), runtime, **overrides)
+
+
+def load(path: Union[str, Path], runtime: Optional[str] = None, **overrides: Any) -> Crew:
+    """Rebuild a runnable crew from a snapshot file."""
+    return loads(Path(path).read_text(encoding="utf-8"), runtime, **overrides)
+
+
+def export(name: str, directory: Union[str, Path]) -> Path:
+    """Build one of the known crews from its project and snapshot it as ``<directory>/<name>.json``."""
+    crew = crew_class(name)().crew()
+    return save(crew, Path(directory) / f"{name}.json", RUNTIME_SETTINGS.get(name))
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    exporting = commands.add_parser("export", help="snapshot crews built from their projects")
+    exporting.add_argument("crews", nargs="*", default=list(CREWS), help="crews to export (default: all)")
+    exporting.add_argument("--out", default="snapshots", help="directory to write <crew>.json files to")
+    loading = commands.add_parser("load", help="rebuild crews from snapshots and report the time taken")
+    loading.add_argument("paths", nargs="+", help="snapshot files")
+    args = parser.parse_args(argv)
+
+    if args.command == "export":
+        for name in args.crews:
+            path = export(name, args.out)
+            print(f"{name}: {path} ({path.stat().st_size} bytes)")
+        return 0
+
+    for path in args.paths:
+        started = time.perf_counter()
+        crew = load(path)
+        print(
+            f"{path}: {len(crew.agents)} agents, {len(crew.tasks)} tasks "
+            f"in {time.perf_counter() - started:.3f}s"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
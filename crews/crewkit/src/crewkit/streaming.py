@@ -0,0 +1,250 @@
+"""Streaming crew runs: incremental events as tasks start, generate tokens and finish.
+
+``run_events`` yields events for one kickoff; ``to_sse`` renders them as
+server-sent events. The bundled server exposes every crew over HTTP on a
+local port for the web API to proxy::
+
+    crew_stream_server --port 8765
+    curl -N -X POST localhost:8765/crews/mywordpresscrew/stream -d '{"topic": "AI LLMs"}'
+"""
+import argparse
+import json
+import queue
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+_DONE = object()
+
+# The chunk callback of the streamed LLM call running on this thread, if any
+_local = threading.local()
+_install_lock = threading.Lock()
+
+
+def _streams_natively(llm: Any) -> bool:
+    """Whether ``llm`` is a stock crewAI LLM, whose completions can be streamed via litellm."""
+    try:
+        from crewai import LLM
+    except ImportError:
+        return False
+    return isinstance(llm, LLM) and type(llm).call is LLM.call
+
+
+def _install_streaming_completion() -> None:
+    """Make ``litellm.completion`` stream while its thread is inside a streamed LLM call.
+
+    Other threads, and calls outside ``stream_call``, get the original
+    completion unchanged.
+    """
+    import litellm
+
+    with _install_lock:
+        if getattr(litellm.completion, "streams_for_crewkit", False):
+            return
+        completion = litellm.completion
+
+        def streaming_completion(*args, **kwargs):
+            on_chunk = getattr(_local, "on_chunk", None)
+            if on_chunk is None or kwargs.get("stream"):
+                return completion(*args, **kwargs)
+            kwargs.update(stream=True, stream_options={"include_usage": True})
+            chunks = []
+            for chunk in completion(*args, **kwargs):
+                chunks.append(chunk)
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    on_chunk(delta)
+            return litellm.stream_chunk_builder(chunks, messages=kwargs.get("messages"))
+
+        streaming_completion.streams_for_crewkit = True
+        litellm.completion = streaming_completion
+
+
+def stream_call(llm: Any, call: Any, on_chunk: Callable[[str], None]) -> Any:
+    """Wrap an LLM ``call`` so the text of plain completions is reported as it arrives.
+
+    Stock crewAI LLMs still build their request in ``call``, with every
+    parameter, response format and provider message rule they would use
+    otherwise; only the litellm completion underneath is streamed, and the
+    assembled response goes back to ``call`` so callbacks and token
+    accounting are unchanged. Calls that offer tools, and custom LLM classes,
+    report the whole response as a single chunk.
+    """
+
+    def streamed(messages, tools=None, callbacks=None, available_functions=None, **kwargs):
+        if tools or available_functions or not _streams_natively(llm):
+            response = call(
+                messages,
+                tools=tools,
+                callbacks=callbacks,
+                available_functions=available_functions,
+                **kwargs,
+            )
+            if isinstance(response, str) and response:
+                on_chunk(response)
+            return response
+
+        _install_streaming_completion()
+        _local.on_chunk = on_chunk
+        try:
+            return call(
+                messages,
+                tools=tools,
+                callbacks=callbacks,
+                available_functions=available_functions,
+                **kwargs,
+            )
+        finally:
+            _local.on_chunk = None
+
+    return streamed
+
+
+def run_events(
+    crew: Any,
+    inputs: Optional[Dict[str, Any]] = None,
+    max_pending: int = 1000,
+) -> Iterator[Dict[str, Any]]:
+    """Kick off a ``DagCrew`` in the background and yield its events as they happen.
+
+    Yields ``task_started``, ``token`` and ``task_finished`` events, then a
+    final ``crew_finished`` with the crew's raw output and run directory, or
+    ``error`` if the run failed. At most ``max_pending`` events wait for the
+    consumer; beyond that the run waits too. Closing the generator early,
+    as when a client disconnects, cancels the run at its next task boundary.
+    The listener is removed from the crew once the generator finishes.
+    """
+    events: queue.Queue = queue.Queue(maxsize=max_pending)
+    closed = threading.Event()
+
+    def put(event: Any) -> None:
+        # Events produced after the consumer went away are dropped
+        while not closed.is_set():
+            try:
+                events.put(event, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def listener(event: str, payload: Dict[str, Any]) -> None:
+        put({"event": event, **{key: value for key, value in payload.items() if key != "output"}})
+
+    def kickoff() -> None:
+        try:
+            result = crew.kickoff(inputs=inputs)
+            run_directory = crew.run_directory
+            put({
+                "event": "crew_finished",
+                "output": result.raw,
+                "directory": str(run_directory) if run_directory else None,
+            })
+        except Exception as error:
+            put({"event": "error", "message": str(error)})
+        finally:
+            put(_DONE)
+
+    crew.stream_tokens = True
+    crew.listeners.append(listener)
+    finished = False
+    try:
+        threading.Thread(target=kickoff, name="crew-stream", daemon=True).start()
+        while True:
+            event = events.get()
+            if event is _DONE:
+                finished = True
+                return
+            yield event
+    finally:
+        if not finished:
+            closed.set()
+            crew.cancel()
+        crew.listeners.remove(listener)
+
+
+def to_sse(events: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    """Render events in the server-sent events wire format."""
+    for event in events:
+        yield f"event: {event['event']}\ndata: {json.dumps(event, default=str)}\n\n"
+
+
+class _StreamHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    pool: Any = None
+
+    def do_POST(self) -> None:
+        parts = self.path.strip("/").split("/")
+        if len(parts) != 3 or parts[0] != "crews" or parts[2] != "stream" or parts[1] not in self.pool.names:
+            self._reply(404, {"error": f"Unknown stream {self.path}"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            inputs = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(inputs, dict):
+                raise ValueError("Inputs must be a JSON object")
+            crew = self.pool.take(parts[1])
+        except Exception as error:
+            self._reply(400, {"error": str(error)})
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        events = run_events(crew, inputs)
+        try:
+            for message in to_sse(events):
+                self.wfile.write(message.encode("utf-8"))
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            # The client went away; closing the events stops the run at its next task boundary
+            pass
+        finally:
+            events.close()
+        self.close_connection = True
+        self.pool.refill(parts[1])
+
+    def _reply(self, status: int, body: Dict[str, Any]) -> None:
+        encoded = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(encoded)))
+        self.end_headers()
+        self.wfile.write(encoded)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+def serve(host: str = "127.0.0.1", port: int = 8765) -> None:
+    """Serve ``POST /crews/<name>/stream`` for every known crew until interrupted.
+
+    Every crew is built before the server starts listening, and each request
+    runs a ready copy, so requests pay no import or construction time.
+    """
+    from crewkit.registry import CREWS
+    from crewkit.worker import CrewPool
+
+    pool = CrewPool(CREWS)
+    pool.preload()
+    handler = type("StreamHandler", (_StreamHandler,), {"pool": pool})
+    with ThreadingHTTPServer((host, port), handler) as server:
+        print(f"Streaming crews {', '.join(pool.names)} on http://{host}:{port}")
+        server.serve_forever()
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1", help="interface to listen on")
+    parser.add_argument("--port", type=int, default=8765, help="port to listen on")
+    args = parser.parse_args(argv)
+    try:
+        serve(args.host, args.port)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,262 @@
+import copy
+import itertools
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from crewkit.context import estimate_tokens
+
+
+@dataclass
+class Span:
+    """One timed unit of work: a crew run, a task, an LLM call or a tool call."""
+    id: int
+    name: str
+    kind: str
+    start: float
+    end: Optional[float] = None
+    parent: Optional[int] = None
+    thread: str = ""
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def duration(self) -> float:
+        return (self.end if self.end is not None else time.perf_counter()) - self.start
+
+
+def _token_usage(agent: Any) -> Optional[Dict[str, int]]:
+    """Snapshot of the prompt and completion tokens an agent has used so far."""
+    process = getattr(agent, "_token_process", None)
+    if process is None:
+        return None
+    summary = process.get_summary()
+    return {
+        "prompt_tokens": summary.prompt_tokens,
+        "completion_tokens": summary.completion_tokens,
+    }
+
+
+def _cost(model: str, prompt_tokens: int, completion_tokens: int) -> Optional[float]:
+    """Price of a call in USD from litellm's model table, when the model is known."""
+    try:
+        from litellm import cost_per_token
+
+        prompt_cost, completion_cost = cost_per_token(
+            model=model, prompt_tokens=prompt_tokens, completion_tokens=completion_tokens
+        )
+    except Exception:
+        return None
+    return prompt_cost + completion_cost
+
+
+class Tracer:
+    """Collects spans for crew runs and exports them as traces.
+
+    Spans nest per thread, so LLM and tool calls made while a task runs
+    become children of that task. Traces export as JSON lines (one span per
+    line) and as folded stacks that ``flamegraph.pl`` and speedscope read.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = Path(directory) if directory else None
+        self.spans: List[Span] = []
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @classmethod
+    def from_env(cls) -> "Tracer":
+        """Tracer that exports to ``CREW_TRACE_DIR`` when it is set."""
+        return cls(os.getenv("CREW_TRACE_DIR") or None)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.spans = []
+
+    def _stack(self) -> List[Span]:
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    @contextmanager
+    def span(self, name: str, kind: str, parent: Optional[Span] = None, **attributes) -> Iterator[Span]:
+        """Time a block of work as a child of ``parent`` or of the thread's current span."""
+        stack = self._stack()
+        if parent is None and stack:
+            parent = stack[-1]
+        span = Span(
+            id=next(self._ids),
+            name=name,
+            kind=kind,
+            start=time.perf_counter(),
+            parent=parent.id if parent else None,
+            thread=threading.current_thread().name,
+            attributes=attributes,
+        )
+        with self._lock:
+            self.spans.append(span)
+        stack.append(span)
+        try:
+            yield span
+        except BaseException as error:
+            span.attributes["error"] = repr(error)
+            raise
+        finally:
+            stack.pop()
+            span.end = time.perf_counter()
+
+    def traced_tools(self, tools: Optional[List[Any]]) -> Optional[List[Any]]:
+        """Copies of ``tools`` that record a span for every call.
+
+        The tools themselves are left alone, since agent copies share them;
+        a copy made for an earlier run is traced afresh from its original.
+        """
+        if not tools:
+            return tools
+        traced = []
+        for tool in tools:
+            original = tool.__dict__.get("_untraced_tool", tool)
+            copied = copy.copy(original)
+            object.__setattr__(copied, "_untraced_tool", original)
+            object.__setattr__(copied, "_run", self._traced_tool_run(copied, copied._run))
+            traced.append(copied)
+        return traced
+
+    def wrap_llm(self, agent: Any, llm: Any, call: Any) -> Any:
+        """Wrap an LLM ``call`` made on behalf of ``agent`` so it records a span."""
+        model = getattr(llm, "model", str(llm))
+
+        def traced(messages, *args, **kwargs):
+            before = _token_usage(agent)
+            with self.span(model, "llm", agent=agent.role, model=model) as span:
+                response = call(messages, *args, **kwargs)
+                after = _token_usage(agent)
+                if before is not None and after is not None and after != before:
+                    usage = {key: after[key] - before[key] for key in after}
+                else:
+                    # Cached or unmetered responses: estimate from the text instead
+                    prompt = messages if isinstance(messages, str) else json.dumps(messages, default=str)
+                    usage = {
+                        "prompt_tokens": estimate_tokens(prompt),
+                        "completion_tokens": estimate_tokens(str(response)),
+                        "estimated": True,
+                    }
+                span.attributes.update(usage)
+                span.attributes["cost_usd"] = _cost(model, usage["prompt_tokens"], usage["completion_tokens"])
+                return response
+
+        return traced
+
+    def _traced_tool_run(self, tool: Any, run: Any) -> Any:
+        def traced(*args, **kwargs):
+            with self.span(tool.name, "tool"):
+                return run(*args, **kwargs)
+
+        return traced
+
+    def summary(self, dependencies: Dict[str, List[str]]) -> Dict[str, Any]:
+        """Per-task totals and the critical path through the task graph.
+
+        ``dependencies`` maps each task name to the names of its upstream
+        tasks, in execution order.
+        """
+        with self._lock:
+            spans = list(self.spans)
+        children: Dict[Optional[int], List[Span]] = {}
+        for span in spans:
+            children.setdefault(span.parent, []).append(span)
+
+        def descendants(span: Span) -> Iterator[Span]:
+            for child in children.get(span.id, []):
+                yield child
+                yield from descendants(child)
+
+        tasks: Dict[str, Dict[str, Any]] = {}
+        for span in spans:
+            if span.kind != "task":
+                continue
+            calls = [child for child in descendants(span) if child.kind == "llm"]
+            costs = [call.attributes.get("cost_usd") for call in calls]
+            tasks[span.name] = {
+                "seconds": span.duration,
+                "llm_seconds": sum(call.duration for call in calls),
+                "llm_calls": len(calls),
+                "tool_calls": sum(1 for child in descendants(span) if child.kind == "tool"),
+                "prompt_tokens": sum(call.attributes.get("prompt_tokens", 0) for call in calls),
+                "completion_tokens": sum(call.attributes.get("completion_tokens", 0) for call in calls),
+                "cost_usd": sum(costs) if costs and None not in costs else None,
+                "source": span.attributes.get("source", "executed"),
+            }
+
+        finish: Dict[str, float] = {}
+        previous: Dict[str, Optional[str]] = {}
+        for name, upstream in dependencies.items():
+            if name not in tasks:
+                continue
+            slowest = max((parent for parent in upstream if parent in finish), key=finish.get, default=None)
+            previous[name] = slowest
+            finish[name] = tasks[name]["seconds"] + (finish[slowest] if slowest else 0.0)
+
+        path: List[str] = []
+        cursor = max(finish, key=finish.get, default=None)
+        while cursor is not None:
+            path.append(cursor)
+            cursor = previous[cursor]
+
+        crew_spans = [span for span in spans if span.kind == "crew"]
+        return {
+            "wall_seconds": crew_spans[-1].duration if crew_spans else None,
+            "critical_path": list(reversed(path)),
+            "critical_path_seconds": finish[path[0]] if path else 0.0,
+            "tasks": tasks,
+        }
+
+    def write_jsonl(self, path: Path) -> None:
+        """Write every span as one JSON object per line."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock, open(path, "w", encoding="utf-8") as handle:
+            for span in self.spans:
+                handle.write(json.dumps({**asdict(span), "duration": span.duration}, default=str))
+                handle.write("\n")
+
+    def write_folded(self, path: Path) -> None:
+        """Write self time per stack in microseconds, in the folded-stacks format."""
+        with self._lock:
+            spans = {span.id: span for span in self.spans}
+        child_time: Dict[int, float] = {}
+        for span in spans.values():
+            if span.parent in spans:
+                child_time[span.parent] = child_time.get(span.parent, 0.0) + span.duration
+
+        stacks: Dict[str, int] = {}
+        for span in spans.values():
+            frames, cursor = [], span
+            while cursor is not None:
+                frames.append(f"{cursor.kind}:{cursor.name}".replace(";", ","))
+                cursor = spans.get(cursor.parent)
+            stack = ";".join(reversed(frames))
+            self_time = max(0.0, span.duration - child_time.get(span.id, 0.0))
+            stacks[stack] = stacks.get(stack, 0) + int(self_time * 1_000_000)
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("".join(f"{stack} {value}\n" for stack, value in stacks.items() if value))
+
+    def export(self, name: str, dependencies: Dict[str, List[str]]) -> Optional[Path]:
+        """Write the trace, folded stacks and summary to ``directory``, if configured.
+
+        Files are named after the crew, the time and a random run id, so
+        runs finishing in the same second never overwrite each other.
+        """
+        if self.directory is None:
+            return None
+        stem = self.directory / f"{name}-{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:12]}"
+        self.write_jsonl(stem.with_suffix(".jsonl"))
+        self.write_folded(stem.with_suffix(".folded"))
+        stem.with_suffix(".summary.json").write_text(json.dumps(self.summary(dependencies), indent=2))
+        return stem
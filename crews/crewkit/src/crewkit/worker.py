@@ -0,0 +1,370 @@
+"""Warm worker pool that keeps constructed crews resident between jobs.
+
+Jobs are submitted to a SQLite queue shared by every process on the host.
+``crew_worker serve`` starts worker processes that import and build each
+crew once, then take jobs from the queue until they are recycled::
+
+    crew_worker serve --workers 2
+    crew_worker submit mywordpresscrew '{"topic": "AI LLMs", "current_year": "2025"}' --wait
+    crew_worker status 1
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterable, List, Optional
+
+from crewkit.logs import log_event
+from crewkit.registry import CREWS, RUNTIME_SETTINGS, check_crews, crew_class
+
+# Job states, in the order a job moves through them
+QUEUED, RUNNING, COMPLETED, FAILED = "queued", "running", "completed", "failed"
+
+# Consecutive workers that may die before becoming ready, and the longest wait between restarts
+MAX_START_FAILURES = 5
+MAX_RESTART_DELAY = 60.0
+
+
+class JobQueue:
+    """Durable FIFO of crew runs in a SQLite database.
+
+    Any number of processes may submit and claim jobs; a claim is a single
+    transaction, so each job is handed to exactly one worker.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " crew TEXT NOT NULL,"
+            " inputs TEXT NOT NULL,"
+            " status TEXT NOT NULL,"
+            " worker INTEGER,"
+            " result TEXT,"
+            " error TEXT,"
+            " submitted REAL NOT NULL,"
+            " started REAL,"
+            " finished REAL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, id)")
+
+    @classmethod
+    def from_env(cls) -> "JobQueue":
+        """Return the queue at ``CREW_QUEUE_PATH``."""
+        return cls(os.getenv("CREW_QUEUE_PATH", "~/.cache/crewkit/jobs.sqlite3"))
+
+    def submit(self, crew: str, inputs: Dict[str, Any]) -> int:
+        """Queue a run of ``crew`` with ``inputs`` and return its job id."""
+        with self._lock:
+            cursor = self._db.execute(
+                "INSERT INTO jobs (crew, inputs, status, submitted) VALUES (?, ?, ?, ?)",
+                (crew, json.dumps(inputs), QUEUED, time.time()),
+            )
+            return cursor.lastrowid
+
+    def claim(self, crews: Iterable[str], worker: int) -> Optional[Dict[str, Any]]:
+        """Take the oldest queued job for one of ``crews``, or None if there is none."""
+        crews = list(crews)
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._db.execute(
+                    f"SELECT id, crew, inputs FROM jobs WHERE status = ? AND crew IN ({', '.join('?' * len(crews))})"
+                    " ORDER BY id LIMIT 1",
+                    (QUEUED, *crews),
+                ).fetchone()
+                if row is not None:
+                    self._db.execute(
+                        "UPDATE jobs SET status = ?, worker = ?, started = ? WHERE id = ?",
+                        (RUNNING, worker, time.time(), row[0]),
+                    )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        if row is None:
+            return None
+        return {"id": row[0], "crew": row[1], "inputs": json.loads(row[2])}
+
+    def complete(self, job_id: int, result: Dict[str, Any]) -> None:
+        self._finish(job_id, COMPLETED, result=json.dumps(result, default=str))
+
+    def fail(self, job_id: int, error: str) -> None:
+        self._finish(job_id, FAILED, error=error)
+
+    def fail_abandoned(self, worker: int) -> int:
+        """Fail the jobs a worker that exited was still running; returns how many."""
+        with self._lock:
+            cursor = self._db.execute(
+                "UPDATE jobs SET status = ?, error = ?, finished = ? WHERE status = ? AND worker = ?",
+                (FAILED, "Worker exited while running the job", time.time(), RUNNING, worker),
+            )
+            return cursor.rowcount
+
+    def get(self, job_id: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            self._db.row_factory = sqlite3.Row
+            try:
+                row = self._db.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            finally:
+                self._db.row_factory = None
+        if row is None:
+            return None
+        job = dict(row)
+        job["inputs"] = json.loads(job["inputs"])
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def wait(self, job_id: int, timeout: Optional[float] = None, interval: float = 0.5) -> Dict[str, Any]:
+        """Poll until a job has completed or failed, and return it."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            job = self.get(job_id)
+            if job is None:
+                raise KeyError(f"No job {job_id}")
+            if job["status"] in (COMPLETED, FAILED):
+                return job
+            if deadline is not None and time.monotonic() > deadline:
+                raise TimeoutError(f"Job {job_id} still {job['status']} after {timeout}s")
+            time.sleep(interval)
+
+    def _finish(self, job_id: int, status: str, result: Optional[str] = None, error: Optional[str] = None) -> None:
+        with self._lock:
+            self._db.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, finished = ? WHERE id = ?",
+                (status, result, error, time.time(), job_id),
+            )
+
+
+class CrewPool:
+    """Constructed crews kept ready to run, per crew name.
+
+    Each crew is built once, from its snapshot in ``CREW_SNAPSHOT_DIR``
+    and its runtime settings when there is one and otherwise from its
+    class; ready instances are cheap copies of that template, so taking one
+    costs no imports or YAML parsing. Take an instance per run and call
+    ``refill`` when idle.
+    """
+
+    def __init__(self, crews: Iterable[str], size: int = 1):
+        crews = list(crews)
+        check_crews(crews)
+        self.names = crews
+        self.size = max(1, size)
+        self._templates: Dict[str, Any] = {}
+        self._ready: Dict[str, Deque[Any]] = {name: deque() for name in self.names}
+        self._lock = threading.Lock()
+
+    def preload(self) -> None:
+        """Import every crew, build its template and fill the pool."""
+        for name in self.names:
+            self._template(name)
+        self.refill()
+
+    def take(self, name: str) -> Any:
+        """A ready-to-run crew, built on the spot if none is waiting."""
+        with self._lock:
+            ready = self._ready[name]
+            crew = ready.popleft() if ready else None
+        return crew if crew is not None else self._template(name).copy()
+
+    def refill(self, name: Optional[str] = None) -> None:
+        """Top the pool of one crew, or of every crew, back up to ``size``."""
+        for crew_name in [name] if name else self.names:
+            while len(self._ready[crew_name]) < self.size:
+                crew = self._template(crew_name).copy()
+                with self._lock:
+                    self._ready[crew_name].append(crew)
+
+    def _template(self, name: str) -> Any:
+        if name not in self._templates:
+            snapshot_dir = os.getenv("CREW_SNAPSHOT_DIR")
+            snapshot = Path(snapshot_dir) / f"{name}.json" if snapshot_dir else None
+            if snapshot is not None and snapshot.exists():
+                from crewkit.snapshot import load
+
+                # The settings the crew builds at run time come from its project, as in a CLI run
+                self._templates[name] = load(snapshot, RUNTIME_SETTINGS.get(name))
+            else:
+                self._templates[name] = crew_class(name)().crew()
+        return self._templates[name]
+
+
+def _work(queue_path: str, crews: List[str], max_jobs: int, pool_size: int, interval: float, ready: Any) -> None:
+    """Worker process: take and run jobs until ``max_jobs`` have been handled.
+
+    ``ready`` is set once every crew is built, telling ``serve`` the worker started.
+    """
+    worker = os.getpid()
+    try:
+        queue = JobQueue(queue_path)
+        pool = CrewPool(crews, pool_size)
+        pool.preload()
+    except Exception as error:
+        log_event(logging.ERROR, "worker_start_failed", worker=worker, error=repr(error))
+        raise
+    ready.set()
+    log_event(logging.INFO, "worker_ready", worker=worker, crews=crews)
+
+    handled = 0
+    while handled < max_jobs:
+        job = queue.claim(crews, worker)
+        if job is None:
+            time.sleep(interval)
+            continue
+        started = time.perf_counter()
+        try:
+            crew = pool.take(job["crew"])
+            result = crew.kickoff(inputs=job["inputs"])
+            queue.complete(job["id"], {
+                "output": result.raw,
+                "directory": crew.run_directory,
+                "seconds": time.perf_counter() - started,
+            })
+            log_event(logging.INFO, "job_completed", job=job["id"], crew=job["crew"],
+                      seconds=time.perf_counter() - started)
+        except Exception as error:
+            queue.fail(job["id"], repr(error))
+            log_event(logging.WARNING, "job_failed", job=job["id"], crew=job["crew"], error=repr(error))
+        handled += 1
+        pool.refill(job["crew"])
+    log_event(logging.INFO, "worker_recycled", worker=worker, jobs=handled)
+
+
+def serve(
+    crews: Optional[List[str]] = None,
+    workers: Optional[int] = None,
+    max_jobs: Optional[int] = None,
+    pool_size: Optional[int] = None,
+    queue_path: Optional[str] = None,
+    interval: float = 0.5,
+) -> None:
+    """Keep ``workers`` warm worker processes running until interrupted.
+
+    A worker exits after ``max_jobs`` jobs to bound memory growth and is
+    replaced by a fresh one; jobs it left running are marked failed. A
+    worker that dies before its crews are built is restarted after an
+    exponentially growing delay, and after ``MAX_START_FAILURES`` such
+    deaths in a row ``serve`` gives up with a RuntimeError.
+    """
+    crews = crews or list(CREWS)
+    workers = workers or int(os.getenv("CREW_WORKERS", "2"))
+    max_jobs = max_jobs or int(os.getenv("CREW_WORKER_MAX_JOBS", "50"))
+    pool_size = pool_size or int(os.getenv("CREW_WORKER_POOL", "1"))
+    queue = JobQueue(queue_path) if queue_path else JobQueue.from_env()
+    args = (str(queue.path), crews, max_jobs, pool_size, interval)
+
+    context = multiprocessing.get_context("spawn")
+    processes: List[Optional[Any]] = [None] * max(1, workers)
+    ready: List[Optional[Any]] = [None] * len(processes)
+    start_failures = [0] * len(processes)
+    not_before = [0.0] * len(processes)
+    print(f"Serving crews {', '.join(crews)} from {queue.path} with {len(processes)} workers")
+    try:
+        while True:
+            for slot, process in enumerate(processes):
+                if process is not None and process.is_alive():
+                    continue
+                if process is not None:
+                    process.join()
+                    abandoned = queue.fail_abandoned(process.pid)
+                    if abandoned or process.exitcode:
+                        log_event(logging.WARNING, "worker_exited", worker=process.pid,
+                                  exitcode=process.exitcode, abandoned=abandoned)
+                    start_failures[slot] = 0 if ready[slot].is_set() else start_failures[slot] + 1
+                    if start_failures[slot] >= MAX_START_FAILURES:
+                        log_event(logging.ERROR, "worker_start_abandoned", failures=start_failures[slot])
+                        raise RuntimeError(
+                            f"Workers failed to start {start_failures[slot]} times in a row; see the worker_start_failed events"
+                        )
+                    delay = min(interval * 2 ** start_failures[slot], MAX_RESTART_DELAY) if start_failures[slot] else 0
+                    not_before[slot] = time.monotonic() + delay
+                    processes[slot] = None
+                if time.monotonic() < not_before[slot]:
+                    continue
+                ready[slot] = context.Event()
+                processes[slot] = context.Process(
+                    target=_work, args=(*args, ready[slot]), name=f"crew-worker-{slot}"
+                )
+                processes[slot].start()
+            time.sleep(interval)
+    finally:
+        for process in processes:
+            if process is not None and process.is_alive():
+                process.terminate()
+        for process in processes:
+            if process is not None:
+                process.join()
+                queue.fail_abandoned(process.pid)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--queue", help="queue database; defaults to CREW_QUEUE_PATH")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = commands.add_parser("serve", help="run warm workers until interrupted")
+    serve_parser.add_argument("--crews", help="comma-separated crews to serve; defaults to all")
+    serve_parser.add_argument("--workers", type=int, help="worker processes; defaults to CREW_WORKERS")
+    serve_parser.add_argument("--max-jobs", type=int, help="jobs per worker before it is recycled")
+    serve_parser.add_argument("--pool-size", type=int, help="ready instances kept per crew in each worker")
+
+    submit_parser = commands.add_parser("submit", help="queue a crew run")
+    submit_parser.add_argument("crew")
+    submit_parser.add_argument("inputs", nargs="?", default="{}", help="JSON object of kickoff inputs")
+    submit_parser.add_argument("--wait", action="store_true", help="wait for the job and print it")
+    submit_parser.add_argument("--timeout", type=float, help="seconds to wait before giving up")
+
+    status_parser = commands.add_parser("status", help="print a job")
+    status_parser.add_argument("job", type=int)
+
+    args = parser.parse_args(argv)
+    if args.command == "serve":
+        try:
+            serve(
+                crews=[name for name in (args.crews or "").split(",") if name] or None,
+                workers=args.workers,
+                max_jobs=args.max_jobs,
+                pool_size=args.pool_size,
+                queue_path=args.queue,
+            )
+        except KeyboardInterrupt:
+            pass
+        except RuntimeError as error:
+            print(error, file=sys.stderr)
+            return 1
+        return 0
+
+    queue = JobQueue(args.queue) if args.queue else JobQueue.from_env()
+    if args.command == "submit":
+        if args.crew not in CREWS:
+            print(f"Unknown crew {args.crew}; choose from {', '.join(CREWS)}", file=sys.stderr)
+            return 1
+        job_id = queue.submit(args.crew, json.loads(args.inputs))
+        if not args.wait:
+            print(job_id)
+            return 0
+        job = queue.wait(job_id, timeout=args.timeout)
+    else:
+        job = queue.get(args.job)
+        if job is None:
+            print(f"No job {args.job}", file=sys.stderr)
+            return 1
+    print(json.dumps(job, indent=2, default=str))
+    return 0 if job["status"] != FAILED else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+import json
+import os
+import shutil
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from crewai import Crew, Task
+
+from crewkit.cache import write_atomic
+
+# Marker written into every workspace, recording its owner and state
+MARKER = ".workspace.json"
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _atomic_save_file(task: Task):
+    """Replacement for ``Task._save_file`` that never leaves a partial file behind."""
+
+    def save(result: Any) -> None:
+        if task.output_file is None:
+            raise ValueError("output_file is not set.")
+        if isinstance(result, dict):
+            content = json.dumps(result, ensure_ascii=False, indent=2)
+        else:
+            content = str(result)
+        write_atomic(Path(task.output_file).expanduser(), content)
+
+    return save
+
+
+class Workspace:
+    """Directory that holds every output file of one crew run.
+
+    Relative ``output_file`` paths are resolved inside the workspace and
+    written atomically, so concurrent runs on one host never share or
+    half-read a file. A marker file records the owning process, letting
+    ``collect`` remove old runs without touching ones still in progress.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory).absolute()
+
+    @classmethod
+    def create(cls, root: str, run_id: Optional[str] = None) -> "Workspace":
+        """Make a new, uniquely named workspace under ``root``."""
+        run_id = run_id or f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        workspace = cls(Path(root) / run_id)
+        workspace.directory.mkdir(parents=True, exist_ok=False)
+        workspace.open()
+        return workspace
+
+    @classmethod
+    def latest(cls, root: str) -> Optional["Workspace"]:
+        """The most recently created workspace under ``root``, if any."""
+        runs = _runs(Path(root))
+        return cls(runs[-1]) if runs else None
+
+    def resolve(self, path: str) -> str:
+        """Absolute location of ``path`` inside the workspace; absolute paths are kept."""
+        if os.path.isabs(path):
+            return path
+        return str(self.directory / path)
+
+    def apply(self, crew: Crew) -> None:
+        """Point the crew's relative output files into this workspace and write them atomically."""
+        for task in crew.tasks:
+            if not task.output_file:
+                continue
+            # The path as configured, unless a previous run already relocated it
+            original, relocated = task.__dict__.get("_workspace_output", (None, None))
+            if task.output_file != relocated:
+                original = task.output_file
+            relocated = self.resolve(original)
+            task.output_file = relocated
+            object.__setattr__(task, "_workspace_output", (original, relocated))
+            object.__setattr__(task, "_save_file", _atomic_save_file(task))
+
+    def open(self) -> None:
+        """Mark the workspace as in use by this process."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        write_atomic(
+            self.directory / MARKER,
+            json.dumps({"pid": os.getpid(), "started": time.time(), "finished": None}),
+        )
+
+    def close(self) -> None:
+        """Mark the workspace as finished, making it eligible for collection."""
+        marker = _read_marker(self.directory)
+        marker["finished"] = time.time()
+        write_atomic(self.directory / MARKER, json.dumps(marker))
+
+    @staticmethod
+    def collect(root: str, keep: int = 20, max_age: Optional[float] = 7 * 24 * 3600) -> List[Path]:
+        """Delete finished workspaces beyond the newest ``keep`` or older than ``max_age`` seconds.
+
+        Workspaces whose owning process is still running are never removed.
+        """
+        now = time.time()
+        removed = []
+        runs = _runs(Path(root))
+        for index, directory in enumerate(reversed(runs)):
+            marker = _read_marker(directory)
+            if not marker.get("finished") and marker.get("pid") and _pid_alive(marker["pid"]):
+                continue
+            finished = marker.get("finished") or directory.stat().st_mtime
+            if index >= keep or (max_age is not None and now - finished > max_age):
+                shutil.rmtree(directory, ignore_errors=True)
+                removed.append(directory)
+        return removed
+
+
+def collect_from_env(root: str) -> List[Path]:
+    """Apply the ``CREW_WORKSPACE_KEEP`` and ``CREW_WORKSPACE_MAX_AGE`` retention policy."""
+    max_age = os.getenv("CREW_WORKSPACE_MAX_AGE", str(7 * 24 * 3600))
+    return Workspace.collect(
+        root,
+        keep=int(os.getenv("CREW_WORKSPACE_KEEP", "20")),
+        max_age=float(max_age) if max_age else None,
+    )
+
+
+def _runs(root: Path) -> List[Path]:
+    """Workspaces under ``root``, oldest first."""
+    if not root.is_dir():
+        return []
+    runs = [path for path in root.iterdir() if (path / MARKER).exists()]
+    return sorted(runs, key=lambda path: _read_marker(path).get("started", 0.0))
+
+
+def _read_marker(directory: Path) -> Dict[str, Any]:
+    try:
+        return json.loads((directory / MARKER).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
@@ -0,0 +1,73 @@
+import json
+
+import pytest
+from crewai import Agent, Task
+
+from crewkit.batch import BatchRunner, item_id, read_items
+from crewkit.benchmark import _fake_llm_class
+from crewkit.scheduler import DagCrew
+
+
+def _crew():
+    agent = Agent(role="Writer", goal="Write", backstory="Writes", llm=_fake_llm_class()(response_bytes=100))
+    task = Task(
+        name="post",
+        description="Write a post about {topic}",
+        expected_output="A post",
+        agent=agent,
+        output_file="post.md",
+    )
+    return DagCrew(agents=[agent], tasks=[task], cache=None, response_cache=None, http_pool=None)
+
+
+def test_items_run_in_their_own_directories_and_reruns_skip_completed_ones(tmp_path):
+    items = [{"id": "tea", "topic": "tea"}, {"id": "coffee", "topic": "coffee"}, {"topic": "cocoa"}]
+    runner = BatchRunner(_crew(), str(tmp_path), concurrency=3, retries=0)
+
+    summary = runner.run(items)
+
+    assert summary["completed"] == 3 and summary["skipped"] == 0 and summary["failed"] == []
+    posts = {item_id(item): (tmp_path / item_id(item) / "post.md").read_text(encoding="utf-8") for item in items}
+    assert len(set(posts.values())) == 3
+    assert set(runner.manifest.completed()) == set(posts)
+    assert runner.run(items)["skipped"] == 3
+
+
+def test_failed_items_are_retried_and_recorded(tmp_path):
+    attempts = {}
+
+    def prepare(item, directory):
+        attempts[item["id"]] = attempts.get(item["id"], 0) + 1
+        if item["id"] == "broken" or attempts[item["id"]] == 1:
+            raise RuntimeError(f"{item['id']} failed")
+        return dict(item)
+
+    items = [{"id": "flaky", "topic": "tea"}, {"id": "broken", "topic": "coffee"}]
+    runner = BatchRunner(_crew(), str(tmp_path), retries=1, backoff=0, prepare=prepare)
+
+    summary = runner.run(items)
+
+    assert summary["completed"] == 1
+    assert summary["failed"] == ["broken"]
+    entries = runner.manifest.entries()
+    assert (entries["flaky"]["status"], entries["flaky"]["attempts"]) == ("completed", 2)
+    assert (entries["broken"]["status"], entries["broken"]["attempts"]) == ("failed", 2)
+    assert entries["broken"]["error"] == "RuntimeError: broken failed"
+    assert runner.run(items)["skipped"] == 1
+
+
+def test_read_items_accepts_json_lists_and_json_lines(tmp_path):
+    (tmp_path / "items.json").write_text(json.dumps([{"topic": "tea"}]))
+    (tmp_path / "items.jsonl").write_text('{"topic": "tea"}\n\n{"topic": "coffee"}\n')
+    (tmp_path / "bad.jsonl").write_text('["tea"]\n')
+
+    assert read_items(str(tmp_path / "items.json")) == [{"topic": "tea"}]
+    assert read_items(str(tmp_path / "items.jsonl")) == [{"topic": "tea"}, {"topic": "coffee"}]
+    with pytest.raises(ValueError):
+        read_items(str(tmp_path / "bad.jsonl"))
+
+
+def test_item_ids_prefer_the_id_field_and_are_stable():
+    assert item_id({"id": 7, "topic": "tea"}) == "7"
+    assert item_id({"topic": "tea", "year": 1}) == item_id({"year": 1, "topic": "tea"})
+    assert item_id({"topic": "tea"}) != item_id({"topic": "coffee"})
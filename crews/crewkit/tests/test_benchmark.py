@@ -0,0 +1,40 @@
+from crewkit.benchmark import _fake_llm_class, _union_seconds, compare
+
+
+def test_fake_llm_answers_deterministically_and_reports_usage():
+    reported = []
+
+    class Recorder:
+        def log_success_event(self, kwargs, response_obj, start_time, end_time):
+            reported.append(response_obj["usage"])
+
+    llm = _fake_llm_class()(response_bytes=120)
+    first = llm.call([{"role": "user", "content": "Write about tea"}], callbacks=[Recorder()])
+
+    assert first == llm.call([{"role": "user", "content": "Write about tea"}])
+    assert first != llm.call([{"role": "user", "content": "Write about coffee"}])
+    assert first.startswith("Thought: I now know the final answer\nFinal Answer: ")
+    assert len(first.split("Final Answer: ", 1)[1]) == 120
+    assert len(reported) == 1
+    assert reported[0].prompt_tokens > 0 and reported[0].completion_tokens > 0
+    assert len(llm.spans) == 3
+
+
+def test_union_seconds_counts_overlapping_time_once():
+    assert _union_seconds([]) == 0
+    assert _union_seconds([(0, 2), (1, 3), (5, 6)]) == 4
+    assert _union_seconds([(0, 10), (2, 3)]) == 10
+
+
+def test_compare_reports_metrics_grown_beyond_the_tolerance():
+    baseline = {"crews": {
+        "writer": {"wall_seconds": 1.0, "peak_rss_bytes": 100, "import_seconds": 0.0},
+        "gone": {"wall_seconds": 1.0},
+    }}
+    current = {"crews": {
+        "writer": {"wall_seconds": 1.5, "peak_rss_bytes": 105, "import_seconds": 0.2},
+        "new": {"wall_seconds": 9.0},
+    }}
+
+    assert compare(baseline, current, tolerance=0.1) == ["writer.wall_seconds: 1 -> 1.5 (+50%)"]
+    assert compare(baseline, current, tolerance=0.6) == []
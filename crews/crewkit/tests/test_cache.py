@@ -0,0 +1,106 @@
+import os
+import time
+from types import SimpleNamespace
+
+from crewai.tasks.task_output import TaskOutput
+
+from crewkit.cache import TaskCache, task_fingerprint
+
+
+def _task(description="Write a post", goal="Inform", tools=("search",), temperature=0.7, output_file=None):
+    agent = SimpleNamespace(
+        role="Writer",
+        goal=goal,
+        backstory="Writes",
+        tools=[SimpleNamespace(name=name) for name in tools],
+        llm=SimpleNamespace(model="gpt-4o-mini", temperature=temperature, top_p=None, seed=None),
+    )
+    return SimpleNamespace(
+        name="post",
+        description=description,
+        expected_output="A post",
+        agent=agent,
+        output_file=output_file,
+        output=None,
+    )
+
+
+def _output(raw):
+    return TaskOutput(name="post", description="Write a post", raw=raw, agent="Writer")
+
+
+def _age(cache, key, seconds):
+    stamp = time.time() - seconds
+    os.utime(cache._path(key), (stamp, stamp))
+
+
+def test_fingerprint_is_stable():
+    assert task_fingerprint(_task(), "context") == task_fingerprint(_task(), "context")
+
+
+def test_fingerprint_ignores_tool_order():
+    assert task_fingerprint(_task(tools=("a", "b")), "") == task_fingerprint(_task(tools=("b", "a")), "")
+
+
+def test_fingerprint_changes_with_anything_that_shapes_the_output():
+    base = task_fingerprint(_task(), "context")
+    assert task_fingerprint(_task(), "other context") != base
+    assert task_fingerprint(_task(description="Write a poem"), "context") != base
+    assert task_fingerprint(_task(goal="Persuade"), "context") != base
+    assert task_fingerprint(_task(tools=()), "context") != base
+    assert task_fingerprint(_task(temperature=0.0), "context") != base
+
+
+def test_put_then_load_restores_the_output_and_its_file(tmp_path):
+    cache = TaskCache(str(tmp_path / "cache"))
+    cache.put("a" * 64, _output("cached text"))
+    task = _task(output_file=str(tmp_path / "out" / "post.md"))
+
+    output = cache.load(task, "a" * 64)
+
+    assert output.raw == "cached text"
+    assert task.output is output
+    assert (tmp_path / "out" / "post.md").read_text(encoding="utf-8") == "cached text"
+    assert cache.load(task, "b" * 64) is None
+
+
+def test_expired_entries_are_misses(tmp_path):
+    cache = TaskCache(str(tmp_path), max_age=60)
+    cache.put("a" * 64, _output("old"))
+    _age(cache, "a" * 64, 120)
+
+    assert cache.get("a" * 64) is None
+    assert not cache._path("a" * 64).exists()
+
+
+def test_eviction_drops_least_recently_used_entries_first(tmp_path):
+    cache = TaskCache(str(tmp_path), max_bytes=10 ** 9, max_age=None)
+    keys = ["a" * 64, "b" * 64, "c" * 64]
+    for age, key in zip((30, 20, 10), keys):
+        cache.put(key, _output("x" * 100))
+        _age(cache, key, age)
+    # Reading the oldest entry makes it the most recently used
+    assert cache.get(keys[0]) is not None
+
+    cache.max_bytes = sum(cache._path(key).stat().st_size for key in (keys[0], keys[2]))
+    cache.evict()
+
+    assert [cache._path(key).exists() for key in keys] == [True, False, True]
+
+
+def test_eviction_drops_expired_entries_even_under_the_size_limit(tmp_path):
+    cache = TaskCache(str(tmp_path), max_age=60)
+    cache.put("a" * 64, _output("old"))
+    cache.put("b" * 64, _output("new"))
+    _age(cache, "a" * 64, 120)
+
+    cache.evict()
+
+    assert not cache._path("a" * 64).exists()
+    assert cache._path("b" * 64).exists()
+
+
+def test_bypassed_tasks_are_not_cached():
+    cache = TaskCache(bypass=["post"])
+
+    assert not cache.enabled_for(_task())
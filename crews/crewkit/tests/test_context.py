@@ -0,0 +1,61 @@
+from crewai import Task
+from crewai.tasks.task_output import TaskOutput
+
+from crewkit.context import CONTEXT_DIVIDER, ContextCondenser, estimate_tokens, split_sections
+
+
+def _upstream(name, raw):
+    task = Task(name=name, description=f"Write the {name}", expected_output=name, output_file=f"working/{name}.md")
+    return task, TaskOutput(name=name, description=task.description, raw=raw, agent="Writer")
+
+
+def _document(topic, sections=12):
+    return "\n\n".join(
+        f"## {topic.title()} part {number}\n\n"
+        f"The {topic} grows in part {number}. " + "Filler sentence with nothing to add. " * 20
+        + "\n\nA second paragraph starts here. It goes on for a while."
+        for number in range(sections)
+    )
+
+
+def test_small_payloads_pass_through_unchanged(tmp_path):
+    upstream = [_upstream("outline", "A short outline."), _upstream("notes", "Some notes.")]
+    consumer = Task(description="Write the story", expected_output="A story")
+
+    fitted = ContextCondenser(str(tmp_path)).fit(consumer, upstream, budget=100)
+
+    assert fitted == "A short outline." + CONTEXT_DIVIDER + "Some notes."
+
+
+def test_condensed_context_stays_within_the_budget(tmp_path):
+    upstream = [
+        _upstream("characters", _document("dragon")),
+        _upstream("world", _document("kingdom")),
+        _upstream("summary", "A brief summary."),
+    ]
+    consumer = Task(description="Write the dragon chapter", expected_output="A chapter about the dragon")
+    total = sum(estimate_tokens(output.raw) for _, output in upstream)
+    condenser = ContextCondenser(str(tmp_path))
+
+    for budget in (total // 2, total // 5, 300):
+        parts = condenser.fit(consumer, upstream, budget).split(CONTEXT_DIVIDER)
+
+        assert len(parts) == 3
+        assert sum(estimate_tokens(part) for part in parts) <= budget
+        assert parts[2] == "A brief summary."
+        assert "full text in working/characters.md" in parts[0]
+
+
+def test_condensing_keeps_relevant_sections_and_caches_the_result(tmp_path):
+    sections = split_sections(_document("kingdom", sections=6))
+    sections[3] = "## Dragon lair\n\nThe dragon guards its lair. The dragon sleeps on gold."
+    raw = "\n\n".join(sections)
+    upstream = [_upstream("world", raw)]
+    consumer = Task(description="Describe the dragon lair", expected_output="The dragon lair")
+    budget = estimate_tokens(raw) // 3
+
+    fitted = ContextCondenser(str(tmp_path)).fit(consumer, upstream, budget)
+
+    assert sections[3] in fitted
+    assert len(list(tmp_path.glob("*.md"))) == 1
+    assert ContextCondenser(str(tmp_path)).fit(consumer, upstream, budget) == fitted
@@ -0,0 +1,85 @@
+import threading
+import time
+
+import httpx
+import litellm
+
+from crewkit.http_pool import HttpPool
+
+
+def _pool(handler, per_host=16):
+    return HttpPool(
+        per_host=per_host,
+        transport=httpx.MockTransport(handler),
+        async_transport=httpx.MockTransport(handler),
+        base_url="http://llm.test",
+    )
+
+
+def test_concurrent_requests_never_exceed_the_per_host_limit():
+    lock = threading.Lock()
+    in_flight = {"now": 0, "peak": 0}
+
+    def handler(request):
+        with lock:
+            in_flight["now"] += 1
+            in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+        time.sleep(0.02)
+        with lock:
+            in_flight["now"] -= 1
+        return httpx.Response(200, json={"ok": True})
+
+    pool = _pool(handler, per_host=3)
+    threads = [threading.Thread(target=pool.client.get, args=("/v1/chat",)) for _ in range(12)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    pool.close()
+
+    assert in_flight["peak"] == 3
+    assert pool.stats() == {"http://llm.test": {"requests": 12, "peak_in_flight": 3}}
+
+
+def test_streamed_responses_hold_their_slot_until_closed():
+    pool = _pool(lambda request: httpx.Response(200, content=iter([b"da", b"ta"])), per_host=1)
+
+    with pool.client.stream("GET", "/first") as response:
+        assert pool.transport._in_flight["http://llm.test"] == 1
+        assert response.read() == b"data"
+    assert pool.transport._in_flight["http://llm.test"] == 0
+    pool.client.get("/second")
+    pool.close()
+
+    assert pool.stats()["http://llm.test"]["requests"] == 2
+
+
+def test_failed_requests_release_their_slot():
+    def handler(request):
+        raise httpx.ConnectError("refused", request=request)
+
+    pool = _pool(handler, per_host=1)
+    for _ in range(2):
+        try:
+            pool.client.get("/")
+        except httpx.ConnectError:
+            pass
+    pool.close()
+
+    assert pool.transport._in_flight["http://llm.test"] == 0
+
+
+def test_install_sets_litellm_clients_and_close_restores_them(monkeypatch):
+    previous, previous_async = httpx.Client(), httpx.AsyncClient()
+    monkeypatch.setattr(litellm, "client_session", previous)
+    monkeypatch.setattr(litellm, "aclient_session", previous_async)
+    pool = _pool(lambda request: httpx.Response(200))
+
+    pool.install()
+    assert litellm.client_session is pool.client
+    assert litellm.aclient_session is pool.async_client
+
+    pool.close()
+    assert litellm.client_session is previous
+    assert litellm.aclient_session is previous_async
+    previous.close()
@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+from crewai.knowledge.source.string_knowledge_source import StringKnowledgeSource
+
+from crewkit.knowledge import EmbeddingStore, SharedKnowledgeStorage, shared_knowledge
+
+VOCABULARY = ("tea", "coffee", "dragon", "ship")
+
+
+def _embed(texts, calls=None):
+    if calls is not None:
+        calls.append(list(texts))
+    return [[text.lower().count(word) + 0.01 for word in VOCABULARY] for text in texts]
+
+
+def test_rows_embed_each_distinct_text_once_and_persist(tmp_path):
+    calls = []
+    store = EmbeddingStore(str(tmp_path))
+
+    rows = store.rows(["tea time", "dragon ship", "tea time"], lambda texts: _embed(texts, calls))
+    again = store.rows(["dragon ship", "coffee"], lambda texts: _embed(texts, calls))
+
+    assert rows[0] == rows[2] != rows[1]
+    assert again[0] == rows[1]
+    assert calls == [["tea time", "dragon ship"], ["coffee"]]
+    assert len(store) == 3 and store.dim == 4
+    assert np.allclose(np.linalg.norm(store.vectors(rows), axis=1), 1.0)
+
+    reopened = EmbeddingStore(str(tmp_path))
+    assert reopened.rows(["coffee", "tea time"], lambda texts: _embed(texts, calls)) == [again[1], rows[0]]
+    assert len(calls) == 2
+
+
+def test_vectors_of_another_size_are_rejected(tmp_path):
+    store = EmbeddingStore(str(tmp_path))
+    store.rows(["tea"], _embed)
+
+    with pytest.raises(ValueError, match="Embedding size 2"):
+        store.rows(["coffee"], lambda texts: [[1.0, 0.0] for _ in texts])
+
+
+def _storage(tmp_path, monkeypatch, embed=_embed):
+    monkeypatch.setenv("CREW_EMBEDDING_DIR", str(tmp_path))
+    storage = SharedKnowledgeStorage(collection_name="crew")
+    storage.embedder = embed
+    return storage
+
+
+def test_search_ranks_documents_by_cosine_similarity(tmp_path, monkeypatch):
+    storage = _storage(tmp_path, monkeypatch)
+    storage.save(
+        ["Green tea and black tea", "A dragon ship at sea", "Coffee with tea"],
+        [{"topic": "drinks"}, {"topic": "story"}, {"topic": "drinks"}],
+    )
+
+    results = storage.search(["tea"], limit=2, score_threshold=0.1)
+    assert [result["context"] for result in results] == ["Green tea and black tea", "Coffee with tea"]
+    assert results[0]["score"] > results[1]["score"]
+
+    filtered = storage.search(["dragon"], filter={"topic": "drinks"}, score_threshold=0.0)
+    assert [result["metadata"] for result in filtered] == [{"topic": "drinks"}] * 2
+    # Queries are embedded but never stored
+    assert len(storage._store) == 3
+
+
+def test_unavailable_embedder_finds_nothing(tmp_path, monkeypatch):
+    def broken(texts):
+        raise ConnectionError("offline")
+
+    storage = _storage(tmp_path, monkeypatch, embed=broken)
+    storage.save(["Green tea"])
+
+    assert storage.search(["tea"]) == []
+
+
+def test_sources_with_the_same_content_share_one_knowledge():
+    first = shared_knowledge([StringKnowledgeSource(content="The user likes tea.")])
+    second = shared_knowledge([StringKnowledgeSource(content="The user likes tea.")])
+    other = shared_knowledge([StringKnowledgeSource(content="The user likes coffee.")])
+
+    assert first is second
+    assert other is not first
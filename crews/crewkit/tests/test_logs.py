@@ -0,0 +1,79 @@
+import json
+import logging
+import time
+
+import pytest
+from crewai import Agent, Task
+
+from crewkit.logs import LOGGER_NAME, SamplingFilter, configure_logging, log_event, run_mode, shutdown_logging
+from crewkit.scheduler import DagCrew
+
+
+@pytest.fixture
+def log_file(tmp_path, monkeypatch):
+    path = tmp_path / "crew.log"
+    monkeypatch.setenv("CREW_LOG_FILE", str(path))
+    logger = logging.getLogger(LOGGER_NAME)
+    level, propagate = logger.level, logger.propagate
+    yield path
+    shutdown_logging()
+    logger.setLevel(level)
+    logger.propagate = propagate
+
+
+def _events(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_events_are_buffered_and_written_as_json_on_shutdown(log_file, monkeypatch):
+    monkeypatch.setenv("CREW_LOG_LEVEL", "INFO")
+    configure_logging()
+
+    log_event(logging.INFO, "task_finished", task="outline", seconds=1.5)
+    log_event(logging.DEBUG, "agent_step", step="AgentAction")
+    shutdown_logging()
+
+    events = _events(log_file)
+    assert [(event["level"], event["event"]) for event in events] == [("INFO", "task_finished")]
+    assert events[0]["task"] == "outline"
+    assert events[0]["seconds"] == 1.5
+
+
+def test_buffered_events_are_flushed_while_the_queue_is_idle(log_file):
+    configure_logging()
+
+    log_event(logging.INFO, "crew_started", crew="writer")
+
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline and not log_file.read_text(encoding="utf-8"):
+        time.sleep(0.05)
+    assert [event["event"] for event in _events(log_file)] == ["crew_started"]
+
+
+def test_sampling_keeps_every_warning():
+    drop_all = SamplingFilter(rate=0.0)
+
+    def record(level):
+        return logging.LogRecord(LOGGER_NAME, level, __file__, 1, "event", None, None)
+
+    assert not drop_all.filter(record(logging.INFO))
+    assert drop_all.filter(record(logging.WARNING))
+    assert SamplingFilter(rate=1.0).filter(record(logging.DEBUG))
+
+
+def test_production_mode_silences_agents_and_logs_their_steps(log_file):
+    agent = Agent(role="Writer", goal="Write", backstory="Writes", verbose=True)
+    task = Task(description="Write", expected_output="Text", agent=agent)
+
+    crew = DagCrew(agents=[agent], tasks=[task], mode="production", verbose=True, http_pool=None)
+
+    assert not crew.verbose
+    assert not agent.verbose
+    assert crew.step_callback is not None
+
+
+def test_unknown_modes_are_rejected(monkeypatch):
+    monkeypatch.setenv("CREW_MODE", "loud")
+
+    with pytest.raises(ValueError, match="CREW_MODE"):
+        run_mode()
@@ -0,0 +1,131 @@
+import pytest
+from crewai import Agent, Task
+from crewai.project import agent, crew, task
+
+from crewkit.project import CrewBase, load_yaml
+from crewkit.scheduler import DagCrew
+
+AGENTS = """
+researcher:
+  role: Researcher
+  goal: Research {topic}
+  backstory: Researches
+writer:
+  role: Writer
+  goal: Write about {topic}
+  backstory: Writes
+editor:
+  role: Editor
+  goal: Edit
+  backstory: Edits
+"""
+
+TASKS = """
+research:
+  description: Research {topic}
+  expected_output: Notes
+  agent: researcher
+draft:
+  description: Draft a post about {topic}
+  expected_output: A draft
+  agent: writer
+  context: [research]
+edit:
+  description: Edit the draft
+  expected_output: A post
+  agent: editor
+  context: [draft]
+"""
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    monkeypatch.setenv("CREW_CONFIG_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.delenv("CREW_TASKS", raising=False)
+    (tmp_path / "agents.yaml").write_text(AGENTS)
+    (tmp_path / "tasks.yaml").write_text(TASKS)
+    built = []
+
+    @CrewBase
+    class Project:
+        agents_config = str(tmp_path / "agents.yaml")
+        tasks_config = str(tmp_path / "tasks.yaml")
+
+        @agent
+        def researcher(self) -> Agent:
+            built.append("researcher")
+            return Agent(config=self.agents_config["researcher"])
+
+        @agent
+        def writer(self) -> Agent:
+            built.append("writer")
+            return Agent(config=self.agents_config["writer"])
+
+        @agent
+        def editor(self) -> Agent:
+            built.append("editor")
+            return Agent(config=self.agents_config["editor"])
+
+        @task
+        def research(self) -> Task:
+            return Task(config=self.tasks_config["research"])
+
+        @task
+        def draft(self) -> Task:
+            return Task(config=self.tasks_config["draft"])
+
+        @task
+        def edit(self) -> Task:
+            return Task(config=self.tasks_config["edit"])
+
+        @crew
+        def crew(self) -> DagCrew:
+            return DagCrew(agents=self.agents, tasks=self.tasks, http_pool=None)
+
+    return Project, built
+
+
+def test_construction_builds_no_agents(project):
+    Project, built = project
+
+    Project()
+
+    assert built == []
+
+
+def test_selected_tasks_build_only_their_context_and_agents(project):
+    Project, built = project
+
+    crew = Project(tasks=["draft"]).crew()
+
+    assert [task.name for task in crew.tasks] == ["research", "draft"]
+    assert [agent.role for agent in crew.agents] == ["Researcher", "Writer"]
+    assert crew.tasks[1].context == [crew.tasks[0]]
+    assert sorted(set(built)) == ["researcher", "writer"]
+
+
+def test_every_task_is_built_without_a_selection(project, monkeypatch):
+    Project, built = project
+
+    assert [task.name for task in Project().crew().tasks] == ["research", "draft", "edit"]
+    monkeypatch.setenv("CREW_TASKS", "research")
+    assert [task.name for task in Project().crew().tasks] == ["research"]
+
+
+def test_unknown_tasks_are_rejected(project):
+    Project, _ = project
+
+    with pytest.raises(ValueError, match="Unknown tasks publish"):
+        Project(tasks=["publish"]).crew()
+
+
+def test_parsed_configs_are_cached_as_json_and_copied(tmp_path, monkeypatch):
+    monkeypatch.setenv("CREW_CONFIG_CACHE_DIR", str(tmp_path / "cache"))
+    # Content no other test parsed, so the process-wide cache cannot answer first
+    (tmp_path / "agents.yaml").write_text(f"{AGENTS}# {tmp_path}\n")
+
+    first = load_yaml(tmp_path / "agents.yaml")
+    first["writer"]["role"] = "Changed"
+
+    assert load_yaml(tmp_path / "agents.yaml")["writer"]["role"] == "Writer"
+    assert len(list((tmp_path / "cache").glob("*.json"))) == 1
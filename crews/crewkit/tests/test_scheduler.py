@@ -0,0 +1,234 @@
+import pytest
+from crewai import Agent, Task
+
+from crewkit.benchmark import _fake_llm_class
+from crewkit.llm_cache import ResponseCache
+from crewkit.scheduler import DagCrew, PartialOutput, TaskGraph
+
+
+def _task(name, context=None):
+    return Task(name=name, description=f"Do {name}", expected_output=f"The {name}", context=context)
+
+
+def test_explicit_context_defines_the_edges():
+    research = _task("research")
+    outline = _task("outline", context=[research])
+    facts = _task("facts", context=[research])
+    report = _task("report", context=[outline, facts])
+    graph = TaskGraph([research, outline, facts, report])
+
+    assert graph.dependencies == {0: [], 1: [0], 2: [0], 3: [1, 2]}
+    assert graph.dependents == {0: [1, 2], 1: [3], 2: [3], 3: []}
+    assert graph.named_dependencies() == {
+        "research": [],
+        "outline": ["research"],
+        "facts": ["research"],
+        "report": ["outline", "facts"],
+    }
+
+
+def test_task_without_context_depends_on_every_earlier_task():
+    first = _task("first", context=[])
+    second = _task("second", context=[])
+    last = _task("last")
+    graph = TaskGraph([first, second, last])
+
+    assert graph.dependencies[2] == [0, 1]
+
+
+def test_context_outside_the_crew_is_ignored():
+    outside = _task("outside")
+    inside = _task("inside", context=[outside])
+
+    assert TaskGraph([inside]).dependencies == {0: []}
+
+
+def test_order_is_topological_and_stable():
+    late = _task("late", context=[])
+    summary = _task("summary", context=[late])
+    early = _task("early", context=[])
+    graph = TaskGraph([summary, late, early])
+
+    assert graph.order == [1, 0, 2]
+
+
+def test_ready_lists_tasks_whose_dependencies_completed():
+    research = _task("research", context=[])
+    outline = _task("outline", context=[research])
+    facts = _task("facts", context=[research])
+    report = _task("report", context=[outline, facts])
+    graph = TaskGraph([research, outline, facts, report])
+
+    assert graph.ready(completed=[], started=[]) == [0]
+    assert graph.ready(completed=[], started=[0]) == []
+    assert graph.ready(completed=[0], started=[]) == [1, 2]
+    assert graph.ready(completed=[0], started=[1]) == [2]
+    assert graph.ready(completed=[0, 1], started=[2]) == []
+    assert graph.ready(completed=[0, 1, 2], started=[]) == [3]
+    assert graph.ready(completed=[0, 1, 2, 3], started=[]) == []
+
+
+def test_cycle_is_rejected():
+    first = _task("first", context=[])
+    second = _task("second", context=[first])
+    first.context = [second]
+
+    with pytest.raises(ValueError, match="cycle"):
+        TaskGraph([first, second])
+
+
+class _MeteredLLM(_fake_llm_class()):
+    """The benchmark's fake LLM, keeping the usage it reports to crewAI."""
+
+    def __init__(self, reported):
+        super().__init__(latency=0.01, response_bytes=400)
+        self.reported = reported
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None, **kwargs):
+        class Recorder:
+            def log_success_event(_, kwargs, response_obj, start_time, end_time):
+                usage = response_obj["usage"]
+                self.reported.append((usage.prompt_tokens, usage.completion_tokens))
+
+        return super().call(messages, tools, [*(callbacks or []), Recorder()], available_functions, **kwargs)
+
+
+@pytest.mark.parametrize("fan_out", [{}, {"posts": "platforms"}])
+def test_usage_counts_every_llm_call(tmp_path, fan_out):
+    reported = []
+    researcher = Agent(role="Researcher", goal="Research", backstory="Researches", llm=_MeteredLLM(reported))
+    writer = Agent(role="Writer", goal="Write", backstory="Writes", llm=_MeteredLLM(reported))
+    research = Task(name="research", description="Research {topic}", expected_output="Notes", agent=researcher)
+    posts = Task(
+        name="posts",
+        description="Write posts about {topic} for {platforms}",
+        expected_output="Posts",
+        agent=writer,
+        context=[research],
+    )
+    crew = DagCrew(
+        agents=[researcher, writer],
+        tasks=[research, posts],
+        fan_out=fan_out,
+        cache=None,
+        response_cache=None,
+        http_pool=None,
+        workspace_root=str(tmp_path),
+    )
+
+    crew.kickoff(inputs={"topic": "tea", "platforms": "Blog, Mastodon, Newsletter"})
+
+    assert len(reported) == (4 if fan_out else 2)
+    assert crew.usage_metrics.successful_requests == len(reported)
+    assert crew.usage_metrics.prompt_tokens == sum(prompt for prompt, _ in reported)
+    assert crew.usage_metrics.completion_tokens == sum(completion for _, completion in reported)
+    summary = crew.tracer.summary(TaskGraph(crew.tasks).named_dependencies())["tasks"]
+    assert sum(task["prompt_tokens"] for task in summary.values()) == crew.usage_metrics.prompt_tokens
+    assert sum(task["completion_tokens"] for task in summary.values()) == crew.usage_metrics.completion_tokens
+    assert not any(span.attributes.get("estimated") for span in crew.tracer.spans)
+
+
+def test_partial_local_output_asks_the_agent_for_the_rest(tmp_path):
+    reported, prompts, delivered = [], [], []
+
+    class PromptLLM(_MeteredLLM):
+        def call(self, messages, *args, **kwargs):
+            prompts.append(str(messages))
+            return super().call(messages, *args, **kwargs)
+
+    agent = Agent(role="Parser", goal="Parse", backstory="Parses", llm=PromptLLM(reported))
+    task = Task(
+        name="parse",
+        description="Parse {tokens}",
+        expected_output="A mapping",
+        agent=agent,
+        callback=delivered.append,
+        output_file="mapping.txt",
+    )
+    partial = PartialOutput(
+        request="Map only the characters.",
+        merge=lambda answer: f"local part\n{answer.strip()}",
+        expected_output="The characters",
+    )
+    crew = DagCrew(
+        agents=[agent],
+        tasks=[task],
+        local_outputs={"parse": lambda task, inputs: partial},
+        cache=None,
+        response_cache=None,
+        http_pool=None,
+        workspace_root=str(tmp_path),
+    )
+
+    crew.kickoff(inputs={"tokens": "x"})
+
+    assert len(prompts) == 1
+    assert "Map only the characters." in prompts[0]
+    assert "The characters" in prompts[0]
+    assert task.output.raw.startswith("local part\n")
+    assert [output.raw for output in delivered] == [task.output.raw]
+    assert (crew.run_directory / "mapping.txt").read_text(encoding="utf-8") == task.output.raw
+    assert crew.trace_summary()["tasks"]["parse"]["source"] == "partial"
+
+
+def test_test_runs_reuse_cached_completions(tmp_path):
+    reported = []
+    agent = Agent(role="Writer", goal="Write", backstory="Writes", llm=_MeteredLLM(reported))
+    task = Task(name="post", description="Write about {topic}", expected_output="A post", agent=agent)
+    response_cache = ResponseCache(str(tmp_path / "responses.sqlite3"))
+    crew = DagCrew(
+        agents=[agent],
+        tasks=[task],
+        cache=None,
+        response_cache=response_cache,
+        http_pool=None,
+        workspace_root=str(tmp_path),
+    )
+    crew._testing = True
+
+    crew.kickoff(inputs={"topic": "tea"})
+    crew.kickoff(inputs={"topic": "tea"})
+
+    assert len(reported) == 1
+    assert response_cache.stats()["hits"] == 1
+
+
+def _resume_crew(calls, outline="Outline {topic}"):
+    class CountingLLM(_fake_llm_class()):
+        def call(self, *args, **kwargs):
+            calls.append(1)
+            return super().call(*args, **kwargs)
+
+    agent = Agent(role="Writer", goal="Write", backstory="Writes", llm=CountingLLM(response_bytes=200))
+    tasks = []
+    for name, description in (("research", "Research {topic}"), ("outline", outline), ("draft", "Draft {topic}")):
+        tasks.append(Task(
+            name=name,
+            description=description,
+            expected_output=f"The {name}",
+            agent=agent,
+            context=tasks[-1:],
+            output_file=f"working/{name}.md",
+        ))
+    return DagCrew(
+        agents=[agent],
+        tasks=tasks,
+        cache=None,
+        response_cache=None,
+        http_pool=None,
+        workspace_root=None,
+        resume=True,
+    )
+
+
+def test_resume_executes_only_the_changed_task_and_its_dependents(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    first, unchanged, changed = [], [], []
+
+    original = _resume_crew(first).kickoff(inputs={"topic": "tea"})
+    resumed = _resume_crew(unchanged).kickoff(inputs={"topic": "tea"})
+    _resume_crew(changed, outline="Outline {topic} in three acts").kickoff(inputs={"topic": "tea"})
+
+    assert (len(first), len(unchanged), len(changed)) == (3, 0, 2)
+    assert resumed.raw == original.raw
+    assert (tmp_path / "working" / "research.md.fingerprint").exists()
@@ -0,0 +1,116 @@
+import json
+
+import pytest
+from crewai import LLM, Agent, Task
+from crewai.tools import BaseTool
+from pydantic import BaseModel
+
+from crewkit.benchmark import _fake_llm_class
+from crewkit.scheduler import DagCrew
+from crewkit.snapshot import SCHEMA_VERSION, load, loads, save, snapshot
+
+
+class Notes(BaseModel):
+    points: list
+
+
+class LookupTool(BaseTool):
+    name: str = "Lookup"
+    description: str = "Looks things up"
+    source: str = "encyclopedia"
+
+    def _run(self, query: str) -> str:
+        return f"{self.source}: {query}"
+
+
+def _local_output(task, inputs):
+    return None
+
+
+def runtime_settings():
+    return {"local_outputs": {"outline": _local_output}}
+
+
+def _crew(**settings):
+    researcher = Agent(
+        role="{topic} Researcher",
+        goal="Research {topic}",
+        backstory="Researches",
+        llm=LLM(model="gpt-4o-mini", temperature=0.2),
+        tools=[LookupTool(source="archive")],
+        max_iter=5,
+    )
+    writer = Agent(role="Writer", goal="Write", backstory="Writes", llm=LLM(model="gpt-4o-mini"))
+    research = Task(
+        name="research",
+        description="Research {topic}",
+        expected_output="Notes",
+        agent=researcher,
+        output_pydantic=Notes,
+    )
+    outline = Task(name="outline", description="Outline {topic}", expected_output="An outline", agent=writer,
+                   context=[research], output_file="outline_{topic}.md")
+    post = Task(name="post", description="Write about {topic}", expected_output="A post", agent=writer,
+                context=[research, outline], max_retries=1)
+    return DagCrew(
+        agents=[researcher, writer],
+        tasks=[research, outline, post],
+        name="blog",
+        context_budgets={"post": 2000},
+        fan_out={"post": "platforms"},
+        http_pool=None,
+        **settings,
+    )
+
+
+def test_save_then_load_gives_an_equivalent_crew(tmp_path):
+    crew = _crew()
+    path = save(crew, tmp_path / "blog.json")
+
+    loaded = load(path, http_pool=None)
+
+    assert type(loaded) is DagCrew
+    assert snapshot(loaded) == snapshot(crew)
+    assert loaded.context_budgets == {"post": 2000} and loaded.fan_out == {"post": "platforms"}
+    research, outline, post = loaded.tasks
+    assert post.context == [research, outline]
+    assert outline.agent is post.agent is loaded.agents[1]
+    assert research.output_pydantic is Notes
+    assert loaded.agents[0].llm.temperature == 0.2
+    assert loaded.agents[0].tools[0].source == "archive"
+    assert loaded.agents[0].max_iter == 5
+    assert json.loads(path.read_text())["schema"] == SCHEMA_VERSION
+
+
+def test_loaded_crew_runs_like_the_original(tmp_path):
+    outputs = []
+    for crew in (_crew(), loads(json.dumps(snapshot(_crew())), http_pool=None)):
+        for agent in crew.agents:
+            agent.llm = _fake_llm_class()(response_bytes=80)
+        crew.cache = crew.response_cache = None
+        crew.workspace_root = str(tmp_path)
+        crew.tasks[0].output_pydantic = None
+        crew.kickoff(inputs={"topic": "tea", "platforms": "blog"})
+        outputs.append([task.output.raw for task in crew.tasks])
+
+    assert outputs[0] == outputs[1]
+
+
+def test_runtime_settings_come_from_the_factory():
+    crew = _crew(local_outputs={"outline": _local_output})
+
+    with pytest.raises(ValueError, match="local_outputs"):
+        snapshot(crew)
+
+    data = snapshot(crew, runtime="test_snapshot:runtime_settings")
+    assert loads(json.dumps(data), http_pool=None).local_outputs == {"outline": _local_output}
+
+
+def test_unsnapshottable_crews_are_rejected():
+    crew = _crew()
+    crew.tasks[0].callback = print
+    with pytest.raises(ValueError, match="callback"):
+        snapshot(crew)
+
+    with pytest.raises(ValueError, match="schema"):
+        loads(json.dumps({**snapshot(_crew()), "schema": SCHEMA_VERSION + 1}))
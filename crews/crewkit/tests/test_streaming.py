@@ -0,0 +1,70 @@
+import threading
+
+from crewai import Agent, Task
+
+from crewkit.benchmark import _fake_llm_class
+from crewkit.scheduler import DagCrew
+from crewkit.streaming import run_events
+
+
+def _crew(tmp_path, calls, tasks=3):
+    class CountingLLM(_fake_llm_class()):
+        def call(self, *args, **kwargs):
+            calls.append(1)
+            return super().call(*args, **kwargs)
+
+    agent = Agent(role="Writer", goal="Write", backstory="Writes", llm=CountingLLM(latency=0.05, response_bytes=200))
+    chain = []
+    for step in range(tasks):
+        chain.append(Task(
+            name=f"step{step}",
+            description=f"Write part {step} about {{topic}}",
+            expected_output="A part",
+            agent=agent,
+            context=chain[-1:],
+        ))
+    return DagCrew(
+        agents=[agent],
+        tasks=chain,
+        cache=None,
+        response_cache=None,
+        http_pool=None,
+        workspace_root=str(tmp_path),
+    )
+
+
+def _join_runs():
+    for thread in threading.enumerate():
+        if thread.name == "crew-stream":
+            thread.join(timeout=10)
+
+
+def test_events_arrive_in_order_through_a_bounded_queue(tmp_path):
+    crew = _crew(tmp_path, [], tasks=2)
+
+    events = list(run_events(crew, {"topic": "tea"}, max_pending=1))
+
+    assert [event["event"] for event in events] == [
+        "task_started", "token", "task_finished",
+        "task_started", "token", "task_finished",
+        "crew_finished",
+    ]
+    assert [event["task"] for event in events if event["event"] == "task_finished"] == ["step0", "step1"]
+    assert events[-1]["output"] == crew.tasks[-1].output.raw
+    assert crew.listeners == []
+
+
+def test_closing_the_stream_cancels_the_run_at_the_next_task(tmp_path):
+    calls = []
+    crew = _crew(tmp_path, calls, tasks=4)
+
+    events = run_events(crew, {"topic": "tea"})
+    for event in events:
+        if event["event"] == "task_finished":
+            break
+    events.close()
+    _join_runs()
+
+    assert crew.listeners == []
+    assert 1 <= len(calls) <= 2
+    assert crew.tasks[-1].output is None
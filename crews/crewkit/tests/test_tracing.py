@@ -0,0 +1,101 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from crewkit.tracing import Span, Tracer
+
+
+def _span(id, name, kind, start, end, parent=None, **attributes):
+    return Span(id=id, name=name, kind=kind, start=start, end=end, parent=parent, attributes=attributes)
+
+
+@pytest.fixture
+def tracer():
+    tracer = Tracer()
+    tracer.spans = [
+        _span(1, "crew", "crew", 0.0, 5.0),
+        _span(2, "a", "task", 0.0, 1.0, parent=1),
+        _span(3, "gpt-4o-mini", "llm", 0.1, 0.9, parent=2, prompt_tokens=10, completion_tokens=5, cost_usd=0.5),
+        _span(4, "b", "task", 1.0, 4.0, parent=1),
+        _span(5, "gpt-4o-mini", "llm", 1.0, 2.0, parent=4, prompt_tokens=20, completion_tokens=8, cost_usd=None),
+        _span(6, "search", "tool", 2.0, 3.0, parent=4),
+        _span(7, "gpt-4o-mini", "llm", 3.0, 4.0, parent=4, prompt_tokens=30, completion_tokens=9, cost_usd=0.25),
+        _span(8, "c", "task", 1.0, 2.0, parent=1, source="cache"),
+        _span(9, "d", "task", 4.0, 5.0, parent=1),
+    ]
+    return tracer
+
+
+DEPENDENCIES = {"a": [], "b": ["a"], "c": ["a"], "d": ["b", "c"]}
+
+
+def test_summary_totals_each_task_and_follows_the_critical_path(tracer):
+    summary = tracer.summary(DEPENDENCIES)
+
+    assert summary["wall_seconds"] == 5.0
+    assert summary["critical_path"] == ["a", "b", "d"]
+    assert summary["critical_path_seconds"] == 5.0
+    assert summary["tasks"]["a"] == {
+        "seconds": 1.0,
+        "llm_seconds": pytest.approx(0.8),
+        "llm_calls": 1,
+        "tool_calls": 0,
+        "prompt_tokens": 10,
+        "completion_tokens": 5,
+        "cost_usd": 0.5,
+        "source": "executed",
+    }
+    assert summary["tasks"]["b"]["llm_calls"] == 2
+    assert summary["tasks"]["b"]["tool_calls"] == 1
+    assert summary["tasks"]["b"]["prompt_tokens"] == 50
+    assert summary["tasks"]["b"]["cost_usd"] is None
+    assert summary["tasks"]["c"]["source"] == "cache"
+
+
+def test_export_writes_uniquely_named_trace_files(tracer, tmp_path):
+    tracer.directory = tmp_path
+
+    first = tracer.export("crew", DEPENDENCIES)
+    second = tracer.export("crew", DEPENDENCIES)
+
+    assert first != second
+    lines = first.with_suffix(".jsonl").read_text().splitlines()
+    assert [json.loads(line)["id"] for line in lines] == list(range(1, 10))
+    folded = dict(line.rsplit(" ", 1) for line in first.with_suffix(".folded").read_text().splitlines())
+    assert folded["crew:crew;task:b;tool:search"] == "1000000"
+    assert folded["crew:crew;task:b;llm:gpt-4o-mini"] == "2000000"
+    # b spent all its time in calls, so it has no self time of its own
+    assert "crew:crew;task:b" not in folded
+    assert json.loads(first.with_suffix(".summary.json").read_text())["critical_path"] == ["a", "b", "d"]
+    assert len(list(tmp_path.iterdir())) == 6
+
+
+def test_spans_nest_per_thread_and_record_errors():
+    tracer = Tracer()
+
+    with tracer.span("crew", "crew") as crew:
+        with tracer.span("task", "task") as task:
+            pass
+        with pytest.raises(ValueError):
+            with tracer.span("broken", "task"):
+                raise ValueError("boom")
+
+    assert task.parent == crew.id
+    assert tracer.spans[-1].parent == crew.id
+    assert tracer.spans[-1].attributes["error"] == "ValueError('boom')"
+    assert all(span.end is not None for span in tracer.spans)
+
+
+def test_unmetered_llm_calls_are_estimated():
+    tracer = Tracer()
+    agent = SimpleNamespace(role="Writer")
+    llm = SimpleNamespace(model="gpt-4o-mini")
+
+    call = tracer.wrap_llm(agent, llm, lambda messages, **kwargs: "x" * 40)
+    assert call("y" * 80) == "x" * 40
+
+    span = tracer.spans[0]
+    assert (span.kind, span.attributes["agent"]) == ("llm", "Writer")
+    assert span.attributes["estimated"] is True
+    assert (span.attributes["prompt_tokens"], span.attributes["completion_tokens"]) == (20, 10)
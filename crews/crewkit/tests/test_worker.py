@@ -0,0 +1,97 @@
+import threading
+
+import pytest
+
+from crewkit.worker import COMPLETED, FAILED, QUEUED, RUNNING, JobQueue
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return JobQueue(str(tmp_path / "jobs.sqlite3"))
+
+
+def test_claims_the_oldest_queued_job(queue):
+    first = queue.submit("writer", {"topic": "a"})
+    second = queue.submit("writer", {"topic": "b"})
+
+    job = queue.claim(["writer"], worker=7)
+
+    assert job == {"id": first, "crew": "writer", "inputs": {"topic": "a"}}
+    claimed = queue.get(first)
+    assert claimed["status"] == RUNNING
+    assert claimed["worker"] == 7
+    assert claimed["started"] is not None
+    assert queue.get(second)["status"] == QUEUED
+
+
+def test_claims_only_the_requested_crews(queue):
+    queue.submit("writer", {})
+    wordpress = queue.submit("wordpress", {})
+
+    assert queue.claim(["wordpress", "other"], worker=1)["id"] == wordpress
+    assert queue.claim(["wordpress"], worker=1) is None
+
+
+def test_claim_returns_none_when_the_queue_is_empty(queue):
+    assert queue.claim(["writer"], worker=1) is None
+
+
+def test_each_job_is_claimed_exactly_once_across_connections(tmp_path):
+    path = str(tmp_path / "jobs.sqlite3")
+    submitted = {JobQueue(path).submit("writer", {"n": n}) for n in range(200)}
+    claims = {worker: [] for worker in range(4)}
+
+    def work(worker):
+        queue = JobQueue(path)
+        while True:
+            job = queue.claim(["writer"], worker)
+            if job is None:
+                return
+            claims[worker].append(job["id"])
+
+    threads = [threading.Thread(target=work, args=(worker,)) for worker in claims]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    claimed = [job_id for ids in claims.values() for job_id in ids]
+    assert sorted(claimed) == sorted(submitted)
+
+
+def test_finished_jobs_are_not_claimed_again(queue):
+    done = queue.submit("writer", {})
+    broken = queue.submit("writer", {})
+    queue.claim(["writer"], worker=1)
+    queue.claim(["writer"], worker=1)
+
+    queue.complete(done, {"raw": "story"})
+    queue.fail(broken, "boom")
+
+    assert queue.get(done)["status"] == COMPLETED
+    assert queue.get(done)["result"] == {"raw": "story"}
+    assert queue.get(broken)["status"] == FAILED
+    assert queue.get(broken)["error"] == "boom"
+    assert queue.claim(["writer"], worker=2) is None
+    assert queue.wait(done, timeout=1)["status"] == COMPLETED
+
+
+def test_fail_abandoned_fails_only_the_exited_workers_running_jobs(queue):
+    lost = queue.submit("writer", {})
+    other = queue.submit("writer", {})
+    waiting = queue.submit("writer", {})
+    queue.claim(["writer"], worker=1)
+    queue.claim(["writer"], worker=2)
+
+    assert queue.fail_abandoned(1) == 1
+
+    assert queue.get(lost)["status"] == FAILED
+    assert queue.get(other)["status"] == RUNNING
+    assert queue.get(waiting)["status"] == QUEUED
+
+
+def test_wait_times_out_on_a_job_still_queued(queue):
+    job_id = queue.submit("writer", {})
+
+    with pytest.raises(TimeoutError):
+        queue.wait(job_id, timeout=0.05, interval=0.01)
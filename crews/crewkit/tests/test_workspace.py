@@ -0,0 +1,90 @@
+import json
+import os
+import time
+
+import pytest
+from crewai import Task
+
+import crewkit.cache
+from crewkit.workspace import MARKER, Workspace, collect_from_env
+
+
+def _task(output_file):
+    return Task(description="Write", expected_output="Text", output_file=output_file)
+
+
+def _crew(*tasks):
+    return type("Crew", (), {"tasks": list(tasks)})()
+
+
+def _run(root, name, started, finished=None, pid=None):
+    directory = root / name
+    directory.mkdir(parents=True)
+    marker = {"pid": pid, "started": started, "finished": finished}
+    (directory / MARKER).write_text(json.dumps(marker))
+    return directory
+
+
+def test_apply_relocates_relative_output_files_once_per_run(tmp_path):
+    relative, absolute = _task("out/post.md"), _task("fixed.md")
+    # crewAI strips a leading slash from configured paths, so set it afterwards
+    absolute.output_file = str(tmp_path / "fixed.md")
+    crew = _crew(relative, absolute)
+
+    Workspace(tmp_path / "first").apply(crew)
+    Workspace(tmp_path / "second").apply(crew)
+
+    assert relative.output_file == str(tmp_path / "second" / "out" / "post.md")
+    assert absolute.output_file == str(tmp_path / "fixed.md")
+
+
+def test_output_files_are_written_atomically(tmp_path, monkeypatch):
+    task = _task("post.md")
+    Workspace(tmp_path).apply(_crew(task))
+    task._save_file("first draft")
+
+    def crash(source, target):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(crewkit.cache.os, "replace", crash)
+    with pytest.raises(OSError):
+        task._save_file("second draft")
+
+    assert (tmp_path / "post.md").read_text(encoding="utf-8") == "first draft"
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["post.md"]
+
+
+def test_create_marks_the_run_and_close_finishes_it(tmp_path):
+    workspace = Workspace.create(str(tmp_path), run_id="run")
+    marker = json.loads((tmp_path / "run" / MARKER).read_text())
+    assert marker["pid"] == os.getpid() and marker["finished"] is None
+
+    workspace.close()
+
+    assert json.loads((tmp_path / "run" / MARKER).read_text())["finished"] is not None
+    assert Workspace.latest(str(tmp_path)).directory == workspace.directory
+
+
+def test_collect_keeps_the_newest_finished_runs_and_live_ones(tmp_path):
+    now = time.time()
+    oldest = _run(tmp_path, "oldest", started=now - 50, finished=now - 49)
+    running = _run(tmp_path, "running", started=now - 40, pid=os.getpid())
+    crashed = _run(tmp_path, "crashed", started=now - 30, pid=2 ** 22 + 1)
+    newer = _run(tmp_path, "newer", started=now - 20, finished=now - 19)
+    newest = _run(tmp_path, "newest", started=now - 10, finished=now - 9)
+
+    removed = Workspace.collect(str(tmp_path), keep=2, max_age=None)
+
+    assert sorted(removed) == sorted([oldest, crashed])
+    assert [path.exists() for path in (running, newer, newest)] == [True, True, True]
+
+
+def test_collect_drops_runs_past_the_maximum_age(tmp_path, monkeypatch):
+    now = time.time()
+    stale = _run(tmp_path, "stale", started=now - 7200, finished=now - 7100)
+    fresh = _run(tmp_path, "fresh", started=now - 60, finished=now - 50)
+    monkeypatch.setenv("CREW_WORKSPACE_KEEP", "10")
+    monkeypatch.setenv("CREW_WORKSPACE_MAX_AGE", "3600")
+
+    assert collect_from_env(str(tmp_path)) == [stale]
+    assert fresh.exists()
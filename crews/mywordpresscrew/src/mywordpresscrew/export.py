@@ -3,6 +3,7 @@ sys.path.append(".")
 import yaml
 from crewai import Crew
 
+from crewkit.snapshot import save
 from mywordpresscrew.crew import Mywordpresscrew
 
 def export_crew_to_yaml(crew: Crew, filename: str):
@@ -30,7 +31,13 @@ def export_crew_to_yaml(crew: Crew, filename: str):
     with open(filename, "w") as yaml_file:
         yaml.dump(crew_data, yaml_file, indent=4)
 
+def export_crew_snapshot(crew: Crew, filename: str):
+    """Exports a Crew object to a snapshot that crewkit.snapshot.load() turns back into a runnable crew."""
+    save(crew, filename)
+
 if __name__ == "__main__":
     my_crew = Mywordpresscrew().crew()
     export_crew_to_yaml(my_crew, "my_crew.yaml")
-    print("Crew exported to my_crew.yaml")
\ No newline at end of file
+    print("Crew exported to my_crew.yaml")
+    export_crew_snapshot(my_crew, "my_crew.json")
+    print("Crew snapshot exported to my_crew.json")
\ No newline at end of file
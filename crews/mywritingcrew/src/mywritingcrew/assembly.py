@@ -0,0 +1,297 @@
+import html
+import os
+import re
+import shutil
+import threading
+import uuid
+import zipfile
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+
+CHUNK_SIZE = 1 << 20
+
+_HEADING = re.compile(r"^(#{1,6})\s+(.*)$")
+_BULLET = re.compile(r"^\s*[-*+]\s+(.*)$")
+_NUMBERED = re.compile(r"^\s*\d+[.)]\s+(.*)$")
+_STRONG = re.compile(r"\*\*(.+?)\*\*")
+_EMPHASIS = re.compile(r"(?<!\*)\*(?!\*)(.+?)(?<!\*)\*(?!\*)")
+_CODE = re.compile(r"`([^`]+)`")
+
+
+def copy_file(source: Path, target: BinaryIO) -> None:
+    """Append a file to an open binary file, in the kernel where possible."""
+    target.flush()
+    with open(source, "rb") as handle:
+        offset = 0
+        try:
+            size = os.fstat(handle.fileno()).st_size
+            while offset < size:
+                sent = os.sendfile(target.fileno(), handle.fileno(), offset, min(size - offset, CHUNK_SIZE))
+                if sent == 0:
+                    break
+                offset += sent
+        except (AttributeError, OSError):
+            # No sendfile for this platform or file pair; copy whatever was not sent yet
+            handle.seek(offset)
+            shutil.copyfileobj(handle, target, CHUNK_SIZE)
+
+
+def _inline(text: str) -> str:
+    text = html.escape(text, quote=False)
+    text = _CODE.sub(r"<code>\1</code>", text)
+    text = _STRONG.sub(r"<strong>\1</strong>", text)
+    return _EMPHASIS.sub(r"<em>\1</em>", text)
+
+
+def markdown_to_html(lines: Iterable[str]) -> Iterator[str]:
+    """Convert markdown to HTML one line at a time.
+
+    Covers what the writing crew produces: headings, paragraphs, bullet and
+    numbered lists, code fences and inline emphasis. Memory use is bounded by
+    the longest paragraph rather than the document.
+    """
+    paragraph: List[str] = []
+    open_list: Optional[str] = None
+    in_code = False
+
+    def close_blocks() -> Iterator[str]:
+        nonlocal open_list
+        if paragraph:
+            yield f"<p>{_inline(' '.join(paragraph))}</p>\n"
+            paragraph.clear()
+        if open_list:
+            yield f"</{open_list}>\n"
+            open_list = None
+
+    for line in lines:
+        line = line.rstrip("\n")
+        if line.lstrip().startswith("```"):
+            if in_code:
+                yield "</code></pre>\n"
+            else:
+                yield from close_blocks()
+                yield "<pre><code>"
+            in_code = not in_code
+            continue
+        if in_code:
+            yield html.escape(line, quote=False) + "\n"
+            continue
+
+        heading = _HEADING.match(line)
+        item = _BULLET.match(line) or _NUMBERED.match(line)
+        if not line.strip():
+            yield from close_blocks()
+        elif heading:
+            yield from close_blocks()
+            level = len(heading.group(1))
+            yield f"<h{level}>{_inline(heading.group(2).strip())}</h{level}>\n"
+        elif item:
+            kind = "ul" if _BULLET.match(line) else "ol"
+            if paragraph or open_list != kind:
+                yield from close_blocks()
+                yield f"<{kind}>\n"
+                open_list = kind
+            yield f"<li>{_inline(item.group(1))}</li>\n"
+        else:
+            if open_list:
+                yield from close_blocks()
+            paragraph.append(line.strip())
+
+    if in_code:
+        yield "</code></pre>\n"
+    yield from close_blocks()
+
+
+class MarkdownWriter:
+    """Concatenates sections into a single markdown file."""
+    suffix = ".md"
+
+    def __init__(self, path: Path, title: str):
+        self.path = path
+        self._file = open(path, "wb")
+
+    def section(self, title: str, heading: str, source: Optional[Path]) -> None:
+        self._file.write(heading.encode("utf-8"))
+        if source is not None:
+            copy_file(source, self._file)
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class HtmlWriter:
+    """Renders sections into a single self-contained HTML page."""
+    suffix = ".html"
+
+    def __init__(self, path: Path, title: str):
+        self.path = path
+        self._file = open(path, "w", encoding="utf-8")
+        self._file.write(
+            "<!DOCTYPE html>\n<html>\n<head>\n<meta charset=\"utf-8\">\n"
+            f"<title>{html.escape(title)}</title>\n"
+            "<style>body{max-width:42em;margin:2em auto;padding:0 1em;"
+            "font-family:Georgia,serif;line-height:1.6}</style>\n</head>\n<body>\n"
+        )
+
+    def section(self, title: str, heading: str, source: Optional[Path]) -> None:
+        self._file.write("<section>\n")
+        for chunk in markdown_to_html(heading.splitlines()):
+            self._file.write(chunk)
+        if source is not None:
+            with open(source, encoding="utf-8") as handle:
+                for chunk in markdown_to_html(handle):
+                    self._file.write(chunk)
+        self._file.write("</section>\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.write("</body>\n</html>\n")
+        self._file.close()
+
+
+class EpubWriter:
+    """Writes each section as a chapter of an EPUB 3 book."""
+    suffix = ".epub"
+
+    def __init__(self, path: Path, title: str):
+        self.path = path
+        self.title = title
+        self._chapters: List[Tuple[str, str]] = []
+        self._zip = zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED)
+        # The mimetype entry must come first and be stored uncompressed
+        self._zip.writestr("mimetype", "application/epub+zip", compress_type=zipfile.ZIP_STORED)
+        self._zip.writestr(
+            "META-INF/container.xml",
+            "<?xml version=\"1.0\"?>\n"
+            "<container version=\"1.0\" xmlns=\"urn:oasis:names:tc:opendocument:xmlns:container\">\n"
+            "<rootfiles><rootfile full-path=\"OEBPS/content.opf\" media-type=\"application/oebps-package+xml\"/>"
+            "</rootfiles>\n</container>\n",
+        )
+
+    def section(self, title: str, heading: str, source: Optional[Path]) -> None:
+        name = f"chapter{len(self._chapters) + 1:03d}.xhtml"
+        self._chapters.append((name, title))
+        with self._zip.open(f"OEBPS/{name}", "w") as chapter:
+            chapter.write(self._page_start(title).encode("utf-8"))
+            for chunk in markdown_to_html(heading.splitlines()):
+                chapter.write(chunk.encode("utf-8"))
+            if source is not None:
+                with open(source, encoding="utf-8") as handle:
+                    for chunk in markdown_to_html(handle):
+                        chapter.write(chunk.encode("utf-8"))
+            chapter.write(b"</body>\n</html>\n")
+
+    @staticmethod
+    def _page_start(title: str) -> str:
+        return (
+            "<?xml version=\"1.0\" encoding=\"utf-8\"?>\n<!DOCTYPE html>\n"
+            "<html xmlns=\"http://www.w3.org/1999/xhtml\" xmlns:epub=\"http://www.idpf.org/2007/ops\">\n"
+            f"<head><title>{html.escape(title)}</title></head>\n<body>\n"
+        )
+
+    def close(self) -> None:
+        items = "".join(
+            f"<item id=\"c{index}\" href=\"{name}\" media-type=\"application/xhtml+xml\"/>\n"
+            for index, (name, _) in enumerate(self._chapters)
+        )
+        spine = "".join(f"<itemref idref=\"c{index}\"/>\n" for index in range(len(self._chapters)))
+        self._zip.writestr(
+            "OEBPS/content.opf",
+            "<?xml version=\"1.0\" encoding=\"utf-8\"?>\n"
+            "<package xmlns=\"http://www.idpf.org/2007/opf\" version=\"3.0\" unique-identifier=\"id\">\n"
+            "<metadata xmlns:dc=\"http://purl.org/dc/elements/1.1/\">\n"
+            f"<dc:identifier id=\"id\">urn:uuid:{uuid.uuid4()}</dc:identifier>\n"
+            f"<dc:title>{html.escape(self.title)}</dc:title>\n<dc:language>en</dc:language>\n"
+            "</metadata>\n<manifest>\n"
+            "<item id=\"nav\" href=\"nav.xhtml\" media-type=\"application/xhtml+xml\" properties=\"nav\"/>\n"
+            f"{items}</manifest>\n<spine>\n{spine}</spine>\n</package>\n",
+        )
+        links = "".join(
+            f"<li><a href=\"{name}\">{html.escape(title)}</a></li>\n" for name, title in self._chapters
+        )
+        self._zip.writestr(
+            "OEBPS/nav.xhtml",
+            self._page_start(self.title) + f"<nav epub:type=\"toc\"><ol>\n{links}</ol></nav>\n</body>\n</html>\n",
+        )
+        self._zip.close()
+
+
+FORMATS = {
+    "markdown": MarkdownWriter,
+    "html": HtmlWriter,
+    "epub": EpubWriter,
+}
+
+
+class StoryAssembler:
+    """Builds the final story from stage artifacts as soon as each one is ready.
+
+    Sections are ``(title, heading, artifact)`` tuples emitted strictly in
+    order: a section goes out once its artifact's task has finished and every
+    section before it has been written, so readers of the output files get
+    the narrative while later stages are still running. Use ``on_event`` as a
+    ``DagCrew`` listener and call ``finish`` after the run.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        title: str,
+        sections: List[Tuple[str, str, Optional[str]]],
+        formats: Iterable[str] = ("markdown",),
+        stem: str = "final_story",
+    ):
+        unknown = set(formats) - set(FORMATS)
+        if unknown:
+            raise ValueError(f"Unknown story formats {sorted(unknown)}; choose from {', '.join(FORMATS)}")
+        self.directory = Path(directory)
+        self.sections = [
+            (section_title, heading, self.directory / artifact if artifact else None)
+            for section_title, heading, artifact in sections
+        ]
+        self.paths = {
+            name: self.directory / f"{stem}{FORMATS[name].suffix}" for name in formats
+        }
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._writers = [FORMATS[name](path, title) for name, path in self.paths.items()]
+        self._ready = set()
+        self._next = 0
+        self._closed = False
+        self._lock = threading.Lock()
+        self._advance()
+
+    def on_event(self, event: str, payload: Dict[str, Any]) -> None:
+        """Emit every section that became ready when a task finished."""
+        if event != "task_finished" or not payload.get("output_file"):
+            return
+        with self._lock:
+            self._ready.add(Path(payload["output_file"]).resolve())
+            self._advance()
+
+    def finish(self) -> Dict[str, Path]:
+        """Emit the remaining sections from whatever artifacts exist, then close the outputs."""
+        with self._lock:
+            self._ready.update(source.resolve() for _, _, source in self.sections if source is not None)
+            self._advance()
+        self.close()
+        return self.paths
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            for writer in self._writers:
+                writer.close()
+
+    def _advance(self) -> None:
+        while not self._closed and self._next < len(self.sections):
+            title, heading, source = self.sections[self._next]
+            if source is not None and source.resolve() not in self._ready:
+                return
+            if source is not None and not source.exists():
+                source = None
+            for writer in self._writers:
+                writer.section(title, heading, source)
+            self._next += 1
@@ -1,5 +1,33 @@
+import os
+from typing import Any, Dict
+
 from crewai import Agent, Crew, Process, Task
-from crewai.project import CrewBase, agent, crew, task
+from crewai.project import agent, crew, task
+
+from crewkit.logs import verbose_enabled
+from crewkit.project import CrewBase
+from crewkit.scheduler import DagCrew
+from mywritingcrew.library import StoryLibrary
+from mywritingcrew.tokens import local_token_mapping
+
+def runtime_settings() -> Dict[str, Any]:
+    """DagCrew settings built at run time, which crew snapshots cannot hold.
+
+    Character and world building get the most relevant entries from the
+    story library, and the token mapping is built locally from the token
+    schema unless LOCAL_TOKEN_PARSER=off.
+    """
+    library = StoryLibrary.shared()
+    context_sources = {}
+    if library is not None:
+        context_sources = {
+            'create_characters_task': library.retriever(['character']),
+            'build_world_task': library.retriever(['setting'])
+        }
+    local_outputs = {}
+    if os.getenv('LOCAL_TOKEN_PARSER', 'on').lower() not in ('0', 'off', 'false', 'no'):
+        local_outputs = {'parse_input_task': local_token_mapping}
+    return {'context_sources': context_sources, 'local_outputs': local_outputs}
 
 @CrewBase
 class Mywritingcrew():
@@ -13,77 +41,77 @@ class Mywritingcrew():
     def token_parser(self) -> Agent:
         return Agent(
             config=self.agents_config['token_parser'],
-            verbose=True
+            verbose=verbose_enabled()
         )
 
     @agent
     def story_architect(self) -> Agent:
         return Agent(
             config=self.agents_config['story_architect'],
-            verbose=True
+            verbose=verbose_enabled()
         )
 
     @agent
     def character_developer(self) -> Agent:
         return Agent(
             config=self.agents_config['character_developer'],
-            verbose=True
+            verbose=verbose_enabled()
         )
 
     @agent
     def world_builder(self) -> Agent:
         return Agent(
             config=self.agents_config['world_builder'],
-            verbose=True
+            verbose=verbose_enabled()
         )
 
     @agent
     def plot_weaver(self) -> Agent:
         return Agent(
             config=self.agents_config['plot_weaver'],
-            verbose=True
+            verbose=verbose_enabled()
         )
 
     @agent
     def dialogue_specialist(self) -> Agent:
         return Agent(
             config=self.agents_config['dialogue_specialist'],
-            verbose=True
+            verbose=verbose_enabled()
         )
 
     @agent
     def theme_analyst(self) -> Agent:
         return Agent(
             config=self.agents_config['theme_analyst'],
-            verbose=True
+            verbose=verbose_enabled()
         )
 
     @agent
     def writing_stylist(self) -> Agent:
         return Agent(
             config=self.agents_config['writing_stylist'],
-            verbose=True
+            verbose=verbose_enabled()
         )
 
     @agent
     def continuity_manager(self) -> Agent:
         return Agent(
             config=self.agents_config['continuity_manager'],
-            verbose=True
+            verbose=verbose_enabled()
         )
 
     @agent
     def quality_assessor(self) -> Agent:
         return Agent(
             config=self.agents_config['quality_assessor'],
-            verbose=True
+            verbose=verbose_enabled()
         )
 
     @agent
     def story_librarian(self) -> Agent:
         return Agent(
             config=self.agents_config['story_librarian'],
-            verbose=True
+            verbose=verbose_enabled()
         )
 
     # Task definitions with dependencies
@@ -99,7 +127,7 @@ class Mywritingcrew():
         return Task(
             config=self.tasks_config['design_structure_task'],
             output_file='working/02_story_structure.md',
-            context=lambda: self.parse_input_task.output
+            context=[self.parse_input_task()]
         )
 
     @task
@@ -107,9 +135,9 @@ class Mywritingcrew():
         return Task(
             config=self.tasks_config['create_characters_task'],
             output_file='working/03_character_profiles.md',
-            context=lambda: [
-                self.parse_input_task.output,
-                self.design_structure_task.output
+            context=[
+                self.parse_input_task(),
+                self.design_structure_task()
             ]
         )
 
@@ -118,10 +146,10 @@ class Mywritingcrew():
         return Task(
             config=self.tasks_config['build_world_task'],
             output_file='working/04_world_building.md',
-            context=lambda: [
-                self.parse_input_task.output,
-                self.design_structure_task.output,
-                self.create_characters_task.output
+            context=[
+                self.parse_input_task(),
+                self.design_structure_task(),
+                self.create_characters_task()
             ]
         )
 
@@ -130,10 +158,10 @@ class Mywritingcrew():
         return Task(
             config=self.tasks_config['develop_scenes_task'],
             output_file='working/05_scene_sequence.md',
-            context=lambda: [
-                self.design_structure_task.output,
-                self.create_characters_task.output,
-                self.build_world_task.output
+            context=[
+                self.design_structure_task(),
+                self.create_characters_task(),
+                self.build_world_task()
             ]
         )
 
@@ -142,9 +170,9 @@ class Mywritingcrew():
         return Task(
             config=self.tasks_config['create_dialogue_task'],
             output_file='working/06_dialogue_scripts.md',
-            context=lambda: [
-                self.create_characters_task.output,
-                self.develop_scenes_task.output
+            context=[
+                self.create_characters_task(),
+                self.develop_scenes_task()
             ]
         )
 
@@ -153,10 +181,10 @@ class Mywritingcrew():
         return Task(
             config=self.tasks_config['analyze_themes_task'],
             output_file='working/07_theme_analysis.md',
-            context=lambda: [
-                self.parse_input_task.output,
-                self.design_structure_task.output,
-                self.develop_scenes_task.output
+            context=[
+                self.parse_input_task(),
+                self.design_structure_task(),
+                self.develop_scenes_task()
             ]
         )
 
@@ -165,10 +193,10 @@ class Mywritingcrew():
         return Task(
             config=self.tasks_config['refine_prose_task'],
             output_file='working/08_refined_narrative.md',
-            context=lambda: [
-                self.develop_scenes_task.output,
-                self.create_dialogue_task.output,
-                self.analyze_themes_task.output
+            context=[
+                self.develop_scenes_task(),
+                self.create_dialogue_task(),
+                self.analyze_themes_task()
             ]
         )
 
@@ -177,12 +205,12 @@ class Mywritingcrew():
         return Task(
             config=self.tasks_config['verify_consistency_task'],
             output_file='working/09_consistency_report.md',
-            context=lambda: [
-                self.design_structure_task.output,
-                self.create_characters_task.output,
-                self.build_world_task.output,
-                self.develop_scenes_task.output,
-                self.refine_prose_task.output
+            context=[
+                self.design_structure_task(),
+                self.create_characters_task(),
+                self.build_world_task(),
+                self.develop_scenes_task(),
+                self.refine_prose_task()
             ]
         )
 
@@ -191,9 +219,9 @@ class Mywritingcrew():
         return Task(
             config=self.tasks_config['assess_quality_task'],
             output_file='working/10_quality_assessment.md',
-            context=lambda: [
-                self.refine_prose_task.output,
-                self.verify_consistency_task.output
+            context=[
+                self.refine_prose_task(),
+                self.verify_consistency_task()
             ]
         )
 
@@ -202,22 +230,38 @@ class Mywritingcrew():
         return Task(
             config=self.tasks_config['update_library_task'],
             output_file='working/11_library_update.md',
-            context=lambda: [
-                self.design_structure_task.output,
-                self.create_characters_task.output,
-                self.build_world_task.output,
-                self.develop_scenes_task.output,
-                self.refine_prose_task.output,
-                self.assess_quality_task.output
+            context=[
+                self.design_structure_task(),
+                self.create_characters_task(),
+                self.build_world_task(),
+                self.develop_scenes_task(),
+                self.refine_prose_task(),
+                self.assess_quality_task()
             ]
         )
 
     @crew
     def crew(self) -> Crew:
-        """Creates the AI Novelist crew for story generation"""
-        return Crew(
+        """Creates the AI Novelist crew for story generation.
+
+        Tasks run as a dependency graph built from their context, so stages
+        that do not depend on each other execute concurrently. The fan-in
+        review stages receive their upstream outputs within a token budget,
+        and character and world building get the most relevant entries from
+        the story library.
+
+        The token mapping is built locally from the token schema; the token
+        parser agent only runs when some tokens do not fit the schema. Set
+        LOCAL_TOKEN_PARSER=off to always use the agent.
+        """
+        return DagCrew(
             agents=self.agents,
             tasks=self.tasks,
             process=Process.sequential,
-            verbose=True
+            context_budgets={
+                'verify_consistency_task': 8000,
+                'update_library_task': 4000
+            },
+            verbose=verbose_enabled(),
+            **runtime_settings()
         )
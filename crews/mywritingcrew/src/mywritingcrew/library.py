@@ -0,0 +1,269 @@
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# Stage artifacts mined for library entries, by entry kind
+ARTIFACTS = {
+    'character': '03_character_profiles.md',
+    'setting': '04_world_building.md',
+    'plot_thread': '02_story_structure.md',
+    'theme': '07_theme_analysis.md'
+}
+
+_HEADING = re.compile(r'^(#{1,6})\s+(.*?)\s*#*\s*$', re.MULTILINE)
+_WORD = re.compile(r"[a-z][a-z0-9]{2,}")
+_STOP_WORDS = frozenset(
+    "the and for with that this from into their they them then than there these those "
+    "have has had was were are been being will would could should must can may might "
+    "not but all any each every some such its his her him she who whom whose which what "
+    "when where while how why also more most other over under about after before between "
+    "through during within without again very just only own same both few out off "
+    "story character characters setting world scene scenes plot theme themes markdown format".split()
+)
+
+# Query terms considered, and the most index postings a lookup may visit
+_QUERY_TERMS = 32
+_POSTINGS_BUDGET = 4000
+_EXCERPT_CHARS = 600
+
+_shared: Dict[Path, "StoryLibrary"] = {}
+_shared_lock = threading.Lock()
+
+
+def sections(markdown: str) -> List[Tuple[str, str]]:
+    """Split markdown into ``(heading, body)`` entries.
+
+    Entries are cut at the shallowest heading level below the title that
+    occurs more than once, so sub-headings stay inside their entry.
+    """
+    headings = [(len(match.group(1)), match) for match in _HEADING.finditer(markdown)]
+    levels = Counter(level for level, _ in headings)
+    candidates = [level for level, count in sorted(levels.items()) if count > 1 and level > 1]
+    if not candidates:
+        candidates = [level for level in sorted(levels) if level > 1] or sorted(levels)
+    if not candidates:
+        return []
+    level = candidates[0]
+    cuts = [match for heading_level, match in headings if heading_level <= level]
+    entries = []
+    for position, match in enumerate(cuts):
+        if len(match.group(1)) < level:
+            continue
+        end = cuts[position + 1].start() if position + 1 < len(cuts) else len(markdown)
+        body = markdown[match.end():end].strip()
+        name = re.sub(r'[*_`]', '', match.group(2)).strip()
+        if name and body:
+            entries.append((name, body))
+    return entries
+
+
+class StoryLibrary:
+    """Persistent library of characters, settings, plot threads and themes from past stories.
+
+    Entries live in SQLite behind an FTS5 full-text index, so retrieval is a
+    ranked lookup whose cost grows with the number of matching entries
+    rather than the size of the library. A separate inverted index of
+    per-term entry counts picks the query terms: the most distinctive ones
+    until the entries they match reach a fixed budget, which keeps lookups
+    in the millisecond range as the library grows.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA foreign_keys=ON")
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS stories (
+                id INTEGER PRIMARY KEY,
+                source TEXT NOT NULL UNIQUE,
+                title TEXT,
+                genre TEXT,
+                theme TEXT,
+                created REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS entries (
+                id INTEGER PRIMARY KEY,
+                story_id INTEGER NOT NULL REFERENCES stories (id) ON DELETE CASCADE,
+                kind TEXT NOT NULL,
+                name TEXT NOT NULL,
+                body TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS entries_story ON entries (story_id);
+            CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5 (
+                name, body, kind UNINDEXED, content='entries', content_rowid='id'
+            );
+            CREATE TABLE IF NOT EXISTS terms (
+                term TEXT PRIMARY KEY,
+                entries INTEGER NOT NULL
+            ) WITHOUT ROWID;
+            CREATE TRIGGER IF NOT EXISTS entries_added AFTER INSERT ON entries BEGIN
+                INSERT INTO entries_fts (rowid, name, body, kind) VALUES (new.id, new.name, new.body, new.kind);
+            END;
+            CREATE TRIGGER IF NOT EXISTS entries_removed AFTER DELETE ON entries BEGIN
+                INSERT INTO entries_fts (entries_fts, rowid, name, body, kind)
+                VALUES ('delete', old.id, old.name, old.body, old.kind);
+            END;
+            """
+        )
+
+    @classmethod
+    def from_env(cls) -> Optional["StoryLibrary"]:
+        """Library at STORY_LIBRARY (default story_library.sqlite3), or None when set empty."""
+        path = os.getenv('STORY_LIBRARY', 'story_library.sqlite3')
+        return cls(path) if path else None
+
+    @classmethod
+    def shared(cls) -> Optional["StoryLibrary"]:
+        """The process-wide library at STORY_LIBRARY, opened on first use, or None when set empty.
+
+        Every crew built in the process reads through this one connection,
+        which stays open for the life of the process.
+        """
+        path = os.getenv('STORY_LIBRARY', 'story_library.sqlite3')
+        if not path:
+            return None
+        key = Path(path).expanduser().resolve()
+        with _shared_lock:
+            if key not in _shared:
+                _shared[key] = cls(str(key))
+            return _shared[key]
+
+    def add_story(self, directory: Path, tokens: Dict[str, Any], title: str = '') -> int:
+        """Index the entries found in a finished story's artifacts; returns how many were added.
+
+        Adding the same working directory again replaces its earlier entries.
+        """
+        directory = Path(directory)
+        entries = []
+        for kind, artifact in ARTIFACTS.items():
+            path = directory / artifact
+            if path.exists():
+                entries.extend((kind, name, body) for name, body in sections(path.read_text(encoding='utf-8')))
+
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                removed = self._db.execute(
+                    "SELECT e.name, e.body FROM entries e JOIN stories s ON s.id = e.story_id WHERE s.source = ?",
+                    (str(directory.resolve()),)
+                ).fetchall()
+                self._count_terms(removed, -1)
+                self._db.execute("DELETE FROM stories WHERE source = ?", (str(directory.resolve()),))
+                story_id = self._db.execute(
+                    "INSERT INTO stories (source, title, genre, theme, created) VALUES (?, ?, ?, ?, ?)",
+                    (str(directory.resolve()), title, tokens.get('genre'), tokens.get('theme'), time.time())
+                ).lastrowid
+                self._db.executemany(
+                    "INSERT INTO entries (story_id, kind, name, body) VALUES (?, ?, ?, ?)",
+                    [(story_id, kind, name, body) for kind, name, body in entries]
+                )
+                self._count_terms([(name, body) for _, name, body in entries], 1)
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return len(entries)
+
+    def search(
+        self,
+        text: str,
+        kinds: Iterable[str],
+        k: int = 5,
+        exclude: Optional[Path] = None
+    ) -> List[Dict[str, Any]]:
+        """The ``k`` entries of the given kinds most relevant to ``text``, best first.
+
+        Entries from the story in ``exclude`` (its working directory) are skipped.
+        """
+        kinds = list(kinds)
+        with self._lock:
+            terms = self._query_terms(text)
+            if not terms or not kinds:
+                return []
+            rows = self._db.execute(
+                "SELECT e.kind, e.name, e.body, s.title, bm25(entries_fts, 2.0, 1.0) AS score"
+                " FROM entries_fts JOIN entries e ON e.id = entries_fts.rowid"
+                " JOIN stories s ON s.id = e.story_id"
+                f" WHERE entries_fts MATCH ? AND e.kind IN ({', '.join('?' * len(kinds))}) AND s.source != ?"
+                " ORDER BY score LIMIT ?",
+                (' OR '.join(f'"{term}"' for term in terms), *kinds,
+                 str(Path(exclude).resolve()) if exclude else '', k)
+            ).fetchall()
+        return [
+            {'kind': kind, 'name': name, 'body': body, 'story': title, 'score': -score}
+            for kind, name, body, title, score in rows
+        ]
+
+    def retriever(self, kinds: Iterable[str], k: Optional[int] = None) -> Callable[[Any, str], str]:
+        """A ``DagCrew`` context source adding the top ``k`` entries relevant to a task's context."""
+        kinds = list(kinds)
+        k = k or int(os.getenv('STORY_LIBRARY_TOP_K', '5'))
+
+        def retrieve(task: Any, context: str) -> str:
+            # The task's own story may already be in the library from an earlier attempt
+            exclude = Path(task.output_file).parent if task.output_file else None
+            entries = self.search(context, kinds, k, exclude)
+            if not entries:
+                return ''
+            blocks = [
+                f"### {entry['name']} ({entry['kind'].replace('_', ' ')}, from \"{entry['story'] or 'an earlier story'}\")\n"
+                f"{_excerpt(entry['body'])}"
+                for entry in entries
+            ]
+            return "Relevant entries from the story library, to reuse or deliberately vary:\n\n" + "\n\n".join(blocks)
+
+        return retrieve
+
+    def _count_terms(self, entries: List[Tuple[str, str]], delta: int) -> None:
+        counts = Counter(term for name, body in entries for term in set(_WORD.findall(f"{name} {body}".lower())))
+        self._db.executemany(
+            "INSERT INTO terms (term, entries) VALUES (?, ?)"
+            " ON CONFLICT (term) DO UPDATE SET entries = entries + excluded.entries",
+            [(term, count * delta) for term, count in counts.items()]
+        )
+        if delta < 0:
+            self._db.execute("DELETE FROM terms WHERE entries <= 0")
+
+    def _query_terms(self, text: str) -> List[str]:
+        """The most distinctive terms of ``text`` whose postings fit in the lookup budget."""
+        counts = Counter(word for word in _WORD.findall(text.lower()) if word not in _STOP_WORDS)
+        candidates = dict(counts.most_common(_QUERY_TERMS * 2))
+        if not candidates:
+            return []
+        total = self._db.execute("SELECT COALESCE(MAX(id), 0) FROM entries").fetchone()[0] or 1
+        rows = self._db.execute(
+            f"SELECT term, entries FROM terms WHERE term IN ({', '.join('?' * len(candidates))})",
+            list(candidates)
+        ).fetchall()
+        weighted = sorted(
+            ((candidates[term] * math.log(1 + total / entries), entries, term) for term, entries in rows),
+            reverse=True
+        )
+        terms, postings = [], 0
+        for _, entries, term in weighted:
+            if postings + entries > _POSTINGS_BUDGET:
+                continue
+            terms.append(term)
+            postings += entries
+            if len(terms) == _QUERY_TERMS:
+                break
+        return terms
+
+    def close(self) -> None:
+        self._db.close()
+
+
+def _excerpt(body: str) -> str:
+    if len(body) <= _EXCERPT_CHARS:
+        return body
+    return body[:_EXCERPT_CHARS].rsplit(' ', 1)[0] + ' ...'
@@ -7,14 +7,27 @@ from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Union
 
+from crewkit.batch import BatchRunner, read_items
+from crewkit.workspace import Workspace
+from mywritingcrew.assembly import StoryAssembler
 from mywritingcrew.crew import Mywritingcrew
+from mywritingcrew.library import StoryLibrary
 
 warnings.filterwarnings("ignore", category=SyntaxWarning, module="pysbd")
 
-def ensure_working_directory():
-    """Ensure the working directory exists for story generation artifacts."""
-    working_dir = Path("working")
-    working_dir.mkdir(exist_ok=True)
+def ensure_working_directory(crew, resume: bool = False) -> Path:
+    """
+    Give the crew a run-scoped workspace and return its working/ directory.
+    Resuming reuses the latest workspace; without a workspace root the
+    artifacts go to working/ in the current directory.
+    """
+    if crew.workspace_root:
+        workspace = Workspace.latest(crew.workspace_root) if resume else None
+        crew.workspace = workspace or Workspace.create(crew.workspace_root)
+        working_dir = Path(crew.workspace.resolve("working"))
+    else:
+        working_dir = Path("working")
+    working_dir.mkdir(parents=True, exist_ok=True)
     return working_dir
 
 def validate_tokens(tokens: Dict[str, Union[str, List[str]]]) -> bool:
@@ -22,11 +35,66 @@ def validate_tokens(tokens: Dict[str, Union[str, List[str]]]) -> bool:
     required_fields = ['genre', 'theme', 'characters']
     return all(field in tokens for field in required_fields)
 
+def story_title(tokens: Dict) -> str:
+    return f"{tokens['genre']} - {tokens['theme']}".replace('_', ' ').title()
+
+def story_assembler(working_dir: Path, inputs: Dict[str, str], tokens: Dict) -> StoryAssembler:
+    """
+    Assembler for final_story.* in the formats listed in STORY_FORMATS
+    (markdown, html, epub; default markdown). The metadata is written at once
+    and each section follows as soon as the stage producing it finishes.
+    """
+    front_matter = (
+        "# Generated Story\n\n"
+        "## Metadata\n"
+        f"Generated: {inputs['timestamp']}\n"
+        f"Genre: {tokens['genre']}\n"
+        f"Theme: {tokens['theme']}\n\n"
+    )
+    formats = [name.strip() for name in os.getenv('STORY_FORMATS', 'markdown').split(',') if name.strip()]
+    return StoryAssembler(
+        working_dir,
+        title=story_title(tokens),
+        sections=[
+            ('Metadata', front_matter, None),
+            ('Story', '', '08_refined_narrative.md'),
+            ('Quality Assessment', '\n## Quality Assessment\n', '10_quality_assessment.md')
+        ],
+        formats=formats
+    )
+
+def assemble_story(working_dir: Path, inputs: Dict[str, str], tokens: Dict) -> Path:
+    """Combine the generated narrative and quality report into final_story.*."""
+    paths = story_assembler(working_dir, inputs, tokens).finish()
+    return paths.get('markdown') or next(iter(paths.values()))
+
+def add_to_library(working_dir: Path, tokens: Dict) -> None:
+    """Index the story's characters, settings, plot threads and themes in the story library."""
+    library = StoryLibrary.from_env()
+    if library is not None:
+        try:
+            library.add_story(working_dir, tokens, story_title(tokens))
+        finally:
+            library.close()
+
 def run():
     """
     Run the AI novelist crew to generate a story from input tokens.
     """
-    working_dir = ensure_working_directory()
+    return generate_story()
+
+def resume():
+    """
+    Re-run the AI novelist crew, executing only the stages whose configuration
+    or upstream outputs changed since the latest run's artifacts were produced.
+    """
+    return generate_story(resume=True)
+
+def generate_story(resume: bool = False):
+    """Generate a story, optionally reusing unchanged stages of the latest run."""
+    crew = Mywritingcrew().crew()
+    crew.resume = resume
+    working_dir = ensure_working_directory(crew, resume)
 
     # Example token structure - in practice, this would come from user input
     tokens = {
@@ -60,39 +128,57 @@ def run():
         'output_dir': str(working_dir)
     }
 
+    assembler = story_assembler(working_dir, inputs, tokens)
+    crew.listeners.append(assembler.on_event)
     try:
-        result = Mywritingcrew().crew().kickoff(inputs=inputs)
+        result = crew.kickoff(inputs=inputs)
         
-        # Combine all generated content into final story
-        story_path = working_dir / "final_story.md"
-        with open(story_path, 'w') as f:
-            f.write("# Generated Story\n\n")
-            
-            # Add metadata
-            f.write("## Metadata\n")
-            f.write(f"Generated: {inputs['timestamp']}\n")
-            f.write(f"Genre: {tokens['genre']}\n")
-            f.write(f"Theme: {tokens['theme']}\n\n")
-            
-            # Add story content
-            narrative_path = working_dir / "08_refined_narrative.md"
-            if narrative_path.exists():
-                with open(narrative_path) as narrative:
-                    f.write(narrative.read())
-            
-            # Add quality report
-            f.write("\n## Quality Assessment\n")
-            quality_path = working_dir / "10_quality_assessment.md"
-            if quality_path.exists():
-                with open(quality_path) as quality:
-                    f.write(quality.read())
+        paths = assembler.finish()
+        story_path = paths.get('markdown') or next(iter(paths.values()))
+        add_to_library(working_dir, tokens)
         
         print(f"\nStory generated successfully! Output saved to: {story_path}")
         return result
 
     except Exception as e:
+        assembler.close()
         raise Exception(f"An error occurred while generating the story: {e}")
 
+def batch():
+    """
+    Generate one story per token set in a JSON or JSON-lines file.
+    Each story's artifacts go to <output_root>/<item id>/working/.
+    Usage: batch <token sets> [output_root]
+    """
+    output_root = sys.argv[2] if len(sys.argv) > 2 else 'batches'
+
+    def prepare(tokens, directory):
+        tokens = {key: value for key, value in tokens.items() if key != 'id'}
+        if not validate_tokens(tokens):
+            raise ValueError("Invalid token structure. Required fields: genre, theme, characters")
+        return {
+            'tokens': json.dumps(tokens, indent=2),
+            'timestamp': datetime.now().isoformat(),
+            'output_dir': str(directory / "working")
+        }
+
+    def finish(result, inputs, directory):
+        tokens = json.loads(inputs['tokens'])
+        assemble_story(directory / "working", inputs, tokens)
+        add_to_library(directory / "working", tokens)
+
+    try:
+        summary = BatchRunner(
+            Mywritingcrew().crew(),
+            output_root,
+            prepare=prepare,
+            finish=finish
+        ).run(read_items(sys.argv[1]))
+    except Exception as e:
+        raise Exception(f"An error occurred while running the batch: {e}")
+    print(f"\n{summary['completed']} completed, {summary['skipped']} skipped, {len(summary['failed'])} failed")
+    return summary
+
 def train():
     """
     Train the AI novelist crew for a given number of iterations.
@@ -0,0 +1,198 @@
+import json
+import logging
+import re
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from crewai import Task
+
+from crewkit.logs import log_event
+from crewkit.scheduler import PartialOutput
+
+# Token values written as identifiers, like science_fiction, are turned into labels
+_IDENTIFIER = re.compile(r'^[a-z0-9]+(?:[_\- ][a-z0-9]+)*$')
+
+# Fields of the setting token, in the order they are mapped
+SETTING_FIELDS = ('time', 'place', 'atmosphere')
+
+# Token fields of the schema and the mapping key each fills, in mapping order
+MAPPED_FIELDS = {
+    'genre': 'genre',
+    'theme': 'themes',
+    'characters': 'characters',
+    'setting': 'setting',
+    'plot_elements': 'plot_points'
+}
+
+
+def _label(value: str) -> str:
+    value = value.strip()
+    if _IDENTIFIER.match(value):
+        return value.replace('_', ' ').replace('-', ' ').title()
+    return value
+
+
+def _labels(value: Any) -> Optional[List[str]]:
+    """A list of labels from a list of strings or a comma-separated string, or None if it is neither."""
+    if isinstance(value, str):
+        value = value.split(',')
+    if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+        return None
+    return [_label(item) for item in value if item.strip()]
+
+
+def _character(value: Any, path: str, unresolved: List[str]) -> Dict[str, Any]:
+    if not isinstance(value, dict) or not isinstance(value.get('name'), str) or not value['name'].strip():
+        unresolved.append(f'{path}.name')
+        return {}
+    character: Dict[str, Any] = {'name': value['name'].strip()}
+    role = value.get('role')
+    if role is not None:
+        if isinstance(role, str):
+            character['role'] = _label(role)
+        else:
+            unresolved.append(f'{path}.role')
+    if value.get('traits') is not None:
+        traits = _labels(value['traits'])
+        if traits is None:
+            unresolved.append(f'{path}.traits')
+        else:
+            character['traits'] = traits
+    # Anything else about the character is passed through as given
+    character.update({key: item for key, item in value.items() if key not in ('name', 'role', 'traits')})
+    return character
+
+
+def map_tokens(tokens: Any) -> Tuple[Dict[str, Any], List[str]]:
+    """Map story tokens to story elements by the token schema.
+
+    ``genre`` and ``theme`` are strings (several themes may be given as a
+    list), ``characters`` a list of objects with a ``name`` and optional
+    ``role`` and ``traits``, ``setting`` an object of time, place and
+    atmosphere, and ``plot_elements`` a list of strings. Tokens outside the
+    schema are kept under ``additional_elements``. Returns the mapping and
+    the fields whose values do not fit the schema, such as free-text
+    character descriptions, which need a model to interpret.
+    """
+    if not isinstance(tokens, dict):
+        return {}, ['tokens']
+    unresolved: List[str] = []
+    mapping: Dict[str, Any] = {}
+
+    genre = tokens.get('genre')
+    if isinstance(genre, str) and genre.strip():
+        mapping['genre'] = _label(genre)
+    else:
+        unresolved.append('genre')
+
+    themes = _labels([tokens['theme']] if isinstance(tokens.get('theme'), str) else tokens.get('theme'))
+    if themes:
+        mapping['themes'] = themes
+    else:
+        unresolved.append('theme')
+
+    characters = tokens.get('characters')
+    if isinstance(characters, list) and characters:
+        mapping['characters'] = [
+            _character(character, f'characters[{index}]', unresolved)
+            for index, character in enumerate(characters)
+        ]
+    else:
+        unresolved.append('characters')
+
+    setting = tokens.get('setting')
+    if isinstance(setting, dict) and all(isinstance(value, str) for value in setting.values()):
+        ordered = [name for name in SETTING_FIELDS if name in setting] + [
+            name for name in setting if name not in SETTING_FIELDS
+        ]
+        mapping['setting'] = {name: _label(setting[name]) for name in ordered}
+    elif setting is not None:
+        unresolved.append('setting')
+
+    if tokens.get('plot_elements') is not None:
+        plot_points = _labels(tokens['plot_elements'])
+        if plot_points is None:
+            unresolved.append('plot_elements')
+        else:
+            mapping['plot_points'] = plot_points
+
+    additional = {
+        key: value for key, value in tokens.items()
+        if key not in ('genre', 'theme', 'characters', 'setting', 'plot_elements')
+    }
+    if additional:
+        mapping['additional_elements'] = additional
+    return mapping, unresolved
+
+
+def _dumps(mapping: Dict[str, Any]) -> str:
+    return json.dumps(mapping, indent=2, ensure_ascii=False)
+
+
+def _json_object(text: str) -> Optional[Dict[str, Any]]:
+    """The JSON object in a model answer, which may be wrapped in prose or a code fence."""
+    start, end = text.find('{'), text.rfind('}')
+    try:
+        value = json.loads(text[start:end + 1]) if 0 <= start < end else None
+    except ValueError:
+        return None
+    return value if isinstance(value, dict) else None
+
+
+def merge_token_mapping(mapping: Dict[str, Any], answer: str, fields: Dict[str, Any]) -> str:
+    """Merge the agent's mapping of the token ``fields`` into the locally built ``mapping``.
+
+    Only the mapping keys of ``fields`` are taken from the answer. If the
+    answer holds no JSON object, the unmapped tokens are kept as given under
+    ``unmapped_tokens`` so later stages still see them.
+    """
+    keys = [MAPPED_FIELDS[name] for name in fields]
+    answered = _json_object(answer)
+    if answered is None:
+        log_event(logging.WARNING, "token_mapping_unmerged", fields=list(fields))
+        answered = {}
+    merged = dict(mapping)
+    merged.update({key: answered[key] for key in keys if key in answered})
+    missing = {name: value for name, value in fields.items() if MAPPED_FIELDS[name] not in merged}
+    if missing:
+        merged['unmapped_tokens'] = missing
+    order = [*MAPPED_FIELDS.values(), 'additional_elements', 'unmapped_tokens']
+    return _dumps({key: merged[key] for key in order if key in merged})
+
+
+def local_token_mapping(task: Task, inputs: Dict[str, Any]) -> Union[str, PartialOutput, None]:
+    """The token mapping for ``parse_input_task``, built locally as far as the schema allows.
+
+    Returns the whole mapping when every token fits the schema, and None,
+    leaving the task to the token parser agent, when none does. Otherwise
+    the agent is asked to map only the token fields that did not fit, and
+    its answer is merged with the rest.
+    """
+    try:
+        tokens = json.loads(inputs['tokens'])
+    except (KeyError, TypeError, ValueError):
+        tokens = None
+    mapping, unresolved = map_tokens(tokens)
+    if not unresolved:
+        return _dumps(mapping)
+    # A field is delegated whole when any of its values does not fit, such as one character's role
+    delegated = [name for name in MAPPED_FIELDS if any(
+        path == name or path.startswith((f'{name}[', f'{name}.')) for path in unresolved
+    )]
+    for name in delegated:
+        mapping.pop(MAPPED_FIELDS[name], None)
+    if not any(key in mapping for key in MAPPED_FIELDS.values()):
+        log_event(logging.INFO, "token_mapping_delegated", task=task.name, unresolved=unresolved)
+        return None
+
+    log_event(logging.INFO, "token_mapping_partial", task=task.name, unresolved=unresolved)
+    fields = {name: tokens.get(name) for name in delegated}
+    keys = ', '.join(MAPPED_FIELDS[name] for name in delegated)
+    return PartialOutput(
+        request=(
+            'The other tokens have already been mapped. Map only these tokens:\n'
+            f'{_dumps(fields)}\n'
+            f'Answer with a JSON object holding only the keys {keys}.'
+        ),
+        expected_output=f'A JSON object with only the keys {keys}.',
+        merge=lambda answer: merge_token_mapping(mapping, answer, fields)
+    )
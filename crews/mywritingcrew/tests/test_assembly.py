@@ -0,0 +1,100 @@
+import zipfile
+
+import pytest
+
+from mywritingcrew.assembly import StoryAssembler, markdown_to_html
+
+STORY = "Chapter one.\n\n- a *bold* move\n- **twice**\n\n1. first\n2. second\n\n```\nx < y\n```\n"
+QUALITY = "Score: 9/10 & rising\n"
+FRONT = "# Generated Story\n\n## Metadata\nGenre: sci-fi\n\n"
+
+
+def _assembler(tmp_path, formats=("markdown",)):
+    (tmp_path / "story.md").write_text(STORY, encoding="utf-8")
+    (tmp_path / "quality.md").write_text(QUALITY, encoding="utf-8")
+    return StoryAssembler(
+        tmp_path,
+        title="Sci-Fi <Story>",
+        sections=[
+            ("Metadata", FRONT, None),
+            ("Story", "", "story.md"),
+            ("Quality Assessment", "\n## Quality Assessment\n", "quality.md"),
+        ],
+        formats=formats,
+    )
+
+
+def _finished(tmp_path, name):
+    return "task_finished", {"output_file": str(tmp_path / name)}
+
+
+def test_sections_are_written_in_order_as_their_tasks_finish(tmp_path):
+    assembler = _assembler(tmp_path)
+    story = tmp_path / "final_story.md"
+
+    assert story.read_text(encoding="utf-8") == FRONT
+    assembler.on_event(*_finished(tmp_path, "quality.md"))
+    assert story.read_text(encoding="utf-8") == FRONT
+    assembler.on_event("task_started", {"output_file": str(tmp_path / "story.md")})
+    assert story.read_text(encoding="utf-8") == FRONT
+    assembler.on_event(*_finished(tmp_path, "story.md"))
+    assert story.read_text(encoding="utf-8") == FRONT + STORY + "\n## Quality Assessment\n" + QUALITY
+
+    assert assembler.finish() == {"markdown": story}
+    assert story.read_text(encoding="utf-8") == FRONT + STORY + "\n## Quality Assessment\n" + QUALITY
+
+
+def test_finish_writes_headings_for_missing_artifacts(tmp_path):
+    assembler = _assembler(tmp_path)
+    (tmp_path / "story.md").unlink()
+
+    assembler.finish()
+
+    assert (tmp_path / "final_story.md").read_text(encoding="utf-8") == FRONT + "\n## Quality Assessment\n" + QUALITY
+
+
+def test_html_output_renders_every_section_in_order(tmp_path):
+    paths = _assembler(tmp_path, formats=("html",)).finish()
+
+    page = paths["html"].read_text(encoding="utf-8")
+    assert "<title>Sci-Fi &lt;Story&gt;</title>" in page
+    assert page.count("<section>") == 3
+    order = [
+        "<h1>Generated Story</h1>",
+        "<p>Chapter one.</p>",
+        "<h2>Quality Assessment</h2>",
+        "Score: 9/10 &amp; rising",
+    ]
+    assert [page.index(part) for part in order] == sorted(page.index(part) for part in order)
+    assert page.rstrip().endswith("</html>")
+
+
+def test_epub_output_is_a_complete_book(tmp_path):
+    paths = _assembler(tmp_path, formats=("markdown", "epub")).finish()
+
+    with zipfile.ZipFile(paths["epub"]) as book:
+        entries = book.infolist()
+        assert (entries[0].filename, entries[0].compress_type) == ("mimetype", zipfile.ZIP_STORED)
+        names = book.namelist()
+        assert [name for name in names if name.startswith("OEBPS/chapter")] == [
+            "OEBPS/chapter001.xhtml", "OEBPS/chapter002.xhtml", "OEBPS/chapter003.xhtml"
+        ]
+        assert "<p>Chapter one.</p>" in book.read("OEBPS/chapter002.xhtml").decode("utf-8")
+        opf = book.read("OEBPS/content.opf").decode("utf-8")
+        assert opf.index('idref="c0"') < opf.index('idref="c1"') < opf.index('idref="c2"')
+        assert "Quality Assessment" in book.read("OEBPS/nav.xhtml").decode("utf-8")
+    assert paths["markdown"].exists()
+
+
+def test_markdown_to_html_converts_blocks_and_inline_markup():
+    assert "".join(markdown_to_html(STORY.splitlines(keepends=True))) == (
+        "<p>Chapter one.</p>\n"
+        "<ul>\n<li>a <em>bold</em> move</li>\n<li><strong>twice</strong></li>\n</ul>\n"
+        "<ol>\n<li>first</li>\n<li>second</li>\n</ol>\n"
+        "<pre><code>x &lt; y\n</code></pre>\n"
+    )
+
+
+def test_unknown_formats_are_rejected(tmp_path):
+    with pytest.raises(ValueError, match="pdf"):
+        StoryAssembler(tmp_path, "Title", [], formats=("pdf",))
@@ -0,0 +1,98 @@
+from types import SimpleNamespace
+
+import pytest
+
+from mywritingcrew.library import StoryLibrary, sections
+
+CHARACTERS = """# Character Profiles
+
+## Mira Vale
+A dragon scholar who catalogues dragon bones in the northern archive.
+
+### Background
+Raised among dragon hunters.
+
+## Tomas Reed
+A smuggler with a debt to the harbour guild.
+"""
+
+WORLD = """# World Building
+
+## The Northern Archive
+A library carved into a glacier, where scholars study dragon remains.
+
+## Saltmarsh Harbour
+A crowded port run by the harbour guild.
+"""
+
+OTHER_CHARACTERS = """# Character Profiles
+
+## Captain Ilse
+A starship captain hunting a rogue dragon drone across the colonies.
+
+## Pell
+An engineer who mends the captain's ship.
+"""
+
+
+def _story(directory, characters, world=None):
+    directory.mkdir()
+    (directory / '03_character_profiles.md').write_text(characters, encoding='utf-8')
+    if world:
+        (directory / '04_world_building.md').write_text(world, encoding='utf-8')
+    return directory
+
+
+@pytest.fixture
+def library(tmp_path):
+    library = StoryLibrary(str(tmp_path / 'library.sqlite3'))
+    library.add_story(_story(tmp_path / 'fantasy', CHARACTERS, WORLD), {'genre': 'fantasy'}, 'Bones of Ice')
+    library.add_story(_story(tmp_path / 'scifi', OTHER_CHARACTERS), {'genre': 'science_fiction'}, 'Drone Hunt')
+    yield library
+    library.close()
+
+
+def test_sections_split_at_the_repeated_heading_level():
+    entries = sections(CHARACTERS)
+
+    assert [name for name, _ in entries] == ['Mira Vale', 'Tomas Reed']
+    assert '### Background' in entries[0][1]
+
+
+def test_search_ranks_the_best_matching_entries_first(library):
+    results = library.search('a dragon scholar studying dragon bones', ['character'], k=3)
+
+    assert [entry['name'] for entry in results] == ['Mira Vale', 'Captain Ilse']
+    assert results[0]['story'] == 'Bones of Ice'
+    assert results[0]['score'] > results[1]['score'] > 0
+
+
+def test_search_filters_kinds_and_excludes_a_story(library, tmp_path):
+    settings = library.search('scholars of the glacier archive', ['setting'])
+    assert [entry['name'] for entry in settings] == ['The Northern Archive']
+    assert all(entry['kind'] == 'setting' for entry in settings)
+
+    others = library.search('dragon', ['character'], exclude=tmp_path / 'fantasy')
+    assert [entry['name'] for entry in others] == ['Captain Ilse']
+    assert library.search('', ['character']) == []
+    assert library.search('dragon', []) == []
+
+
+def test_adding_a_story_again_replaces_its_entries(library, tmp_path):
+    assert library.add_story(tmp_path / 'fantasy', {'genre': 'fantasy'}, 'Bones of Ice') == 4
+
+    assert [entry['name'] for entry in library.search('smuggler harbour guild', ['character'])] == ['Tomas Reed']
+    count = library._db.execute("SELECT entries FROM terms WHERE term = 'smuggler'").fetchone()[0]
+    assert count == 1
+
+
+def test_retriever_formats_entries_from_other_stories(library, tmp_path):
+    retrieve = library.retriever(['character', 'setting'], k=2)
+    task = SimpleNamespace(output_file=str(tmp_path / 'scifi' / '03_character_profiles.md'))
+
+    context = retrieve(task, 'The dragon archive needs a keeper')
+
+    assert context.startswith('Relevant entries from the story library')
+    assert '### The Northern Archive (setting, from "Bones of Ice")' in context
+    assert 'Captain Ilse' not in context
+    assert retrieve(task, 'nothing matches zzz') == ''
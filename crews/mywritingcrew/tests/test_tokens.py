@@ -0,0 +1,79 @@
+import json
+from types import SimpleNamespace
+
+from crewkit.scheduler import PartialOutput
+from mywritingcrew.tokens import local_token_mapping, map_tokens
+
+TASK = SimpleNamespace(name='parse_input_task')
+
+TOKENS = {
+    'genre': 'science_fiction',
+    'theme': ['redemption', 'found family'],
+    'characters': [{'name': 'Ada', 'role': 'protagonist', 'traits': 'curious, stubborn'}],
+    'setting': {'place': 'orbital_station', 'time': 'far future'},
+    'plot_elements': ['first_contact'],
+    'tone': 'hopeful'
+}
+
+
+def _mapping(tokens):
+    return local_token_mapping(TASK, {'tokens': json.dumps(tokens)})
+
+
+def test_map_tokens_labels_values_by_the_schema():
+    mapping, unresolved = map_tokens(TOKENS)
+
+    assert unresolved == []
+    assert mapping == {
+        'genre': 'Science Fiction',
+        'themes': ['Redemption', 'Found Family'],
+        'characters': [{'name': 'Ada', 'role': 'Protagonist', 'traits': ['Curious', 'Stubborn']}],
+        'setting': {'time': 'Far Future', 'place': 'Orbital Station'},
+        'plot_points': ['First Contact'],
+        'additional_elements': {'tone': 'hopeful'}
+    }
+
+
+def test_all_resolved_tokens_are_mapped_without_the_agent():
+    output = _mapping(TOKENS)
+
+    assert isinstance(output, str)
+    assert json.loads(output) == map_tokens(TOKENS)[0]
+
+
+def test_partly_resolved_tokens_ask_the_agent_for_the_rest_only():
+    tokens = {**TOKENS, 'characters': 'A curious engineer and her rival', 'setting': 'somewhere cold'}
+
+    output = _mapping(tokens)
+
+    assert isinstance(output, PartialOutput)
+    assert 'A curious engineer and her rival' in output.request
+    assert 'somewhere cold' in output.request
+    assert 'first_contact' not in output.request
+    answer = (
+        'Here is the mapping:\n```json\n'
+        '{"characters": [{"name": "Ada", "role": "Protagonist"}, {"name": "Rival"}],'
+        ' "setting": {"place": "Ice Moon"}, "genre": "Ignored"}\n```'
+    )
+    merged = json.loads(output.merge(answer))
+    assert list(merged) == ['genre', 'themes', 'characters', 'setting', 'plot_points', 'additional_elements']
+    assert merged['genre'] == 'Science Fiction'
+    assert merged['characters'] == [{'name': 'Ada', 'role': 'Protagonist'}, {'name': 'Rival'}]
+    assert merged['setting'] == {'place': 'Ice Moon'}
+    assert merged['plot_points'] == ['First Contact']
+
+
+def test_unparseable_answer_keeps_the_unmapped_tokens():
+    output = _mapping({**TOKENS, 'characters': 'Two rivals'})
+
+    merged = json.loads(output.merge('I could not map these.'))
+
+    assert 'characters' not in merged
+    assert merged['unmapped_tokens'] == {'characters': 'Two rivals'}
+    assert merged['genre'] == 'Science Fiction'
+
+
+def test_nothing_resolved_leaves_the_task_to_the_agent():
+    assert _mapping({'genre': 42, 'theme': None, 'characters': 'Everyone'}) is None
+    assert _mapping(['not', 'an', 'object']) is None
+    assert local_token_mapping(TASK, {}) is None
@@ -1,5 +1,9 @@
 from crewai import Agent, Crew, Process, Task
-from crewai.project import CrewBase, agent, crew, task
+from crewai.project import agent, crew, task
+
+from crewkit.logs import verbose_enabled
+from crewkit.project import CrewBase
+from crewkit.scheduler import DagCrew
 
 @CrewBase
 class PersonaSynth():
@@ -12,21 +16,25 @@ class PersonaSynth():
     def trend_analyzer(self) -> Agent:
         return Agent(
             config=self.agents_config['trend_analyzer'],
-            verbose=True
+            verbose=verbose_enabled()
         )
 
     @agent
     def dork_whisperer(self) -> Agent:
         return Agent(
             config=self.agents_config['dork_whisperer'],
-            verbose=True
+            verbose=verbose_enabled()
         )
 
     @agent
     def emotion_quantifier(self) -> Agent:
+        # Imported here so the tool stack loads only when this agent is built
+        from personasynth.tools.emotion_tool import EmotionAnalysisTool
+
         return Agent(
             config=self.agents_config['emotion_quantifier'],
-            verbose=True
+            tools=[EmotionAnalysisTool()],
+            verbose=verbose_enabled()
         )
 
     @task
@@ -53,9 +61,9 @@ class PersonaSynth():
     @crew
     def crew(self) -> Crew:
         """Creates the PersonaSynth crew for analyzing social media trends and emotions"""
-        return Crew(
+        return DagCrew(
             agents=self.agents,
             tasks=self.tasks,
             process=Process.sequential,
-            verbose=True
+            verbose=verbose_enabled()
         )
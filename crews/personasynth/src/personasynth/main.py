@@ -3,10 +3,23 @@ import sys
 import warnings
 from datetime import datetime
 
-from personasynth.crew import PersonaSynth
-
 warnings.filterwarnings("ignore", category=SyntaxWarning, module="pysbd")
 
+EMOTION_THRESHOLDS = {
+    'min_intensity': 3,
+    'min_authenticity': 5,
+    'min_resonance': 4
+}
+
+def build_crew():
+    """
+    Import and build the crew on first use, so commands that do not run it
+    (score_corpus) start without loading crewAI.
+    """
+    from personasynth.crew import PersonaSynth
+
+    return PersonaSynth().crew()
+
 def run():
     """
     Run the PersonaSynth crew to analyze social media trends and emotions.
@@ -19,11 +32,7 @@ def run():
             'anime',
             'science'
         ],
-        'emotion_thresholds': {
-            'min_intensity': 3,
-            'min_authenticity': 5,
-            'min_resonance': 4
-        },
+        'emotion_thresholds': EMOTION_THRESHOLDS,
         'trend_parameters': {
             'timeframe': 'last_week',
             'min_engagement': 100,
@@ -33,7 +42,7 @@ def run():
     }
     
     try:
-        PersonaSynth().crew().kickoff(inputs=inputs)
+        build_crew().kickoff(inputs=inputs)
     except Exception as e:
         raise Exception(f"An error occurred while running the crew: {e}")
 
@@ -49,7 +58,7 @@ def train():
         }
     }
     try:
-        PersonaSynth().crew().train(
+        build_crew().train(
             n_iterations=int(sys.argv[1]),
             filename=sys.argv[2],
             inputs=inputs
@@ -62,7 +71,7 @@ def replay():
     Replay the crew execution from a specific task.
     """
     try:
-        PersonaSynth().crew().replay(task_id=sys.argv[1])
+        build_crew().replay(task_id=sys.argv[1])
     except Exception as e:
         raise Exception(f"An error occurred while replaying the crew: {e}")
 
@@ -78,7 +87,7 @@ def test():
         }
     }
     try:
-        PersonaSynth().crew().test(
+        build_crew().test(
             n_iterations=int(sys.argv[1]),
             openai_model_name=sys.argv[2],
             inputs=inputs
@@ -86,5 +95,22 @@ def test():
     except Exception as e:
         raise Exception(f"An error occurred while testing the crew: {e}")
 
+def score_corpus():
+    """
+    Score a JSONL or CSV corpus export (optionally .gz) and write the records
+    meeting the emotion thresholds to an output file.
+    """
+    from personasynth.tools.emotion_pipeline import run_pipeline
+
+    try:
+        run_pipeline(
+            source=sys.argv[1],
+            sink=sys.argv[2],
+            thresholds=EMOTION_THRESHOLDS,
+            text_field=sys.argv[3] if len(sys.argv) > 3 else 'text'
+        )
+    except Exception as e:
+        raise Exception(f"An error occurred while scoring the corpus: {e}")
+
 if __name__ == "__main__":
     run()
@@ -1,6 +1,14 @@
-from typing import Dict, List
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+import os
 import re
-from dataclasses import dataclass
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import islice, repeat
+
+import numpy as np
+
 
 @dataclass
 class EmotionMetrics:
@@ -9,6 +17,199 @@ class EmotionMetrics:
     authenticity: float
     resonance: float
 
+
+def overall_score(metrics: EmotionMetrics) -> float:
+    """Weighted 0-10 score combining all emotion metrics"""
+    return (
+        metrics.intensity * 0.3 +
+        (metrics.sentiment + 1) * 5 * 0.2 +  # Convert -1:1 to 0:10
+        metrics.authenticity * 0.25 +
+        metrics.resonance * 0.25
+    )
+
+
+# Keys of the crew's emotion_thresholds input and the metric each one bounds
+THRESHOLD_METRICS = {
+    'min_intensity': 'intensity',
+    'min_authenticity': 'authenticity',
+    'min_resonance': 'resonance'
+}
+
+
+def meets_thresholds(metrics: Dict, thresholds: Dict) -> bool:
+    """Whether a metrics dict satisfies every configured minimum"""
+    return all(
+        metrics[metric] >= thresholds[key]
+        for key, metric in THRESHOLD_METRICS.items()
+        if key in thresholds
+    )
+
+
+def _column() -> array:
+    return array('d')
+
+
+@dataclass
+class EmotionBatch:
+    """Columnar emotion metrics for many texts, one float array per metric.
+
+    Row ``i`` of every column belongs to the ``i``-th scored text. Rows are
+    only turned into ``EmotionMetrics`` objects when accessed, and each
+    column supports the buffer protocol, so ``numpy.frombuffer`` can wrap it
+    without copying.
+    """
+    intensity: array = field(default_factory=_column)
+    sentiment: array = field(default_factory=_column)
+    authenticity: array = field(default_factory=_column)
+    resonance: array = field(default_factory=_column)
+    overall_score: array = field(default_factory=_column)
+
+    def __len__(self) -> int:
+        return len(self.overall_score)
+
+    def __getitem__(self, index: int) -> EmotionMetrics:
+        return EmotionMetrics(
+            intensity=self.intensity[index],
+            sentiment=self.sentiment[index],
+            authenticity=self.authenticity[index],
+            resonance=self.resonance[index]
+        )
+
+    def __iter__(self) -> Iterator[EmotionMetrics]:
+        return (self[index] for index in range(len(self)))
+
+    def append(self, metrics: EmotionMetrics) -> None:
+        """Add one row of metrics"""
+        self.intensity.append(metrics.intensity)
+        self.sentiment.append(metrics.sentiment)
+        self.authenticity.append(metrics.authenticity)
+        self.resonance.append(metrics.resonance)
+        self.overall_score.append(overall_score(metrics))
+
+    def extend(self, other: 'EmotionBatch') -> None:
+        """Append all rows of another batch"""
+        self.intensity.extend(other.intensity)
+        self.sentiment.extend(other.sentiment)
+        self.authenticity.extend(other.authenticity)
+        self.resonance.extend(other.resonance)
+        self.overall_score.extend(other.overall_score)
+
+    def passing(self, thresholds: Dict) -> List[int]:
+        """Indices of rows meeting the min_intensity/min_authenticity/min_resonance thresholds"""
+        mask = np.ones(len(self), dtype=bool)
+        for key, metric in THRESHOLD_METRICS.items():
+            if key in thresholds:
+                mask &= np.frombuffer(getattr(self, metric), dtype=np.float64) >= thresholds[key]
+        return mask.nonzero()[0].tolist()
+
+    def select(self, indices: Iterable[int]) -> 'EmotionBatch':
+        """Return a new batch holding only the given rows"""
+        indices = list(indices)
+        return EmotionBatch(*(
+            array('d', (column[index] for index in indices))
+            for column in (
+                self.intensity, self.sentiment, self.authenticity,
+                self.resonance, self.overall_score
+            )
+        ))
+
+_LEADING_FLAGS = re.compile(r'^\(\?([aiLmsux]+)\)')
+_ESCAPED_CHAR = re.compile(r'\\(\W)')
+_SPECIAL_CHARS = set('.^$*+?{}[]\\|()')
+
+
+def _literal_alternatives(pattern: str):
+    """Split a pattern made only of ``|``-separated plain words.
+
+    Returns ``(ignore_case, words)``, or None when the pattern uses any
+    regex syntax beyond an optional leading ``(?i)``.
+    """
+    ignore_case = False
+    match = _LEADING_FLAGS.match(pattern)
+    if match:
+        if match.group(1) != 'i':
+            return None
+        ignore_case = True
+        pattern = pattern[match.end():]
+
+    words = []
+    for alternative in pattern.split('|'):
+        word = _ESCAPED_CHAR.sub(r'\1', alternative)
+        if not word or not word.isascii() or _SPECIAL_CHARS & set(alternative.replace('\\', '')):
+            return None
+        words.append(word.lower() if ignore_case else word)
+    return ignore_case, words
+
+
+def _can_overlap(first: str, second: str) -> bool:
+    """Whether occurrences of two different words can share characters."""
+    if first == second or first in second or second in first:
+        return True
+    return any(
+        first.endswith(second[:size]) or second.endswith(first[:size])
+        for size in range(1, min(len(first), len(second)))
+    )
+
+
+class PatternEngine:
+    """Counts pattern matches per category with every pattern prepared once.
+
+    Case-insensitive word alternations are matched against one lowercased
+    copy of ASCII text, and alternations whose words can never overlap each
+    other are counted with ``str.count``. Both yield exactly the
+    ``re.findall`` count at a fraction of the cost. Non-ASCII text uses the
+    regexes compiled from the original patterns.
+    """
+
+    def __init__(self, patterns: Dict[str, List[str]]):
+        self.categories = list(patterns)
+        self._compiled = []
+        self._regex = []
+        self._words = []
+
+        for category, category_patterns in patterns.items():
+            for pattern in category_patterns:
+                compiled = re.compile(pattern)
+                self._compiled.append((category, compiled))
+
+                literal = _literal_alternatives(pattern)
+                if literal is None:
+                    self._regex.append((category, False, compiled))
+                    continue
+
+                ignore_case, words = literal
+                if any(
+                    _can_overlap(first, second)
+                    for index, first in enumerate(words)
+                    for second in words[index + 1:]
+                ):
+                    # Overlapping words need the regex's leftmost-first scan,
+                    # but a case-sensitive match on lowercased text is cheaper.
+                    exact = re.compile('|'.join(re.escape(word) for word in words))
+                    self._regex.append((category, ignore_case, exact))
+                else:
+                    self._words.append((category, ignore_case, words))
+
+    def count(self, text: str) -> Dict[str, int]:
+        """Return the number of matches per category in ``text``."""
+        counts = dict.fromkeys(self.categories, 0)
+        if not text.isascii():
+            for category, pattern in self._compiled:
+                counts[category] += len(pattern.findall(text))
+            return counts
+
+        lowered = text.lower()
+        for category, ignore_case, words in self._words:
+            haystack = lowered if ignore_case else text
+            counts[category] += sum(haystack.count(word) for word in words)
+        for category, ignore_case, pattern in self._regex:
+            counts[category] += len(pattern.findall(lowered if ignore_case else text))
+        return counts
+
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
 class SageAdviceAnalyzer:
     """Tool for gathering and analyzing 'sage' advice from online communities"""
 
@@ -29,34 +230,29 @@ class SageAdviceAnalyzer:
                 r'(?i)understand|get it|feel you'
             ]
         }
+        self.sentiment_patterns = {
+            'positive': [r'(?i)good|great|awesome|love|happy'],
+            'negative': [r'(?i)bad|terrible|hate|angry|sad']
+        }
+        self.engine = PatternEngine({**self.emotion_patterns, **self.sentiment_patterns})
 
     def analyze_text(self, text: str) -> EmotionMetrics:
         """Analyze text for emotional content and return metrics"""
-        
+        counts = self.engine.count(text)
+
         # Calculate intensity (0-10)
-        intensity = min(10, sum(
-            len(re.findall(pattern, text))
-            for pattern in self.emotion_patterns['intensity']
-        ))
+        intensity = min(10, counts['intensity'])
 
         # Calculate sentiment (-1 to 1)
         # Simple implementation - could be enhanced with ML-based sentiment analysis
-        positive_words = len(re.findall(r'(?i)good|great|awesome|love|happy', text))
-        negative_words = len(re.findall(r'(?i)bad|terrible|hate|angry|sad', text))
         total_words = len(text.split())
-        sentiment = (positive_words - negative_words) / max(1, total_words)
+        sentiment = (counts['positive'] - counts['negative']) / max(1, total_words)
 
         # Calculate authenticity (0-10)
-        authenticity = min(10, sum(
-            2 * len(re.findall(pattern, text))
-            for pattern in self.emotion_patterns['authenticity']
-        ))
+        authenticity = min(10, 2 * counts['authenticity'])
 
         # Calculate resonance (0-10)
-        resonance = min(10, sum(
-            2 * len(re.findall(pattern, text))
-            for pattern in self.emotion_patterns['resonance']
-        ))
+        resonance = min(10, 2 * counts['resonance'])
 
         return EmotionMetrics(
             intensity=intensity,
@@ -65,36 +261,128 @@ class SageAdviceAnalyzer:
             resonance=resonance
         )
 
+    def text_metrics(self, text: str) -> Dict:
+        """The metrics of a piece of advice, with its overall score, as a plain dict"""
+        metrics = self.analyze_text(text)
+        return {
+            'intensity': metrics.intensity,
+            'sentiment': metrics.sentiment,
+            'authenticity': metrics.authenticity,
+            'resonance': metrics.resonance,
+            'overall_score': overall_score(metrics)
+        }
+
     def process_advice(self, text: str, context: Dict = None) -> Dict:
         """Process a piece of advice and return analysis results"""
-        metrics = self.analyze_text(text)
-        
         return {
             'text': text,
             'context': context or {},
-            'metrics': {
-                'intensity': metrics.intensity,
-                'sentiment': metrics.sentiment,
-                'authenticity': metrics.authenticity,
-                'resonance': metrics.resonance,
-                'overall_score': (
-                    metrics.intensity * 0.3 +
-                    (metrics.sentiment + 1) * 5 * 0.2 +  # Convert -1:1 to 0:10
-                    metrics.authenticity * 0.25 +
-                    metrics.resonance * 0.25
-                )
-            }
+            'metrics': self.text_metrics(text)
         }
 
-    def batch_process(self, texts: List[str], contexts: List[Dict] = None) -> List[Dict]:
-        """Process multiple pieces of advice"""
-        if contexts is None:
-            contexts = [None] * len(texts)
-        
-        return [
-            self.process_advice(text, context)
-            for text, context in zip(texts, contexts)
-        ]
+    def batch_process(
+        self,
+        texts: List[str],
+        contexts: List[Dict] = None,
+        workers: Optional[int] = 1,
+        chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> List[Dict]:
+        """Process multiple pieces of advice, in parallel when ``workers`` is not 1"""
+        return list(self.stream_process(texts, contexts, workers, chunk_size))
+
+    def stream_process(
+        self,
+        texts: Iterable[str],
+        contexts: Iterable[Dict] = None,
+        workers: Optional[int] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> Iterator[Dict]:
+        """Process an iterable of advice in chunks, yielding results in input order.
+
+        Chunks are scored by a pool of ``workers`` processes (all cores when
+        None). Only a few chunks per worker are in flight at a time, so
+        arbitrarily long iterables are processed with bounded memory.
+        """
+        items = zip(texts, contexts if contexts is not None else repeat(None))
+        for results in self._map_chunks(items, '_process_chunk', workers, chunk_size):
+            yield from results
+
+    def stream_metrics(
+        self,
+        texts: Iterable[str],
+        workers: Optional[int] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> Iterator[Dict]:
+        """Yield the metrics of each text in input order, sending workers only the texts"""
+        for results in self._map_chunks(iter(texts), '_metrics_chunk', workers, chunk_size):
+            yield from results
+
+    def score_batch(
+        self,
+        texts: Iterable[str],
+        workers: Optional[int] = 1,
+        chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> EmotionBatch:
+        """Score many texts into a columnar batch without keeping the texts or per-row dicts"""
+        batch = EmotionBatch()
+        for chunk_batch in self._map_chunks(iter(texts), '_score_chunk', workers, chunk_size):
+            batch.extend(chunk_batch)
+        return batch
+
+    def _map_chunks(
+        self,
+        items: Iterator,
+        method: str,
+        workers: Optional[int],
+        chunk_size: int
+    ) -> Iterator:
+        """Apply a chunk method to successive chunks of ``items``, in input order"""
+        chunks = iter(lambda: list(islice(items, chunk_size)), [])
+        workers = workers or os.cpu_count() or 1
+
+        if workers == 1:
+            for chunk in chunks:
+                yield getattr(self, method)(chunk)
+            return
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(self,)
+        ) as pool:
+            pending = deque()
+            for chunk in chunks:
+                pending.append(pool.submit(_run_worker_chunk, method, chunk))
+                if len(pending) >= 2 * workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def _process_chunk(self, chunk: List[Tuple[str, Optional[Dict]]]) -> List[Dict]:
+        return [self.process_advice(text, context) for text, context in chunk]
+
+    def _metrics_chunk(self, chunk: List[str]) -> List[Dict]:
+        return [self.text_metrics(text) for text in chunk]
+
+    def _score_chunk(self, chunk: List[str]) -> EmotionBatch:
+        batch = EmotionBatch()
+        for text in chunk:
+            batch.append(self.analyze_text(text))
+        return batch
+
+
+_worker_analyzer: Optional[SageAdviceAnalyzer] = None
+
+
+def _init_worker(analyzer: SageAdviceAnalyzer) -> None:
+    """Keep one analyzer per worker process instead of shipping it with every chunk"""
+    global _worker_analyzer
+    _worker_analyzer = analyzer
+
+
+def _run_worker_chunk(method: str, chunk: List) -> object:
+    return getattr(_worker_analyzer, method)(chunk)
+
 
 # Example usage:
 """
@@ -102,4 +390,11 @@ analyzer = SageAdviceAnalyzer()
 advice = "HONESTLY, I've found that spending time coding really helps me relax! It's amazing!!"
 result = analyzer.process_advice(advice, {"source": "reddit", "community": "programming"})
 print(result)
+
+# Score a large corpus on every core:
+results = analyzer.batch_process(texts, workers=None, chunk_size=2000)
+
+# Score into columns and keep rows meeting the crew's emotion thresholds:
+batch = analyzer.score_batch(texts, workers=None)
+keep = batch.passing({'min_intensity': 3, 'min_authenticity': 5, 'min_resonance': 4})
 """
@@ -0,0 +1,183 @@
+from typing import Callable, Dict, Iterable, Iterator, Optional
+import csv
+import gzip
+import io
+import json
+import os
+import tempfile
+import time
+from dataclasses import dataclass, field
+from itertools import tee
+from pathlib import Path
+
+from personasynth.tools.custom_tool import (
+    DEFAULT_CHUNK_SIZE,
+    SageAdviceAnalyzer,
+    meets_thresholds
+)
+
+JSONL_SUFFIXES = {'.jsonl', '.ndjson', '.json'}
+CSV_SUFFIXES = {'.csv'}
+
+
+@dataclass
+class PipelineStats:
+    """Running totals of a corpus scoring pipeline"""
+    read: int = 0
+    kept: int = 0
+    started: float = field(default_factory=time.monotonic)
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    @property
+    def rate(self) -> float:
+        return self.read / max(self.elapsed, 1e-9)
+
+
+def _record_format(path: Path) -> str:
+    """Infer 'jsonl' or 'csv' from a path, ignoring a trailing .gz"""
+    suffixes = [suffix.lower() for suffix in path.suffixes]
+    if suffixes and suffixes[-1] == '.gz':
+        suffixes = suffixes[:-1]
+    suffix = suffixes[-1] if suffixes else ''
+    if suffix in JSONL_SUFFIXES:
+        return 'jsonl'
+    if suffix in CSV_SUFFIXES:
+        return 'csv'
+    raise ValueError(f"Unsupported corpus format for {path}; expected .jsonl or .csv, optionally .gz")
+
+
+def _open_text(path: Path, mode: str) -> io.TextIOBase:
+    if path.suffix.lower() == '.gz':
+        return gzip.open(path, mode + 't', encoding='utf-8', newline='')
+    return open(path, mode, encoding='utf-8', newline='')
+
+
+def read_records(path: str) -> Iterator[Dict]:
+    """Yield records one at a time from a JSONL or CSV file, optionally gzip-compressed"""
+    path = Path(path)
+    record_format = _record_format(path)
+    with _open_text(path, 'r') as handle:
+        if record_format == 'csv':
+            yield from csv.DictReader(handle)
+        else:
+            for line in handle:
+                if line.strip():
+                    yield json.loads(line)
+
+
+class RecordWriter:
+    """Incremental JSONL or CSV sink, gzip-compressed when the path ends in .gz
+
+    A CSV header is taken from the first record, so a later record with a
+    field the first lacks raises ValueError; write JSONL when records vary.
+    Records go to a temporary file beside ``path`` that replaces it only
+    when the block exits cleanly, so a failed run leaves no truncated output.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.format = _record_format(self.path)
+        self._handle = None
+        self._csv = None
+        self._tmp: Optional[Path] = None
+
+    def __enter__(self) -> 'RecordWriter':
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.", suffix=self.path.suffix)
+        os.close(fd)
+        self._tmp = Path(tmp)
+        self._handle = _open_text(self._tmp, 'w')
+        return self
+
+    def __exit__(self, exc_type, *exc_info) -> None:
+        try:
+            self._handle.close()
+            if exc_type is None:
+                os.replace(self._tmp, self.path)
+        finally:
+            if self._tmp.exists():
+                self._tmp.unlink()
+
+    def write(self, record: Dict) -> None:
+        if self.format == 'jsonl':
+            self._handle.write(json.dumps(record, ensure_ascii=False))
+            self._handle.write('\n')
+            return
+        if self._csv is None:
+            self._csv = csv.DictWriter(self._handle, fieldnames=list(record))
+            self._csv.writeheader()
+        self._csv.writerow(record)
+
+
+def _print_progress(stats: PipelineStats) -> None:
+    print(f"Scored {stats.read} records, kept {stats.kept} ({stats.rate:.0f} records/s)")
+
+
+def score_records(
+    records: Iterable[Dict],
+    thresholds: Dict,
+    analyzer: Optional[SageAdviceAnalyzer] = None,
+    text_field: str = 'text',
+    workers: Optional[int] = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    stats: Optional[PipelineStats] = None,
+    progress_every: int = 100_000,
+    progress: Optional[Callable[[PipelineStats], None]] = None
+) -> Iterator[Dict]:
+    """Score a stream of records and yield those meeting the emotion thresholds.
+
+    Each surviving record is yielded with its metrics added as extra fields.
+    Only the text of each record is sent to the scoring workers.
+    ``progress`` is called with the running totals every ``progress_every``
+    records read.
+    """
+    analyzer = analyzer or SageAdviceAnalyzer()
+    stats = stats if stats is not None else PipelineStats()
+    records, texts = tee(records)
+    texts = (str(record.get(text_field) or '') for record in texts)
+
+    for record, metrics in zip(records, analyzer.stream_metrics(texts, workers, chunk_size)):
+        stats.read += 1
+        if progress is not None and stats.read % progress_every == 0:
+            progress(stats)
+        if meets_thresholds(metrics, thresholds):
+            stats.kept += 1
+            yield {**record, **metrics}
+
+
+def run_pipeline(
+    source: str,
+    sink: str,
+    thresholds: Dict,
+    text_field: str = 'text',
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    progress_every: int = 100_000,
+    progress: Callable[[PipelineStats], None] = _print_progress
+) -> PipelineStats:
+    """Stream a corpus file through emotion scoring into a filtered output file.
+
+    Records are read, scored and written incrementally, so memory stays
+    bounded by the chunks in flight regardless of the corpus size.
+    """
+    stats = PipelineStats()
+    scored = score_records(
+        read_records(source),
+        thresholds,
+        text_field=text_field,
+        workers=workers,
+        chunk_size=chunk_size,
+        stats=stats,
+        progress_every=progress_every,
+        progress=progress
+    )
+
+    with RecordWriter(sink) as writer:
+        for record in scored:
+            writer.write(record)
+
+    progress(stats)
+    return stats
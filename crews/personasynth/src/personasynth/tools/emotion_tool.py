@@ -0,0 +1,61 @@
+from crewai.tools import BaseTool
+from typing import Dict, List, Optional, Type
+import json
+from statistics import fmean
+from pydantic import BaseModel, Field, PrivateAttr
+
+from personasynth.tools.custom_tool import SageAdviceAnalyzer
+
+
+class EmotionAnalysisToolInput(BaseModel):
+    """Input schema for EmotionAnalysisTool."""
+    texts: List[str] = Field(
+        ...,
+        description="Every text to score, one entry per quote, comment or piece of advice."
+    )
+    thresholds: Optional[Dict[str, float]] = Field(
+        None,
+        description="Optional minimums keyed min_intensity, min_authenticity and min_resonance."
+    )
+
+
+class EmotionAnalysisTool(BaseTool):
+    name: str = "Emotion Analysis"
+    description: str = (
+        "Deterministically scores many texts at once for emotional intensity (0-10), "
+        "sentiment (-1 to 1), authenticity (0-10), resonance (0-10) and an overall score. "
+        "Pass all texts in a single call. Returns aggregate statistics, how many texts "
+        "meet the thresholds, and the highest-scoring texts by index."
+    )
+    args_schema: Type[BaseModel] = EmotionAnalysisToolInput
+    top_k: int = 10
+
+    _analyzer: SageAdviceAnalyzer = PrivateAttr(default_factory=SageAdviceAnalyzer)
+
+    def _run(self, texts: List[str], thresholds: Optional[Dict[str, float]] = None) -> str:
+        if not texts:
+            return json.dumps({'count': 0})
+
+        batch = self._analyzer.score_batch(texts)
+        columns = {
+            'intensity': batch.intensity,
+            'sentiment': batch.sentiment,
+            'authenticity': batch.authenticity,
+            'resonance': batch.resonance,
+            'overall_score': batch.overall_score
+        }
+        top = sorted(range(len(batch)), key=batch.overall_score.__getitem__, reverse=True)
+
+        summary = {
+            'count': len(batch),
+            'mean': {name: round(fmean(column), 3) for name, column in columns.items()},
+            'min': {name: round(min(column), 3) for name, column in columns.items()},
+            'max': {name: round(max(column), 3) for name, column in columns.items()},
+            'top': [
+                {'index': index, **{name: round(column[index], 3) for name, column in columns.items()}}
+                for index in top[:self.top_k]
+            ]
+        }
+        if thresholds:
+            summary['meeting_thresholds'] = len(batch.passing(thresholds))
+        return json.dumps(summary)
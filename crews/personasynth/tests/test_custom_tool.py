@@ -0,0 +1,100 @@
+import re
+
+import pytest
+
+from personasynth.tools.custom_tool import EmotionMetrics, PatternEngine, SageAdviceAnalyzer, meets_thresholds
+
+TEXTS = [
+    "HONESTLY, I've found that spending time coding really helps me relax! It's amazing!!",
+    "Same here. In my experience it is very relatable, I understand and I feel you.",
+    "This is bad. I hate it and it makes me sad.",
+    "Genuinely, truthfully, honestly: in my experience I've found that it works.",
+    "A plain sentence with nothing to count.",
+    "ABSOLUTELY REALLY VERY EXTREMELY GREAT!!! Me too, I get it, same here, relatable.",
+    "",
+    "Ich LIEBE es, ehrlich!! Honestly, même ici: same here, very good… but SAD.",
+    "then THE theory: I've found that genuinely BADGOODHATE happens; I'VE FOUND THAT too",
+]
+
+
+@pytest.fixture(scope="module")
+def analyzer():
+    return SageAdviceAnalyzer()
+
+
+def _baseline_metrics(analyzer, text):
+    """The metrics as computed before PatternEngine, with one re.findall per pattern"""
+    def count(patterns):
+        return sum(len(re.findall(pattern, text)) for pattern in patterns)
+
+    positive = count(analyzer.sentiment_patterns['positive'])
+    negative = count(analyzer.sentiment_patterns['negative'])
+    return EmotionMetrics(
+        intensity=min(10, count(analyzer.emotion_patterns['intensity'])),
+        sentiment=max(-1, min(1, (positive - negative) / max(1, len(text.split())))),
+        authenticity=min(10, 2 * count(analyzer.emotion_patterns['authenticity'])),
+        resonance=min(10, 2 * count(analyzer.emotion_patterns['resonance']))
+    )
+
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_analyze_text_matches_the_regex_baseline(analyzer, text):
+    assert analyzer.analyze_text(text) == _baseline_metrics(analyzer, text)
+
+
+def test_pattern_engine_counts_like_findall_with_overlapping_words():
+    patterns = {
+        'overlap': [r'(?i)the|then|hen', r'ab|bab'],
+        'plain': [r'(?i)cat|dog', r'Cat'],
+        'regex': [r'\d+', r'(?i)\bno+\b'],
+    }
+    engine = PatternEngine(patterns)
+
+    for text in ("Then the hen saw THEN", "babab abab", "Cat cat DOG cAt", "No nooo 12 and 345", "thé cat ab"):
+        assert engine.count(text) == {
+            category: sum(len(re.findall(pattern, text)) for pattern in category_patterns)
+            for category, category_patterns in patterns.items()
+        }
+
+
+@pytest.mark.parametrize("thresholds", [
+    {},
+    {"min_intensity": 3},
+    {"min_authenticity": 4, "min_resonance": 2},
+    {"min_intensity": 1, "min_authenticity": 2, "min_resonance": 2},
+    {"min_intensity": 11},
+    {"min_intensity": 0, "min_authenticity": 0, "min_resonance": 0, "other": 5},
+])
+def test_passing_agrees_with_the_scalar_thresholds(analyzer, thresholds):
+    batch = analyzer.score_batch(TEXTS)
+
+    expected = [
+        index for index, text in enumerate(TEXTS)
+        if meets_thresholds(analyzer.text_metrics(text), thresholds)
+    ]
+    assert batch.passing(thresholds) == expected
+
+
+def test_passing_on_an_empty_batch_is_empty(analyzer):
+    assert analyzer.score_batch([]).passing({"min_intensity": 1}) == []
+
+
+def test_parallel_chunked_batches_match_serial_scoring(analyzer):
+    texts = TEXTS * 5
+    contexts = [{"index": index} for index in range(len(texts))]
+    serial = [analyzer.process_advice(text, context) for text, context in zip(texts, contexts)]
+
+    assert analyzer.batch_process(texts, contexts, workers=2, chunk_size=3) == serial
+    assert list(analyzer.stream_process(iter(texts), iter(contexts), workers=2, chunk_size=4)) == serial
+    assert list(analyzer.stream_metrics(iter(texts), workers=2, chunk_size=5)) == [
+        result["metrics"] for result in serial
+    ]
+
+
+def test_parallel_score_batch_matches_serial_columns(analyzer):
+    texts = TEXTS * 5
+
+    parallel = analyzer.score_batch(iter(texts), workers=3, chunk_size=2)
+
+    assert parallel == analyzer.score_batch(texts, workers=1)
+    assert list(parallel) == [analyzer.analyze_text(text) for text in texts]
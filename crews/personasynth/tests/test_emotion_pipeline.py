@@ -0,0 +1,69 @@
+import json
+
+import pytest
+
+from personasynth.tools.emotion_pipeline import RecordWriter, read_records, run_pipeline
+
+RECORDS = [
+    {'id': '1', 'text': 'HONESTLY, I have found this REALLY helps!! Same here, relatable.'},
+    {'id': '2', 'text': 'A plain sentence.'},
+    {'id': '3', 'text': 'Genuinely, in my experience it works. I understand, me too!!!'},
+]
+THRESHOLDS = {'min_intensity': 1, 'min_authenticity': 2, 'min_resonance': 2}
+
+
+def _write(path, records):
+    with RecordWriter(str(path)) as writer:
+        for record in records:
+            writer.write(record)
+
+
+@pytest.mark.parametrize('name', ['records.jsonl', 'records.jsonl.gz', 'records.csv', 'records.csv.gz'])
+def test_written_records_read_back_unchanged(tmp_path, name):
+    _write(tmp_path / name, RECORDS)
+
+    assert list(read_records(str(tmp_path / name))) == RECORDS
+    assert [path.name for path in tmp_path.iterdir()] == [name]
+
+
+def test_pipeline_keeps_scored_records_meeting_the_thresholds(tmp_path):
+    _write(tmp_path / 'corpus.jsonl', RECORDS)
+
+    stats = run_pipeline(
+        str(tmp_path / 'corpus.jsonl'),
+        str(tmp_path / 'scored.csv'),
+        THRESHOLDS,
+        workers=1,
+        progress=lambda stats: None
+    )
+
+    kept = list(read_records(str(tmp_path / 'scored.csv')))
+    assert (stats.read, stats.kept) == (3, 2)
+    assert [record['id'] for record in kept] == ['1', '3']
+    assert list(kept[0]) == [
+        'id', 'text', 'intensity', 'sentiment', 'authenticity', 'resonance', 'overall_score'
+    ]
+    assert all(float(record['resonance']) >= 2 for record in kept)
+
+
+def test_ragged_csv_record_raises_and_leaves_no_partial_file(tmp_path):
+    sink = tmp_path / 'scored.csv'
+    ragged = [*RECORDS, {'id': '4', 'text': 'More', 'author': 'someone'}]
+
+    with pytest.raises(ValueError):
+        _write(sink, ragged)
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_failed_write_keeps_the_previous_output(tmp_path):
+    sink = tmp_path / 'scored.jsonl'
+    _write(sink, RECORDS[:1])
+
+    with pytest.raises(RuntimeError):
+        with RecordWriter(str(sink)) as writer:
+            writer.write(RECORDS[1])
+            raise RuntimeError('scoring failed')
+
+    assert [json.loads(line) for line in sink.read_text(encoding='utf-8').splitlines()] == RECORDS[:1]
+    assert [path.name for path in tmp_path.iterdir()] == ['scored.jsonl']
@@ -0,0 +1,43 @@
+import json
+
+from personasynth.tools.custom_tool import SageAdviceAnalyzer
+from personasynth.tools.emotion_tool import EmotionAnalysisTool
+
+TEXTS = [
+    "A plain sentence.",
+    "HONESTLY, in my experience this REALLY works!! Same here, relatable.",
+    "Genuinely good advice, I understand.",
+]
+METRICS = ['intensity', 'sentiment', 'authenticity', 'resonance', 'overall_score']
+
+
+def test_summary_shape_and_values():
+    analyzer = SageAdviceAnalyzer()
+    scores = [analyzer.text_metrics(text) for text in TEXTS]
+
+    summary = json.loads(EmotionAnalysisTool(top_k=2).run(texts=TEXTS))
+
+    assert list(summary) == ['count', 'mean', 'min', 'max', 'top']
+    assert summary['count'] == 3
+    for name in METRICS:
+        values = [score[name] for score in scores]
+        assert summary['mean'][name] == round(sum(values) / len(values), 3)
+        assert summary['min'][name] == round(min(values), 3)
+        assert summary['max'][name] == round(max(values), 3)
+    ranked = sorted(range(len(TEXTS)), key=lambda index: scores[index]['overall_score'], reverse=True)
+    assert [entry['index'] for entry in summary['top']] == ranked[:2]
+    assert list(summary['top'][0]) == ['index', *METRICS]
+
+
+def test_thresholds_add_the_number_of_passing_texts():
+    summary = json.loads(EmotionAnalysisTool().run(
+        texts=TEXTS,
+        thresholds={'min_intensity': 1, 'min_authenticity': 2}
+    ))
+
+    assert summary['meeting_thresholds'] == 1
+    assert len(summary['top']) == 3
+
+
+def test_no_texts_gives_an_empty_summary():
+    assert json.loads(EmotionAnalysisTool().run(texts=[])) == {'count': 0}
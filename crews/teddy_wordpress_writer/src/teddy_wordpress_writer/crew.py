@@ -1,5 +1,11 @@
+import os
+
 from crewai import Agent, Crew, Process, Task
-from crewai.project import CrewBase, agent, crew, task
+from crewai.project import agent, crew, task
+
+from crewkit.logs import verbose_enabled
+from crewkit.project import CrewBase
+from crewkit.scheduler import DagCrew
 
 @CrewBase
 class TeddyWordpressWriter():
@@ -12,28 +18,28 @@ class TeddyWordpressWriter():
     def wordpress_optimizer(self) -> Agent:
         return Agent(
             config=self.agents_config['wordpress_optimizer'],
-            verbose=True
+            verbose=verbose_enabled()
         )
 
     @agent
     def content_writer(self) -> Agent:
         return Agent(
             config=self.agents_config['content_writer'],
-            verbose=True
+            verbose=verbose_enabled()
         )
 
     @agent
     def social_media_strategist(self) -> Agent:
         return Agent(
             config=self.agents_config['social_media_strategist'],
-            verbose=True
+            verbose=verbose_enabled()
         )
 
     @agent
     def content_editor(self) -> Agent:
         return Agent(
             config=self.agents_config['content_editor'],
-            verbose=True
+            verbose=verbose_enabled()
         )
 
     @task
@@ -66,10 +72,20 @@ class TeddyWordpressWriter():
 
     @crew
     def crew(self) -> Crew:
-        """Creates the TeddyWordpressWriter crew for content optimization and creation"""
-        return Crew(
+        """Creates the TeddyWordpressWriter crew for content optimization and creation
+
+        The social media strategy is written once per platform in
+        target_platforms, in parallel and alongside the content review, and
+        merged into social_media_strategy.md. Set SOCIAL_FAN_OUT=off to
+        write it in a single pass.
+        """
+        fan_out = {}
+        if os.getenv('SOCIAL_FAN_OUT', 'on').lower() not in ('0', 'off', 'false', 'no'):
+            fan_out = {'social_media_strategy_task': 'target_platforms'}
+        return DagCrew(
             agents=self.agents,
             tasks=self.tasks,
             process=Process.sequential,
-            verbose=True
+            fan_out=fan_out,
+            verbose=verbose_enabled()
         )
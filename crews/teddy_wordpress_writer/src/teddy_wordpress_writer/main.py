@@ -3,15 +3,14 @@ import sys
 import warnings
 from datetime import datetime
 
+from crewkit.batch import BatchRunner, read_items
 from teddy_wordpress_writer.crew import TeddyWordpressWriter
 
 warnings.filterwarnings("ignore", category=SyntaxWarning, module="pysbd")
 
-def run():
-    """
-    Run the WordPress content creation and optimization crew.
-    """
-    inputs = {
+def default_inputs():
+    """Inputs used by run() and as defaults for every batch item."""
+    return {
         'topic': 'WordPress Content Strategy',
         'current_year': str(datetime.now().year),
         'content_type': 'semi-biographical',
@@ -21,12 +20,36 @@ def run():
         'wordpress_focus': 'SEO and social media optimization',
         'target_platforms': 'WordPress, Twitter, LinkedIn, Facebook'
     }
+
+def run():
+    """
+    Run the WordPress content creation and optimization crew.
+    """
+    inputs = default_inputs()
     
     try:
         TeddyWordpressWriter().crew().kickoff(inputs=inputs)
     except Exception as e:
         raise Exception(f"An error occurred while running the crew: {e}")
 
+def batch():
+    """
+    Run the crew once per input set in a JSON or JSON-lines file.
+    Each item overrides the run() inputs, e.g. {"topic": "..."}, and writes
+    its outputs to <output_root>/<item id>/. Usage: batch <items> [output_root]
+    """
+    output_root = sys.argv[2] if len(sys.argv) > 2 else 'batches'
+    try:
+        summary = BatchRunner(
+            TeddyWordpressWriter().crew(),
+            output_root,
+            prepare=lambda item, directory: {**default_inputs(), **item}
+        ).run(read_items(sys.argv[1]))
+    except Exception as e:
+        raise Exception(f"An error occurred while running the batch: {e}")
+    print(f"\n{summary['completed']} completed, {summary['skipped']} skipped, {len(summary['failed'])} failed")
+    return summary
+
 def train():
     """
     Train the crew for a given number of iterations.
@@ -35,7 +58,8 @@ def train():
         'topic': 'WordPress Content Strategy',
         'content_type': 'semi-biographical',
         'target_audience': 'general readers',
-        'seo_keywords': 'wordpress, social media, content'
+        'seo_keywords': 'wordpress, social media, content',
+        'target_platforms': 'WordPress, Twitter, LinkedIn, Facebook'
     }
     try:
         TeddyWordpressWriter().crew().train(
@@ -63,7 +87,8 @@ def test():
         'topic': 'WordPress Content Strategy',
         'content_type': 'semi-biographical',
         'target_audience': 'general readers',
-        'seo_keywords': 'wordpress, social media, content'
+        'seo_keywords': 'wordpress, social media, content',
+        'target_platforms': 'WordPress, Twitter, LinkedIn, Facebook'
     }
     try:
         TeddyWordpressWriter().crew().test(